@@ -18,7 +18,12 @@ from .chat import (
     bedrock_stream_usage_tracker,
 )
 
-from .exception import AIGooException
+from .exception import (
+    AIGooException,
+    AIGooLimitException,
+    AIGooCancelledException,
+    AIGooCircuitOpenException,
+)
 
 from .flow import (
     AIGooFlow,
@@ -26,7 +31,10 @@ from .flow import (
     tools_node,
     Node,
     WorkflowState,
+    StateView,
     MemoryManager,
+    FlowEvent,
+    StreamMode,
     START,
     END,
 )
@@ -45,6 +53,9 @@ __all__ = [
     "openai_usage_tracker",
     "openai_stream_usage_tracker",
     "AIGooException",
+    "AIGooLimitException",
+    "AIGooCancelledException",
+    "AIGooCircuitOpenException",
     "AIGooFlow",
     "Edge",
     "tools_node",
@@ -52,7 +63,10 @@ __all__ = [
     "START",
     "END",
     "WorkflowState",
+    "StateView",
     "MemoryManager",
+    "FlowEvent",
+    "StreamMode",
     "BedrockConfig",
     "BedrockModel",
     "bedrock_usage_tracker",
@@ -0,0 +1,14 @@
+from .flow_bench import SCENARIOS, run_flow_benchmarks
+from .memory_bench import BENCHMARKS, run_memory_benchmarks
+from .report import build_report, format_report, load_report, save_report
+
+__all__ = [
+    "SCENARIOS",
+    "BENCHMARKS",
+    "run_flow_benchmarks",
+    "run_memory_benchmarks",
+    "build_report",
+    "format_report",
+    "load_report",
+    "save_report",
+]
@@ -0,0 +1,61 @@
+"""
+Benchmarks of the flow engine and memory.
+
+    python -m aigoofusion.bench flow --output after.json --compare before.json
+    python -m aigoofusion.bench memory
+    python -m aigoofusion.bench all --runs 100
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from aigoofusion.bench.flow_bench import SCENARIOS, run_flow_benchmarks
+from aigoofusion.bench.memory_bench import BENCHMARKS, run_memory_benchmarks
+from aigoofusion.bench.report import build_report, format_report, load_report, save_report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m aigoofusion.bench")
+    parser.add_argument("suite", choices=["flow", "memory", "all"])
+    parser.add_argument(
+        "--only",
+        help=f"Comma separated benchmarks, flow: {', '.join(SCENARIOS)}; memory: {', '.join(BENCHMARKS)}",
+    )
+    parser.add_argument("--runs", type=int, help="Timed runs per benchmark")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed flow runs first")
+    parser.add_argument(
+        "--executor",
+        choices=["inline", "thread"],
+        default="inline",
+        help="Executor of the sync flow nodes, inline measures the engine alone",
+    )
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare with")
+    args = parser.parse_args(argv)
+
+    only = args.only.split(",") if args.only else None
+    suites = {}
+    if args.suite in ("flow", "all"):
+        suites["flow"] = run_flow_benchmarks(
+            [name for name in only if name in SCENARIOS] if only else None,
+            runs=args.runs or 50,
+            warmup=args.warmup,
+            executor=args.executor,
+        )
+    if args.suite in ("memory", "all"):
+        suites["memory"] = run_memory_benchmarks(
+            [name for name in only if name in BENCHMARKS] if only else None,
+            runs=args.runs or 2000,
+        )
+
+    report = build_report(suites)
+    baseline = load_report(args.compare) if args.compare else None
+    print(format_report(report, baseline))
+    if args.output:
+        save_report(report, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
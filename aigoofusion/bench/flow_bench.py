@@ -0,0 +1,194 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from aigoofusion.bench.stats import measure_peak_memory, percentiles, time_runs
+from aigoofusion.flow.aigoo_flow import AIGooFlow
+from aigoofusion.flow.node.node import END, START
+from aigoofusion.flow.state.memory_manager import MemoryManager
+
+
+@dataclass
+class Scenario:
+    """A synthetic workflow, its input and the number of nodes one run executes."""
+
+    flow: AIGooFlow
+    inputs: Dict[str, Any]
+    steps: int
+    thread_id: Optional[str] = None
+
+
+def fan_out(executor: str, width: int = 32) -> Scenario:
+    """START fans out to `width` parallel nodes that all lead to END."""
+    flow = AIGooFlow({"x": 0}, max_concurrency=None)
+
+    def branch(x):
+        return {"x": x + 1}
+
+    for index in range(width):
+        flow.add_node(f"branch_{index}", branch, executor=executor)
+        flow.add_edge(START, f"branch_{index}")
+        flow.add_edge(f"branch_{index}", END)
+    return Scenario(flow, {"x": 0}, width)
+
+
+def deep_chain(executor: str, depth: int = 200) -> Scenario:
+    """`depth` nodes in a single line."""
+    flow = AIGooFlow({"x": 0})
+
+    def step(x):
+        return {"x": x + 1}
+
+    previous = START
+    for index in range(depth):
+        flow.add_node(f"step_{index}", step, executor=executor)
+        flow.add_edge(previous, f"step_{index}")
+        previous = f"step_{index}"
+    flow.add_edge(previous, END)
+    return Scenario(flow, {"x": 0}, depth)
+
+
+def loop(executor: str, iterations: int = 200) -> Scenario:
+    """One node revisited through a conditional edge until a counter runs out."""
+    flow = AIGooFlow({"count": 0}, max_steps=iterations + 1)
+
+    def tick(count):
+        return {"count": count + 1}
+
+    def again(state):
+        return "tick" if state["count"] < iterations else END
+
+    flow.add_node("tick", tick, executor=executor)
+    flow.add_edge(START, "tick")
+    flow.add_conditional_edge("tick", ["tick", END], again, executor=executor)
+    return Scenario(flow, {"count": 0}, iterations)
+
+
+def large_state(executor: str, keys: int = 2000, depth: int = 20) -> Scenario:
+    """A chain over a state of `keys` entries and a long message list, each node writes one key."""
+    state = {f"key_{index}": {"value": index, "tags": ["a", "b"]} for index in range(keys)}
+    state["messages"] = [{"role": "user", "content": "x" * 200} for _ in range(500)]
+    flow = AIGooFlow(state)
+
+    def touch(key_0, messages):
+        return {"key_0": {"value": key_0["value"] + 1, "tags": key_0["tags"]}}
+
+    previous = START
+    for index in range(depth):
+        flow.add_node(f"touch_{index}", touch, executor=executor)
+        flow.add_edge(previous, f"touch_{index}")
+        previous = f"touch_{index}"
+    flow.add_edge(previous, END)
+    return Scenario(flow, {}, depth)
+
+
+def memory_chain(executor: str, depth: int = 20) -> Scenario:
+    """A chain that appends to a message list persisted through `MemoryManager`."""
+    flow = AIGooFlow(
+        {"messages": []}, memory=MemoryManager(extend_list=True, cleanup=False)
+    )
+
+    def reply(messages):
+        return {"messages": messages + [{"role": "assistant", "content": "ok"}]}
+
+    previous = START
+    for index in range(depth):
+        flow.add_node(f"reply_{index}", reply, executor=executor)
+        flow.add_edge(previous, f"reply_{index}")
+        previous = f"reply_{index}"
+    flow.add_edge(previous, END)
+    return Scenario(flow, {"messages": [{"role": "user", "content": "hi"}]}, depth, "bench")
+
+
+SCENARIOS: Dict[str, Callable[[str], Scenario]] = {
+    "fan_out": fan_out,
+    "deep_chain": deep_chain,
+    "loop": loop,
+    "large_state": large_state,
+    "memory_chain": memory_chain,
+}
+
+
+async def _step_latencies(scenario: Scenario, runs: int) -> List[float]:
+    """Time between consecutive node completions, scheduling included."""
+    samples: List[float] = []
+    last: Dict[str, float] = {}
+
+    def on_start(context, node):
+        last.setdefault(context.run_id, time.perf_counter())
+
+    def on_end(context, node, duration, updates):
+        now = time.perf_counter()
+        samples.append(now - last[context.run_id])
+        last[context.run_id] = now
+
+    flow = scenario.flow
+    flow.on_node_start(on_start)
+    flow.on_node_end(on_end)
+    try:
+        for _ in range(runs):
+            await flow.execute(scenario.inputs, scenario.thread_id)
+    finally:
+        flow.close()
+    return samples
+
+
+async def run_scenario(name: str, runs: int, warmup: int, executor: str) -> Dict[str, Any]:
+    """Benchmark one scenario: throughput, run and step latency, peak memory."""
+    scenario = SCENARIOS[name](executor)
+    flow = scenario.flow
+
+    async def run():
+        await flow.execute(scenario.inputs, scenario.thread_id)
+
+    try:
+        timings = await time_runs(run, runs, warmup)
+        peak = await measure_peak_memory(run)
+    finally:
+        flow.close()
+
+    # Hooks cost time, so step latencies come from a separate instrumented flow
+    steps = await _step_latencies(SCENARIOS[name](executor), max(1, runs // 4))
+
+    total = sum(timings)
+    return {
+        "steps_per_run": scenario.steps,
+        "runs": runs,
+        "steps_per_sec": round(scenario.steps * runs / total, 1),
+        "run_latency_us": percentiles(timings),
+        "step_latency_us": percentiles(steps),
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+def run_flow_benchmarks(
+    scenarios: Optional[List[str]] = None,
+    runs: int = 50,
+    warmup: int = 5,
+    executor: str = "inline",
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the flow scenarios.
+
+    Args:
+        scenarios (Optional[List[str]], optional): Names from `SCENARIOS`. Defaults to all of them.
+        runs (int, optional): Timed runs per scenario. Defaults to 50.
+        warmup (int, optional): Untimed runs first. Defaults to 5.
+        executor (str, optional): Executor of the sync nodes, `inline` measures the
+            engine alone. Defaults to "inline".
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Results per scenario.
+    """
+    names = scenarios or list(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    async def main():
+        return {
+            name: await run_scenario(name, runs, warmup, executor) for name in names
+        }
+
+    return asyncio.run(main())
@@ -0,0 +1,99 @@
+import time
+from typing import Any, Dict, List, Optional
+
+from aigoofusion.bench.stats import percentiles
+from aigoofusion.flow.state.memory_manager import MemoryManager
+from aigoofusion.flow.state.workflow_state import WorkflowState
+
+
+def _time_calls(call, runs: int) -> List[float]:
+    timings = []
+    for index in range(runs):
+        started = time.perf_counter()
+        call(index)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def _summary(timings: List[float]) -> Dict[str, Any]:
+    return {
+        "ops": len(timings),
+        "ops_per_sec": round(len(timings) / sum(timings), 1),
+        "latency_us": percentiles(timings),
+    }
+
+
+def update_memory_replace(runs: int) -> Dict[str, Any]:
+    """`update_memory` without list extension on a thread with a growing history."""
+    memory = MemoryManager(cleanup=False)
+    messages: List[Dict[str, str]] = []
+
+    def call(index: int):
+        messages.append({"role": "user", "content": f"message {index}"})
+        memory.update_memory("bench", {"messages": messages, "step": index})
+
+    return _summary(_time_calls(call, runs))
+
+
+def update_memory_extend(runs: int) -> Dict[str, Any]:
+    """`update_memory` with `extend_list`, which deduplicates the list on every merge."""
+    memory = MemoryManager(extend_list=True, cleanup=False)
+
+    def call(index: int):
+        memory.update_memory(
+            "bench", {"messages": [{"role": "user", "content": f"message {index}"}]}
+        )
+
+    return _summary(_time_calls(call, runs))
+
+
+def deep_merge_nested(runs: int) -> Dict[str, Any]:
+    """`deep_merge` of a nested document into a copy of itself with one changed leaf."""
+    memory = MemoryManager(cleanup=False)
+    document = {
+        f"section_{index}": {"items": list(range(20)), "meta": {"index": index}}
+        for index in range(100)
+    }
+
+    def call(index: int):
+        memory.deep_merge(document, {"section_0": {"meta": {"index": index}}})
+
+    return _summary(_time_calls(call, runs))
+
+
+def workflow_state_update(runs: int) -> Dict[str, Any]:
+    """`WorkflowState._update` of one key over a large state, with full history."""
+    state = WorkflowState({f"key_{index}": [index] * 10 for index in range(2000)})
+
+    def call(index: int):
+        state._update({"key_0": [index]})
+
+    return _summary(_time_calls(call, runs))
+
+
+BENCHMARKS = {
+    "update_memory_replace": update_memory_replace,
+    "update_memory_extend": update_memory_extend,
+    "deep_merge_nested": deep_merge_nested,
+    "workflow_state_update": workflow_state_update,
+}
+
+
+def run_memory_benchmarks(
+    benchmarks: Optional[List[str]] = None, runs: int = 2000
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the state and memory micro benchmarks.
+
+    Args:
+        benchmarks (Optional[List[str]], optional): Names from `BENCHMARKS`. Defaults to all of them.
+        runs (int, optional): Calls per benchmark. Defaults to 2000.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Results per benchmark.
+    """
+    names = benchmarks or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+    return {name: BENCHMARKS[name](runs) for name in names}
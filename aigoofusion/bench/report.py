@@ -0,0 +1,76 @@
+import json
+import os
+import platform
+import subprocess
+import time
+from typing import Any, Dict, List, Optional
+
+# The headline number of each kind of result, higher is better
+_THROUGHPUT_KEYS = ("steps_per_sec", "ops_per_sec")
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def build_report(suites: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Wrap suite results with what is needed to compare them across commits."""
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "suites": suites,
+    }
+
+
+def _throughput(result: Dict[str, Any]) -> float:
+    for key in _THROUGHPUT_KEYS:
+        if key in result:
+            return result[key]
+    return 0.0
+
+
+def format_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Render a report as a table, with the change against `baseline` when given."""
+    lines: List[str] = [
+        f"commit {report['meta']['commit']}  python {report['meta']['python']}"
+    ]
+    for suite, results in report["suites"].items():
+        lines.append(f"\n[{suite}]")
+        lines.append(f"{'benchmark':<24}{'throughput/s':>14}{'p50 us':>11}{'p99 us':>11}{'peak KiB':>11}{'change':>10}")
+        for name, result in results.items():
+            latency = result.get("step_latency_us") or result.get("latency_us") or {}
+            throughput = _throughput(result)
+            change = ""
+            if baseline is not None:
+                previous = baseline.get("suites", {}).get(suite, {}).get(name)
+                if previous and _throughput(previous):
+                    change = f"{(throughput / _throughput(previous) - 1) * 100:+.1f}%"
+            lines.append(
+                f"{name:<24}{throughput:>14,.1f}{latency.get('p50', 0):>11,.1f}"
+                f"{latency.get('p99', 0):>11,.1f}{result.get('peak_memory_kib', ''):>11}{change:>10}"
+            )
+    return "\n".join(lines)
+
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
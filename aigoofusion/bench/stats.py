@@ -0,0 +1,48 @@
+import statistics
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """p50, p90, p99 and max of `samples`, in microseconds."""
+    if not samples:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1e6
+
+    return {
+        "p50": round(statistics.median(ordered) * 1e6, 2),
+        "p90": round(at(0.90), 2),
+        "p99": round(at(0.99), 2),
+        "max": round(ordered[-1] * 1e6, 2),
+    }
+
+
+async def measure_peak_memory(run: Callable[[], Awaitable[Any]]) -> int:
+    """Peak bytes allocated by Python while `run` is awaited, measured with tracemalloc."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        await run()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+async def time_runs(
+    run: Callable[[], Awaitable[Any]], runs: int, warmup: int
+) -> List[float]:
+    """Wall time of `runs` awaited calls of `run`, after `warmup` untimed ones."""
+    for _ in range(warmup):
+        await run()
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await run()
+        timings.append(time.perf_counter() - started)
+    return timings
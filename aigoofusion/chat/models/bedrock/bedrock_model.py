@@ -18,7 +18,11 @@ from aigoofusion.chat.models.bedrock.bedrock_stream_usage_tracker import (
 from aigoofusion.chat.models.bedrock.bedrock_usage_tracker import track_bedrock_usage
 from aigoofusion.chat.models.model_provider import ModelProvider
 from aigoofusion.chat.responses.ai_response import AIResponse
+from aigoofusion.exception.aigoo_cancelled_exception import AIGooCancelledException
 from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.runtime.cancellation import check_cancelled
+from aigoofusion.runtime.deadline import check_deadline
+from aigoofusion.runtime.trace import trace_span
 
 
 class BedrockModel(BaseAIModel):
@@ -71,6 +75,9 @@ class BedrockModel(BaseAIModel):
         tools: List[Dict[str, Any]] | None = None,
         **kwargs,
     ) -> AIResponse:
+        # Converse has no per-request timeout, so only fail fast once the flow deadline passed
+        check_cancelled("calling Bedrock")
+        check_deadline("calling Bedrock")
         try:
             _system = next(
                 (msg["content"] for msg in messages if msg["role"] == "system"), None
@@ -135,7 +142,8 @@ class BedrockModel(BaseAIModel):
                 """
                 params["toolConfig"] = {"tools": [{"toolSpec": tool} for tool in tools]}
 
-            response = self.__call_bedrock(params)
+            with trace_span("bedrock.generate", "model", model=self.model_name):
+                response = self.__call_bedrock(params)
 
             output_message = response["output"]["message"]
             stop_reason = response["stopReason"]
@@ -175,6 +183,9 @@ class BedrockModel(BaseAIModel):
         tools: List[Dict[str, Any]] | None = None,
         **kwargs,
     ) -> Any:
+        # Converse has no per-request timeout, so only fail fast once the flow deadline passed
+        check_cancelled("calling Bedrock")
+        check_deadline("calling Bedrock")
         try:
             _system = next(
                 (msg["content"] for msg in messages if msg["role"] == "system"), None
@@ -212,7 +223,9 @@ class BedrockModel(BaseAIModel):
             if tools:
                 params["toolConfig"] = {"tools": [{"toolSpec": tool} for tool in tools]}
 
-            response = self.__call_stream_bedrock(params)
+            # Covers opening the stream, chunks are consumed by the caller
+            with trace_span("bedrock.generate_stream", "model", model=self.model_name):
+                response = self.__call_stream_bedrock(params)
             res_metadata = response.get("ResponseMetadata")
             stream = response.get("stream")
 
@@ -224,79 +237,86 @@ class BedrockModel(BaseAIModel):
 
             if stream:
                 tooluse_id = None
-                for chunk in stream:
-                    text = None
-
-                    if "messageStart" in chunk:
-                        # print(f"\nRole: {chunk['messageStart']['role']}")
-                        pass
-
-                    elif "contentBlockStart" in chunk:
-                        tool = chunk["contentBlockStart"]["start"]["toolUse"]
-                        tooluse_id = tool["toolUseId"]
-                        tool_use["toolUseId"] = tooluse_id
-                        tool_use["name"] = tool["name"]
-                        # print(f"\nSTART: {tooluse_id}")
-                        # print(f"START: {tool_use}")
-
-                    if "contentBlockDelta" in chunk:
-                        delta = chunk["contentBlockDelta"]["delta"]
-                        # print(f"\nDELTA: {delta}")
-                        if "text" in delta:
-                            text = delta["text"]
-
-                        if "toolUse" in delta:
-                            if "input" not in tool_use:
-                                tool_use["input"] = ""
-                            tool_use["input"] += delta["toolUse"]["input"]
-
-                    elif "contentBlockStop" in chunk:
-                        if "input" in tool_use:
-                            # print(f"TOOLS: {tools}")
-                            # print(f"TOOL_USE: {tool_use}")
-                            tool_use["input"] = json.loads(tool_use["input"])
-                            tools.append({"toolUse": tool_use})
-                            tool_use = {}
-
-                    if "messageStop" in chunk:
-                        # print(f"FINAL_TOOLS : {tools}")
-                        # print(f"\nStop reason: {chunk['messageStop']['stopReason']}")
-                        pass
-
-                    if "metadata" in chunk:
-                        metadata = chunk["metadata"]
-                        if "usage" in metadata:
-                            # print("\nToken usage")
-                            # print(f"Input tokens: {metadata['usage']['inputTokens']}")
-                            # print(
-                            #     f":Output tokens: {metadata['usage']['outputTokens']}"
-                            # )
-                            # print(f":Total tokens: {metadata['usage']['totalTokens']}")
+                # Closing the stream early, e.g. when the run is cancelled or the caller
+                # stops reading, closes the HTTP response instead of reading it to the end
+                try:
+                    for chunk in stream:
+                        text = None
+
+                        if "messageStart" in chunk:
+                            # print(f"\nRole: {chunk['messageStart']['role']}")
                             pass
-                        if "metrics" in chunk["metadata"]:
-                            # print(
-                            #     f"Latency: {metadata['metrics']['latencyMs']} milliseconds"
-                            # )
+
+                        elif "contentBlockStart" in chunk:
+                            tool = chunk["contentBlockStart"]["start"]["toolUse"]
+                            tooluse_id = tool["toolUseId"]
+                            tool_use["toolUseId"] = tooluse_id
+                            tool_use["name"] = tool["name"]
+                            # print(f"\nSTART: {tooluse_id}")
+                            # print(f"START: {tool_use}")
+
+                        if "contentBlockDelta" in chunk:
+                            delta = chunk["contentBlockDelta"]["delta"]
+                            # print(f"\nDELTA: {delta}")
+                            if "text" in delta:
+                                text = delta["text"]
+
+                            if "toolUse" in delta:
+                                if "input" not in tool_use:
+                                    tool_use["input"] = ""
+                                tool_use["input"] += delta["toolUse"]["input"]
+
+                        elif "contentBlockStop" in chunk:
+                            if "input" in tool_use:
+                                # print(f"TOOLS: {tools}")
+                                # print(f"TOOL_USE: {tool_use}")
+                                tool_use["input"] = json.loads(tool_use["input"])
+                                tools.append({"toolUse": tool_use})
+                                tool_use = {}
+
+                        if "messageStop" in chunk:
+                            # print(f"FINAL_TOOLS : {tools}")
+                            # print(f"\nStop reason: {chunk['messageStop']['stopReason']}")
                             pass
 
-                    tool_calls = []
-
-                    for tools_content in tool_calls_accumulator["tools"]:
-                        if "toolUse" in tools_content:
-                            tool = tools_content["toolUse"]
-                            tool_calls.append(
-                                ToolCall(
-                                    request_call_id=request_id,
-                                    tool_call_id=tool["toolUseId"],
-                                    name=tool["name"],
-                                    arguments=tool["input"],
+                        if "metadata" in chunk:
+                            metadata = chunk["metadata"]
+                            if "usage" in metadata:
+                                # print("\nToken usage")
+                                # print(f"Input tokens: {metadata['usage']['inputTokens']}")
+                                # print(
+                                #     f":Output tokens: {metadata['usage']['outputTokens']}"
+                                # )
+                                # print(f":Total tokens: {metadata['usage']['totalTokens']}")
+                                pass
+                            if "metrics" in chunk["metadata"]:
+                                # print(
+                                #     f"Latency: {metadata['metrics']['latencyMs']} milliseconds"
+                                # )
+                                pass
+
+                        tool_calls = []
+
+                        for tools_content in tool_calls_accumulator["tools"]:
+                            if "toolUse" in tools_content:
+                                tool = tools_content["toolUse"]
+                                tool_calls.append(
+                                    ToolCall(
+                                        request_call_id=request_id,
+                                        tool_call_id=tool["toolUseId"],
+                                        name=tool["name"],
+                                        arguments=tool["input"],
+                                    )
                                 )
-                            )
 
-                    yield AIResponse(
-                        content=text,
-                        tool_calls=tool_calls if tool_calls else None,
-                    )
+                        yield AIResponse(
+                            content=text,
+                            tool_calls=tool_calls if tool_calls else None,
+                        )
+                finally:
+                    stream.close()
 
+        except AIGooCancelledException:
+            raise
         except Exception as e:
             raise AIGooException(e)
@@ -1,9 +1,9 @@
 from contextlib import contextmanager
 from contextvars import ContextVar
 import functools
-import itertools
 
 from aigoofusion.chat.models.bedrock.bedrock_usage import BedrockUsage
+from aigoofusion.chat.models.tracked_stream import TrackedStream, estimate_tokens
 
 # Thread-safe storage for token usage per request
 BEDROCK_STREAM_USAGE_TRACKER_VAR = ContextVar(
@@ -39,32 +39,35 @@ def bedrock_stream_usage_tracker():
 
 
 def track_bedrock_stream_usage(func):
-    """Decorator to wrap `__call_bedrock` calls on `BedrockModel`."""
+    """
+    Decorator to wrap `__call_stream_bedrock` calls on `BedrockModel`.
+
+    Usage is recorded from the metadata event while the caller reads the stream, or
+    estimated when the stream is closed or cancelled before it, see `TrackedStream`.
+    """
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         response = func(*args, **kwargs)
         # args is tuple[BedrockModel, params] and params contain `modelId`
-        model = args[1]["modelId"]
+        params = args[1]
+        model = params["modelId"]
         stream = response.get("stream")
-        stream_usage = None
-
-        if stream:
-            stream, stream_copy = itertools.tee(stream)  # Duplicate the generator
-            response["stream"] = stream  # Replace original stream
-
-            stream_usage = None
-            for event in stream_copy:  # Iterate over the copy
-                if "metadata" in event:
-                    metadata = event["metadata"]
-                    if "usage" in metadata:
-                        stream_usage = metadata["usage"]
-                        break  # No need to iterate further
-
-        if stream_usage:
-            usage_tracker = BEDROCK_STREAM_USAGE_TRACKER_VAR.get()
-            usage_tracker.update(model=model, usage=stream_usage)
+        if not stream:
+            return response
 
+        # Bound now, the stream may be read after the tracker context has exited
+        usage_tracker = BEDROCK_STREAM_USAGE_TRACKER_VAR.get()
+        input_tokens = estimate_tokens([params.get("system"), params["messages"]])
+        response["stream"] = TrackedStream(
+            stream,
+            read_usage=lambda event: event.get("metadata", {}).get("usage"),
+            estimate_usage=lambda chunks: {
+                "inputTokens": input_tokens,
+                "outputTokens": chunks,
+            },
+            record=lambda usage: usage_tracker.update(model=model, usage=usage),
+        )
         return response
 
     return wrapper
@@ -54,6 +54,8 @@ class BedrockUsage:
                 raise AIGooException(error)
 
         self.total_request: int = 0
+        # Requests whose usage was estimated, e.g. streams stopped before their usage chunk
+        self.estimated_requests: int = 0
         self.output_tokens: int = 0
         self.input_tokens: int = 0
         self.total_tokens: int = 0
@@ -132,6 +134,8 @@ class BedrockUsage:
         self.raw_usages.append(usage)
         usage_dict = vars(usage) if hasattr(usage, "__dict__") else usage
         self.total_request += 1
+        if usage_dict.get("estimated"):
+            self.estimated_requests += 1
         self.input_tokens += usage_dict.get("inputTokens", 0)
         self.output_tokens += usage_dict.get("outputTokens", 0)
         self.total_tokens = self.input_tokens + self.output_tokens
@@ -149,6 +153,7 @@ class BedrockUsage:
         Reset usage statistics and calculate price.
         """
         self.total_request = 0
+        self.estimated_requests = 0
         self.input_tokens = 0
         self.output_tokens = 0
         self.total_tokens = 0
@@ -18,7 +18,11 @@ from aigoofusion.chat.models.openai.openai_stream_usage_tracker import (
 from aigoofusion.chat.models.openai.openai_usage import OpenAIUsage
 from aigoofusion.chat.models.openai.openai_usage_tracker import track_openai_usage
 from aigoofusion.chat.responses.ai_response import AIResponse
+from aigoofusion.exception.aigoo_cancelled_exception import AIGooCancelledException
 from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.runtime.cancellation import check_cancelled
+from aigoofusion.runtime.deadline import check_deadline
+from aigoofusion.runtime.trace import trace_span
 
 
 class OpenAIModel(BaseAIModel):
@@ -86,6 +90,9 @@ class OpenAIModel(BaseAIModel):
         Returns:
                 AIResponse: _description_
         """
+        # Inside a flow with a deadline, the request gets the remaining budget
+        check_cancelled("calling OpenAI")
+        remaining = check_deadline("calling OpenAI")
         try:
             params = {
                 "model": self.model_name,
@@ -105,7 +112,11 @@ class OpenAIModel(BaseAIModel):
                 ]
                 params["tool_choice"] = "auto"
 
-            response = self.__call_openai(params)
+            if remaining is not None:
+                params.setdefault("timeout", remaining)
+
+            with trace_span("openai.generate", "model", model=self.model_name):
+                response = self.__call_openai(params)
 
             message = response.choices[0].message
             tool_calls = None
@@ -161,6 +172,9 @@ class OpenAIModel(BaseAIModel):
         Returns:
                 Any: _description_
         """
+        # Inside a flow with a deadline, the request gets the remaining budget
+        check_cancelled("calling OpenAI")
+        remaining = check_deadline("calling OpenAI")
         try:
             params = {
                 "model": self.model_name,
@@ -176,86 +190,98 @@ class OpenAIModel(BaseAIModel):
                 ]
                 params["tool_choice"] = "auto"
 
-            stream = self.__call_stream_openai(params)
+            if remaining is not None:
+                params.setdefault("timeout", remaining)
+
+            # Covers opening the stream, chunks are consumed by the caller
+            with trace_span("openai.generate_stream", "model", model=self.model_name):
+                stream = self.__call_stream_openai(params)
 
             tool_calls_accumulator = {}
             tool_calls = None
 
-            for chunk in stream:
-                if chunk.usage:
-                    # ChatCompletionChunk(id='chatcmpl-B5SIoSdLpEFk9gFH0Vl4B6hM6st8H', choices=[], created=1740640134, model='gpt-4o-mini-2024-07-18', object='chat.completion.chunk', service_tier='default', system_fingerprint='fp_06737a9306', usage=CompletionUsage(completion_tokens=11, prompt_tokens=56, total_tokens=67, completion_tokens_details=CompletionTokensDetails(accepted_prediction_tokens=0, audio_tokens=0, reasoning_tokens=0, rejected_prediction_tokens=0), prompt_tokens_details=PromptTokensDetails(audio_tokens=0, cached_tokens=0)))
-                    # usage = chunk.usage
-                    # print(f"completion_tokens = {usage.completion_tokens or ''}")
-                    # print(f"prompt_tokens = {usage.prompt_tokens or ''}")
-                    # print(f"total_tokens = {usage.total_tokens or ''}")
-                    pass
-
-                if chunk.choices:
-                    content = None
-
-                    delta = chunk.choices[0].delta
-
-                    if delta.content is not None:
-                        content = delta.content
-
-                    if delta.tool_calls is not None:
-                        tool_calls = []
-                        for tool_call in delta.tool_calls:
-                            tool_call_id = (
-                                tool_call.id
-                            )  # Exists only in the first chunk
-
-                            if tool_call_id:  # First chunk of a new tool call
-                                tool_calls_accumulator[tool_call_id] = {
-                                    "request_call_id": chunk.id,
-                                    "tool_call_id": tool_call_id,
-                                    "name": tool_call.function.name,
-                                    "arguments": "",
-                                }
-
-                            # Find the active tool call in the accumulator
-                            active_tool_call = next(
-                                iter(tool_calls_accumulator.values()), None
-                            )
-                            if active_tool_call:
-                                # Accumulate arguments across multiple chunks
-                                active_tool_call["arguments"] += (
-                                    tool_call.function.arguments or ""
+            # Closing the stream early, e.g. when the run is cancelled or the caller
+            # stops reading, closes the HTTP response instead of reading it to the end
+            try:
+                for chunk in stream:
+                    if chunk.usage:
+                        # ChatCompletionChunk(id='chatcmpl-B5SIoSdLpEFk9gFH0Vl4B6hM6st8H', choices=[], created=1740640134, model='gpt-4o-mini-2024-07-18', object='chat.completion.chunk', service_tier='default', system_fingerprint='fp_06737a9306', usage=CompletionUsage(completion_tokens=11, prompt_tokens=56, total_tokens=67, completion_tokens_details=CompletionTokensDetails(accepted_prediction_tokens=0, audio_tokens=0, reasoning_tokens=0, rejected_prediction_tokens=0), prompt_tokens_details=PromptTokensDetails(audio_tokens=0, cached_tokens=0)))
+                        # usage = chunk.usage
+                        # print(f"completion_tokens = {usage.completion_tokens or ''}")
+                        # print(f"prompt_tokens = {usage.prompt_tokens or ''}")
+                        # print(f"total_tokens = {usage.total_tokens or ''}")
+                        pass
+
+                    if chunk.choices:
+                        content = None
+
+                        delta = chunk.choices[0].delta
+
+                        if delta.content is not None:
+                            content = delta.content
+
+                        if delta.tool_calls is not None:
+                            tool_calls = []
+                            for tool_call in delta.tool_calls:
+                                tool_call_id = (
+                                    tool_call.id
+                                )  # Exists only in the first chunk
+
+                                if tool_call_id:  # First chunk of a new tool call
+                                    tool_calls_accumulator[tool_call_id] = {
+                                        "request_call_id": chunk.id,
+                                        "tool_call_id": tool_call_id,
+                                        "name": tool_call.function.name,
+                                        "arguments": "",
+                                    }
+
+                                # Find the active tool call in the accumulator
+                                active_tool_call = next(
+                                    iter(tool_calls_accumulator.values()), None
                                 )
-
-                                # Try to parse accumulated JSON when complete
-                                try:
-                                    parsed_arguments = json.loads(
-                                        active_tool_call["arguments"]
+                                if active_tool_call:
+                                    # Accumulate arguments across multiple chunks
+                                    active_tool_call["arguments"] += (
+                                        tool_call.function.arguments or ""
                                     )
 
-                                    # Construct the ToolCall object
-                                    tool_calls.append(
-                                        ToolCall(
-                                            request_call_id=active_tool_call[
-                                                "request_call_id"
-                                            ],
-                                            tool_call_id=active_tool_call[
-                                                "tool_call_id"
-                                            ],
-                                            name=active_tool_call["name"],
-                                            arguments=parsed_arguments,
+                                    # Try to parse accumulated JSON when complete
+                                    try:
+                                        parsed_arguments = json.loads(
+                                            active_tool_call["arguments"]
                                         )
-                                    )
 
-                                    # Remove the tool call once fully processed
-                                    del tool_calls_accumulator[
-                                        active_tool_call["tool_call_id"]
-                                    ]
+                                        # Construct the ToolCall object
+                                        tool_calls.append(
+                                            ToolCall(
+                                                request_call_id=active_tool_call[
+                                                    "request_call_id"
+                                                ],
+                                                tool_call_id=active_tool_call[
+                                                    "tool_call_id"
+                                                ],
+                                                name=active_tool_call["name"],
+                                                arguments=parsed_arguments,
+                                            )
+                                        )
 
-                                except json.JSONDecodeError:
-                                    # JSON is incomplete, continue accumulating
-                                    pass
+                                        # Remove the tool call once fully processed
+                                        del tool_calls_accumulator[
+                                            active_tool_call["tool_call_id"]
+                                        ]
 
-                    yield AIResponse(
-                        content=content,
-                        tool_calls=tool_calls if tool_calls else None,
-                    )
+                                    except json.JSONDecodeError:
+                                        # JSON is incomplete, continue accumulating
+                                        pass
+
+                        yield AIResponse(
+                            content=content,
+                            tool_calls=tool_calls if tool_calls else None,
+                        )
+            finally:
+                stream.close()
 
+        except AIGooCancelledException:
+            raise
         except Exception as e:
             raise AIGooException(e)
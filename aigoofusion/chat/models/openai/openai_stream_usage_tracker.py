@@ -1,10 +1,10 @@
 from contextlib import contextmanager
 from contextvars import ContextVar
 import functools
-import itertools
 from typing import Any, Dict, Optional
 
 from aigoofusion.chat.models.openai.openai_usage import OpenAIUsage
+from aigoofusion.chat.models.tracked_stream import TrackedStream, estimate_tokens
 
 # Thread-safe storage for token usage per request
 OPENAI_STREAM_USAGE_TRACKER_VAR = ContextVar(
@@ -62,31 +62,33 @@ def openai_stream_usage_tracker(pricing: Optional[Dict[str, Any]] = None):
 
 
 def track_openai_stream_usage(func):
-    """Decorator to wrap `__call_stream_openai` calls on `OpenAIModel`."""
+    """
+    Decorator to wrap `__call_stream_openai` calls on `OpenAIModel`.
+
+    Usage is recorded from the last chunk while the caller reads the stream, or
+    estimated when the stream is closed or cancelled before it, see `TrackedStream`.
+    """
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         stream_origin = func(*args, **kwargs)
-        model = args[1]["model"]
         # args is tuple[OpenAIModel, params] and params contain `model`
-
-        stream_usage = None
-
-        if stream_origin:
-            stream, stream_copy = itertools.tee(
-                stream_origin
-            )  # Duplicate the generator
-            stream_origin = stream  # Replace original stream
-
-            stream_usage = None
-            for chunk in stream_copy:  # Iterate over the copy
-                if chunk.usage:
-                    stream_usage = chunk.usage
-                    break  # No need to iterate further
-
-        if stream_usage:
-            usage_tracker = OPENAI_STREAM_USAGE_TRACKER_VAR.get()
-            usage_tracker.update(model=model, usage=stream_usage)
-        return stream_origin
+        params = args[1]
+        model = params["model"]
+        if not stream_origin:
+            return stream_origin
+
+        # Bound now, the stream may be read after the tracker context has exited
+        usage_tracker = OPENAI_STREAM_USAGE_TRACKER_VAR.get()
+        prompt_tokens = estimate_tokens(params["messages"])
+        return TrackedStream(
+            stream_origin,
+            read_usage=lambda chunk: getattr(chunk, "usage", None),
+            estimate_usage=lambda chunks: {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": chunks,
+            },
+            record=lambda usage: usage_tracker.update(model=model, usage=usage),
+        )
 
     return wrapper
@@ -40,6 +40,8 @@ class OpenAIUsage:
                 raise AIGooException(error)
 
         self.total_request: int = 0
+        # Requests whose usage was estimated, e.g. streams stopped before their usage chunk
+        self.estimated_requests: int = 0
         self.output_tokens: int = 0
         self.input_tokens: int = 0
         self.total_tokens: int = 0
@@ -98,6 +100,8 @@ class OpenAIUsage:
         self.raw_usages.append(usage)
         usage_dict = vars(usage) if hasattr(usage, "__dict__") else usage
         self.total_request += 1
+        if usage_dict.get("estimated"):
+            self.estimated_requests += 1
         self.input_tokens += usage_dict.get("prompt_tokens", 0)
         self.output_tokens += usage_dict.get("completion_tokens", 0)
         self.total_tokens = self.input_tokens + self.output_tokens
@@ -115,6 +119,7 @@ class OpenAIUsage:
         Reset usage statistics and calculate price.
         """
         self.total_request = 0
+        self.estimated_requests = 0
         self.input_tokens = 0
         self.output_tokens = 0
         self.total_tokens = 0
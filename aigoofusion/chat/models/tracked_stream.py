@@ -0,0 +1,129 @@
+import json
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from aigoofusion.exception.aigoo_cancelled_exception import AIGooCancelledException
+from aigoofusion.runtime.cancellation import CANCEL_VAR
+
+
+def estimate_tokens(value: Any) -> int:
+    """Rough token count of a prompt, about four characters per token."""
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return (len(text) + 3) // 4
+
+
+class TrackedStream:
+    """
+    Model stream that records its token usage as the chunks pass through.
+
+    The stream is closed, which closes its HTTP response, when the current run is
+    cancelled or the stream is closed before its end. Usage is taken from the
+    provider's usage chunk. A stream that ends without one, e.g. because it was
+    stopped early, is recorded with an estimate marked `"estimated": True`: the
+    prompt from its length and one output token per chunk received.
+
+    Provider streams are not thread-safe, so a `close()` from another thread while
+    a chunk is being read only asks the reader to close the stream after that read.
+    """
+
+    def __init__(
+        self,
+        stream: Iterable[Any],
+        read_usage: Callable[[Any], Optional[Any]],
+        estimate_usage: Callable[[int], Dict[str, Any]],
+        record: Callable[[Any], None],
+    ):
+        """TrackedStream
+
+        Args:
+            stream (Iterable[Any]): Provider stream, closed with its `close()` when it has one.
+            read_usage (Callable[[Any], Optional[Any]]): Usage carried by a chunk, None for most chunks.
+            estimate_usage (Callable[[int], Dict[str, Any]]): Usage estimated from the chunk count,
+                recorded with `"estimated": True`.
+            record (Callable[[Any], None]): Adds usage to the tracker.
+        """
+        self._stream = stream
+        self._iterator = iter(stream)
+        self._read_usage = read_usage
+        self._estimate_usage = estimate_usage
+        self._record = record
+        self._chunks = 0
+        self._recorded = False
+        self._closed = False
+        self._close_requested = False
+        self._lock = threading.Lock()
+        # Held while a chunk is read, the stream is never closed under the reader
+        self._read_lock = threading.Lock()
+
+        self._token = CANCEL_VAR.get()
+        self._unregister: List[Callable[[], None]] = []
+        if self._token is not None:
+            self._unregister.append(self._token.add_callback(self.close))
+
+    def __iter__(self) -> "TrackedStream":
+        return self
+
+    def __next__(self) -> Any:
+        with self._read_lock:
+            if not self._closed and not self._close_requested:
+                try:
+                    chunk = next(self._iterator)
+                except StopIteration:
+                    self._close_stream(close_response=False)
+                    raise
+                except Exception:
+                    self._close_stream()
+                    raise
+
+                self._chunks += 1
+                usage = self._read_usage(chunk)
+                if usage is not None:
+                    self._record_once(usage)
+                if not self._close_requested:
+                    return chunk
+            self._close_stream()
+        self._raise_if_cancelled()
+        raise StopIteration
+
+    def close(self) -> None:
+        """Stop the stream and close its response, recording what was used so far."""
+        if not self._read_lock.acquire(blocking=False):
+            # A chunk is being read on another thread, which closes the stream after it
+            self._close_requested = True
+            return
+        try:
+            self._close_stream()
+        finally:
+            self._read_lock.release()
+
+    def _close_stream(self, close_response: bool = True) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._chunks:
+            self._record_once({**self._estimate_usage(self._chunks), "estimated": True})
+        for unregister in self._unregister:
+            unregister()
+        self._unregister = []
+        close = getattr(self._stream, "close", None)
+        if close_response and close is not None:
+            close()
+
+    def _record_once(self, usage: Any) -> None:
+        with self._lock:
+            if self._recorded:
+                return
+            self._recorded = True
+        self._record(usage)
+
+    def _raise_if_cancelled(self) -> None:
+        if self._token is not None and self._token.cancelled:
+            raise AIGooCancelledException("Run cancelled while streaming from the model")
+
+    def __del__(self):
+        # An abandoned stream still holds its connection
+        try:
+            self.close()
+        except Exception:
+            pass
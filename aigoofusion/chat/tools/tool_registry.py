@@ -3,6 +3,7 @@ from typing import Any, Callable, Dict, List
 from aigoofusion.chat.models.base_ai_model import BaseAIModel
 from aigoofusion.chat.tools.tool import Tool
 from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.runtime.trace import trace_span
 
 
 class ToolRegistry:
@@ -48,4 +49,5 @@ class ToolRegistry:
         """Execute a registered tool."""
         if name not in self._tools:
             raise AIGooException(f"Tool not found: {name}")
-        return self._tools[name](**arguments)
+        with trace_span(f"tool {name}", "tool"):
+            return self._tools[name](**arguments)
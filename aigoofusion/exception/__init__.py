@@ -1,3 +1,11 @@
 from .aigoo_exception import AIGooException
+from .aigoo_limit_exception import AIGooLimitException
+from .aigoo_cancelled_exception import AIGooCancelledException
+from .aigoo_circuit_open_exception import AIGooCircuitOpenException
 
-__all__ = ["AIGooException"]
+__all__ = [
+    "AIGooException",
+    "AIGooLimitException",
+    "AIGooCancelledException",
+    "AIGooCircuitOpenException",
+]
@@ -0,0 +1,18 @@
+from typing import Any, Dict, Optional
+
+from aigoofusion.exception.aigoo_limit_exception import AIGooLimitException
+
+
+class AIGooCancelledException(AIGooLimitException):
+    """
+    Raised when a run is cancelled, with `AIGooFlow.cancel` or by closing its stream.
+
+    Handled like a limit, so the partial state is attached the same way.
+
+    Attributes:
+        reason: Always `cancelled`.
+        state: State of the run when it was stopped, if known.
+    """
+
+    def __init__(self, message: str, state: Optional[Dict[str, Any]] = None):
+        super().__init__(message, reason="cancelled", state=state)
@@ -0,0 +1,16 @@
+from aigoofusion.exception.aigoo_exception import AIGooException
+
+
+class AIGooCircuitOpenException(AIGooException):
+    """
+    Raised instead of calling a node while its circuit breaker is open.
+
+    Attributes:
+        breaker: Name of the open circuit breaker.
+        retry_after: Seconds until the breaker lets a trial call through.
+    """
+
+    def __init__(self, message: str, breaker: str, retry_after: float):
+        super().__init__(message)
+        self.breaker = breaker
+        self.retry_after = retry_after
@@ -0,0 +1,23 @@
+from typing import Any, Dict, Optional
+
+from aigoofusion.exception.aigoo_exception import AIGooException
+
+
+class AIGooLimitException(AIGooException):
+    """
+    Raised when a run hits a limit: its timeout, a node timeout or its step budget.
+
+    Attributes:
+        reason: Which limit was hit, `timeout`, `node_timeout` or `max_steps`.
+        state: State of the run when it was stopped, if known.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        reason: str,
+        state: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(message)
+        self.reason = reason
+        self.state = state
@@ -1,8 +1,40 @@
 from .edge import Edge
 from .helper import tools_node
-from .node import Node, NodeType, START, END
-from .state import WorkflowState, MemoryManager
-from .visualizer import WorkflowVisualizer
+from .node import Node, NodeType, NodeExecutor, START, END
+from .state import WorkflowState, MemoryManager, StateView
+from .plan import (
+    ExecutionPlan,
+    DuplicateExecutionWarning,
+    UnreachableNodeWarning,
+    UnsatisfiableJoinWarning,
+)
+from .context import RunContext
+from .event import EVENT_TYPES, FlowEvent, StreamMode
+from .cache import NodeCache
+from .batch import BatchItemResult
+from .hooks import FlowHooks
+from .metrics import MetricsRegistry
+from .distributed import (
+    BaseTaskQueue,
+    MemoryTaskQueue,
+    LocalTaskQueue,
+    FlowWorker,
+    RemoteFlow,
+    spawn_workers,
+)
+from .executor import SharedPayload
+from .checkpoint import (
+    Checkpoint,
+    BaseCheckpointer,
+    MemoryCheckpointer,
+    FileCheckpointer,
+    SQLiteCheckpointer,
+)
+from .speculation import BranchPredictor
+from .fanout import MapErrorMode
+from .resilience import RetryPolicy, CircuitBreaker, CircuitState
+from .scheduler import FlowScheduler, Priority
+from .visualizer import WorkflowVisualizer, ProfileOverlay
 from .aigoo_flow import AIGooFlow
 
 __all__ = [
@@ -11,9 +43,43 @@ __all__ = [
     "tools_node",
     "Node",
     "NodeType",
+    "NodeExecutor",
     "START",
     "END",
     "WorkflowState",
     "MemoryManager",
+    "StateView",
     "WorkflowVisualizer",
+    "ProfileOverlay",
+    "BranchPredictor",
+    "MapErrorMode",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "CircuitState",
+    "FlowScheduler",
+    "Priority",
+    "ExecutionPlan",
+    "DuplicateExecutionWarning",
+    "UnsatisfiableJoinWarning",
+    "UnreachableNodeWarning",
+    "RunContext",
+    "FlowEvent",
+    "StreamMode",
+    "EVENT_TYPES",
+    "NodeCache",
+    "BatchItemResult",
+    "FlowHooks",
+    "MetricsRegistry",
+    "BaseTaskQueue",
+    "MemoryTaskQueue",
+    "LocalTaskQueue",
+    "FlowWorker",
+    "RemoteFlow",
+    "spawn_workers",
+    "SharedPayload",
+    "Checkpoint",
+    "BaseCheckpointer",
+    "MemoryCheckpointer",
+    "FileCheckpointer",
+    "SQLiteCheckpointer",
 ]
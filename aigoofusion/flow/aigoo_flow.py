@@ -1,13 +1,90 @@
+import asyncio
 import base64
+import contextvars
+import functools
 import inspect
-from typing import Any, Callable, Dict, List, Optional, Union, AsyncGenerator
-
+import multiprocessing
+import pickle
+import sys
+import threading
+import time
+import warnings
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from copy import deepcopy
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+
+from aigoofusion.exception.aigoo_cancelled_exception import AIGooCancelledException
+from aigoofusion.exception.aigoo_circuit_open_exception import AIGooCircuitOpenException
 from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.exception.aigoo_limit_exception import AIGooLimitException
+from aigoofusion.flow.batch.batch_item_result import BatchItemResult
+from aigoofusion.flow.cache.node_cache import NodeCache
+from aigoofusion.flow.checkpoint.base_checkpointer import BaseCheckpointer
+from aigoofusion.flow.checkpoint.checkpoint import Checkpoint
+from aigoofusion.flow.context.run_context import RunContext
+from aigoofusion.flow.distributed.base_task_queue import BaseTaskQueue
+from aigoofusion.flow.distributed.codec import decode, encode
+from aigoofusion.flow.distributed.flow_task import FlowTask, TaskKind
+from aigoofusion.flow.distributed.task_dispatcher import TaskDispatcher
 from aigoofusion.flow.edge.edge import Edge
-from aigoofusion.flow.node.node import END, START, Node, NodeType
+from aigoofusion.flow.event.flow_event import EVENT_TYPES, FlowEvent, StreamMode
+from aigoofusion.flow.executor.process_call import call_in_process
+from aigoofusion.flow.executor.shared_payload import (
+    SHARED_MEMORY_MIN_SIZE,
+    discard,
+    release,
+    restore,
+    share,
+)
+from aigoofusion.flow.fanout.map_spec import MapErrorMode, MapSpec, map_error
+from aigoofusion.flow.hooks.flow_hooks import FlowHooks
+from aigoofusion.flow.metrics.metrics_registry import MetricsRegistry
+from aigoofusion.flow.node.node import END, START, Node, NodeExecutor, NodeType
+from aigoofusion.flow.plan.execution_plan import (
+    DuplicateExecutionWarning,
+    ExecutionPlan,
+    UnreachableNodeWarning,
+    UnsatisfiableJoinWarning,
+)
+from aigoofusion.flow.resilience.circuit_breaker import CircuitBreaker
+from aigoofusion.flow.resilience.retry_policy import RetryPolicy
+from aigoofusion.flow.scheduler.flow_scheduler import FlowScheduler
+from aigoofusion.flow.scheduler.priority import Priority
+from aigoofusion.flow.speculation.branch_predictor import BranchPredictor
+from aigoofusion.flow.speculation.speculative_run import SpeculativeRun
 from aigoofusion.flow.state.memory_manager import MemoryManager
+from aigoofusion.flow.state.state_view import StateView
 from aigoofusion.flow.state.workflow_state import WorkflowState
+from aigoofusion.flow.visualizer.profile_overlay import ProfileOverlay
 from aigoofusion.flow.visualizer.visualizer import WorkflowVisualizer
+from aigoofusion.runtime.cancellation import cancel_scope
+from aigoofusion.runtime.deadline import deadline_scope, remaining_time
+from aigoofusion.runtime.trace import TraceRecorder, trace_span
+
+# Marks the end of a sync iterator consumed from a worker thread
+_EXHAUSTED = object()
+
+# Chunks a node attempt forwarded, a streaming node is only retried before its first one
+_STREAMED: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar(
+    "AIGOO_STREAMED", default=None
+)
+
+# Marks a batch worker that has run out of inputs
+_WORKER_DONE = object()
+
+# Subflow events forwarded to the parent run, all about a single subflow node
+_SUBFLOW_EVENTS = frozenset({"node_start", "stream_chunk", "node_complete", "error"})
 
 
 class AIGooFlow:
@@ -15,15 +92,171 @@ class AIGooFlow:
         self,
         initial_state: Optional[Dict[str, Any]] = None,
         memory: Optional[MemoryManager] = None,
+        max_concurrency: Optional[int] = 1,
+        history_limit: Optional[int] = None,
+        checkpointer: Optional[BaseCheckpointer] = None,
+        max_steps: Optional[int] = None,
+        offload_sync: bool = False,
+        thread_pool: Union[ThreadPoolExecutor, int, None] = None,
+        process_pool: Union[ProcessPoolExecutor, int, None] = None,
+        shared_memory_min_size: int = SHARED_MEMORY_MIN_SIZE,
+        metrics: Optional[MetricsRegistry] = None,
+        name: Optional[str] = None,
+        task_queue: Optional[BaseTaskQueue] = None,
+        branch_predictor: Optional[BranchPredictor] = None,
+        scheduler: Optional[FlowScheduler] = None,
     ):
+        """
+        AIGooFlow
+
+        Args:
+            initial_state (Optional[Dict[str, Any]], optional): Initial workflow state. Defaults to None.
+            memory (Optional[MemoryManager], optional): Memory manager to persist state per thread. Defaults to None.
+            max_concurrency (Optional[int], optional): Maximum number of ready nodes run at the same time,
+                e.g. the targets of several `add_edge` calls from the same source. Defaults to 1 (sequential).
+                Set to None for no limit.
+            history_limit (Optional[int], optional): Number of state updates kept in history.
+                None keeps every update, 0 turns history off. Defaults to None.
+            checkpointer (Optional[BaseCheckpointer], optional): Saves the run state and the node queue
+                after every node, so a run can be continued with `resume`. Defaults to None.
+            max_steps (Optional[int], optional): Maximum number of nodes a run may execute, guards
+                cyclic graphs against endless loops. Defaults to None.
+            offload_sync (bool, optional): Run sync nodes and sync conditions in `thread_pool`, so a
+                blocking call (e.g. `OpenAIModel.generate`) does not stall the event loop. Can be
+                overridden per node with `executor`. Offloaded nodes may run on any pool thread,
+                so they must not rely on thread-local state. Defaults to False (on the event loop).
+            thread_pool (Union[ThreadPoolExecutor, int, None], optional): Pool for offloaded calls, or the
+                number of workers of a pool owned by the workflow. Defaults to None (default pool size).
+            process_pool (Union[ProcessPoolExecutor, int, None], optional): Pool for nodes added with
+                `executor="process"`, or the number of workers of a pool owned by the workflow. The owned
+                pool uses the `spawn` start method. Defaults to None (one worker per core).
+            shared_memory_min_size (int, optional): `bytes`, `bytearray` and numpy arrays of at least this
+                many bytes are passed to and from process nodes through shared memory instead of being
+                pickled. Defaults to 1 MiB.
+            metrics (Optional[MetricsRegistry], optional): Registry recording node latencies, calls,
+                errors, update sizes and queue depth. Defaults to None.
+            name (Optional[str], optional): Name the workflow is registered under on flow workers,
+                required for `remote` nodes. Defaults to None.
+            task_queue (Optional[BaseTaskQueue], optional): Queue `remote` nodes are sent to, see
+                `FlowWorker`. Defaults to None.
+            branch_predictor (Optional[BranchPredictor], optional): Picks the targets speculative
+                conditional edges start early, learns from every decision of those edges.
+                Defaults to None (a new `BranchPredictor`).
+            scheduler (Optional[FlowScheduler], optional): Admits the node calls of every run by
+                priority class and fairly per tenant, within global and per-node limits. Share
+                one scheduler between all workflows of the process. Defaults to None.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be at least 1 or None")
+
         self.nodes: Dict[str, Node] = {
             START: Node(name=START, node_type=NodeType.START),
             END: Node(name=END, node_type=NodeType.END),
         }
         self.edges: List[Edge] = []
-        self.state = WorkflowState(initial_state or {})
+        self.initial_state: Dict[str, Any] = deepcopy(initial_state or {})
         self.visualizer = WorkflowVisualizer()
         self.memory = memory
+        self.max_concurrency = max_concurrency
+        self.history_limit = history_limit
+        self.checkpointer = checkpointer
+        self.max_steps = max_steps
+        self.offload_sync = offload_sync
+        self._owns_thread_pool = not isinstance(thread_pool, ThreadPoolExecutor)
+        self._thread_pool_size = thread_pool if isinstance(thread_pool, int) else None
+        self._thread_pool: Optional[ThreadPoolExecutor] = (
+            None if self._owns_thread_pool else thread_pool  # type: ignore
+        )
+        self._owns_process_pool = not isinstance(process_pool, ProcessPoolExecutor)
+        self._process_pool_size = process_pool if isinstance(process_pool, int) else None
+        self._process_pool: Optional[ProcessPoolExecutor] = (
+            None if self._owns_process_pool else process_pool  # type: ignore
+        )
+        self.shared_memory_min_size = shared_memory_min_size
+        # Stays None until a hook is registered, so runs without hooks skip them
+        self._hooks: Optional[FlowHooks] = None
+        self.metrics = metrics
+        self.name = name
+        self.task_queue = task_queue
+        self._dispatcher: Optional[TaskDispatcher] = None
+        self.branch_predictor = branch_predictor or BranchPredictor()
+        self.scheduler = scheduler
+        if metrics is not None:
+            self.on_node_start(metrics.on_node_start)
+            self.on_node_end(metrics.on_node_end)
+            self.on_error(metrics.on_error)
+            self.on_edge(metrics.on_edge)
+        self._last_run: Optional[RunContext] = None
+        # Runs in progress by run ID, for `cancel`
+        self._runs: Dict[str, RunContext] = {}
+        self._plan: Optional[ExecutionPlan] = None
+
+    @property
+    def state(self) -> WorkflowState:
+        """
+        State of the most recently started run.
+
+        Kept for backward compatibility. With concurrent runs use the state
+        returned by `execute` or the `workflow_complete` event of `stream`.
+        """
+        if self._last_run is None:
+            return WorkflowState(self.initial_state, history_limit=self.history_limit)
+        return self._last_run.state
+
+    def create_run_context(
+        self,
+        thread_id: Optional[str] = None,
+        initial_state: Optional[Dict[str, Any]] = None,
+        run_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> RunContext:
+        """Create the per-run context holding the state, history and memory binding."""
+        if self.memory and not thread_id:
+            raise AIGooException("`thread_id` required because workflow has memory.")
+
+        if run_id:
+            kwargs["run_id"] = run_id
+        if "priority" in kwargs:
+            kwargs["priority"] = Priority(kwargs["priority"])
+        if timeout is not None:
+            kwargs["deadline"] = time.monotonic() + timeout
+
+        # Snapshots are copy-on-write, so runs can share the initial values
+        context = RunContext(
+            state=WorkflowState(
+                self.initial_state if initial_state is None else initial_state,
+                history_limit=self.history_limit,
+            ),
+            thread_id=thread_id,
+            memory=self.memory,
+            max_steps=self.max_steps,
+            **kwargs,
+        )
+        self._last_run = context
+        return context
+
+    def _add_hook(self, event: str, callback: Callable) -> Callable:
+        if self._hooks is None:
+            self._hooks = FlowHooks()
+        self._hooks.add(event, callback)
+        return callback
+
+    def on_node_start(self, callback: Callable) -> Callable:
+        """Register `callback(context, node)`, called before a node runs. Usable as a decorator."""
+        return self._add_hook("on_node_start", callback)
+
+    def on_node_end(self, callback: Callable) -> Callable:
+        """Register `callback(context, node, duration, updates)`, called when a node succeeds."""
+        return self._add_hook("on_node_end", callback)
+
+    def on_edge(self, callback: Callable) -> Callable:
+        """Register `callback(context, source, target)`, called for every transition taken."""
+        return self._add_hook("on_edge", callback)
+
+    def on_error(self, callback: Callable) -> Callable:
+        """Register `callback(context, node, error)`, called when a node fails."""
+        return self._add_hook("on_error", callback)
 
     def validate_workflow(self) -> bool:
         """
@@ -46,12 +279,62 @@ class AIGooFlow:
 
         return True
 
+    def compile(self) -> ExecutionPlan:
+        """
+        Validate the workflow and freeze it into an `ExecutionPlan`.
+
+        The plan is cached and reused by `execute` and `stream` until the graph
+        changes (`add_node`, `add_edge` or `add_conditional_edge`). A node that
+        several branches lead to without `join` runs once per branch, compiling
+        warns about it with a `DuplicateExecutionWarning`. A join node whose
+        predecessors are only reached through exclusive conditional branches may
+        never run, compiling warns about it with an `UnsatisfiableJoinWarning`.
+        Nodes without a path from START warn with an `UnreachableNodeWarning`.
+
+        Returns:
+            ExecutionPlan: Indexed, immutable view of the workflow graph.
+        """
+        if self._plan is None:
+            self.validate_workflow()
+            self._plan = ExecutionPlan.build(self.nodes, self.edges)
+            for name in sorted(self._plan.unreachable - {START, END}):
+                warnings.warn(
+                    f"Node '{name}' can not be reached from START and never runs.",
+                    UnreachableNodeWarning,
+                    stacklevel=2,
+                )
+            for name in self._plan.duplicate_risks:
+                warnings.warn(
+                    f"Node '{name}' has several incoming branches that can run in the "
+                    "same run, and runs once for each of them that reaches it. Use `join` "
+                    "to run it once.",
+                    DuplicateExecutionWarning,
+                    stacklevel=2,
+                )
+            for name in self._plan.unsatisfiable_joins:
+                required, sources = self._plan.joins[name]
+                warnings.warn(
+                    f"Join node '{name}' waits for {required} of {sorted(sources)}, but they are "
+                    "only reached through conditional branches that may not all be taken. "
+                    "The node may never run.",
+                    UnsatisfiableJoinWarning,
+                    stacklevel=2,
+                )
+        return self._plan
+
     def add_node(
         self,
         name: str,
         func: Callable,
         node_type: NodeType = NodeType.FUNCTION,
         stream: bool = False,
+        readonly: bool = False,
+        cache: Union[NodeCache, bool, None] = None,
+        timeout: Optional[float] = None,
+        executor: Union[NodeExecutor, str, None] = None,
+        join: Union[str, int, None] = None,
+        retry: Union[RetryPolicy, bool, None] = None,
+        circuit_breaker: Union[CircuitBreaker, bool, None] = None,
     ) -> None:
         """
         Add a node to the workflow.
@@ -62,6 +345,27 @@ class AIGooFlow:
             func (Callable): Node description
             node_type (NodeType, optional): Node type. Defaults to NodeType.FUNCTION.
             stream (bool, optional): Node is use stream or not, if node use streaming set to True. Defaults to False.
+            readonly (bool, optional): Pass inputs by reference and `state` as a read-only `StateView`
+                instead of copies. The node must not mutate what it receives. Defaults to False.
+            cache (Union[NodeCache, bool, None], optional): Memoize the node on the values of its inputs,
+                True uses an in-memory `NodeCache`. Only for pure nodes that take every value they
+                read as a parameter. Defaults to None.
+            timeout (Optional[float], optional): Seconds the node may run. Model calls inside the node
+                get the remaining time as their timeout. Defaults to None.
+            executor (Union[NodeExecutor, str, None], optional): `thread` runs a sync node in the thread pool,
+                `process` in the process pool, `remote` on a flow worker through `task_queue` and
+                `inline` on the event loop. Process nodes must be picklable module-level functions,
+                process and remote nodes can not take `state` or stream. Defaults to None
+                (`thread` for sync nodes when `offload_sync`).
+            join (Union[str, int, None], optional): Wait until "all" or this many predecessors reached
+                the node, then run it once on the merged state. Later predecessors of the same round
+                are skipped. Edges that close a loop do not count. Defaults to None (run on every arrival).
+            retry (Union[RetryPolicy, bool, None], optional): Call the node again when it fails with a
+                retryable error, True uses a default `RetryPolicy` (3 attempts, transient errors only).
+                A streaming node is not retried once it sent a chunk. Defaults to None.
+            circuit_breaker (Union[CircuitBreaker, bool, None], optional): Fail fast while the breaker
+                is open, share one breaker between nodes that use the same resource. True gives the
+                node a breaker of its own. Defaults to None.
 
         Raises:
             ValueError: _description_
@@ -71,24 +375,44 @@ class AIGooFlow:
         """
         if name in (START, END):
             raise ValueError(f"Cannot add node with reserved name {name}")
-
-        # Modify the function to include state access
-        original_func = func
-
-        async def wrapped_func(*args, **kwargs):
-            sig = inspect.signature(original_func)
+        self._validate_join(name, join)
+
+        # Work out the call plan once, so running the node needs no reflection
+        sig = inspect.signature(func)
+
+        if cache is True:
+            cache = NodeCache()
+        if retry is True:
+            retry = RetryPolicy()
+        if circuit_breaker is True:
+            circuit_breaker = CircuitBreaker(name)
+        if cache:
             if "state" in sig.parameters:
-                kwargs["state"] = self.state
-
-            if inspect.iscoroutinefunction(original_func):
-                return await original_func(*args, **kwargs)
-            return original_func(*args, **kwargs)
+                raise ValueError(
+                    f"Cached node '{name}' can not take `state`, its cache key only covers its inputs"
+                )
+            if stream:
+                raise ValueError(f"Streaming node '{name}' can not be cached")
 
-        wrapped_func.__signature__ = inspect.signature(original_func)  # type: ignore
-        wrapped_func.__annotations__ = original_func.__annotations__
+        is_async = inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(
+            getattr(func, "__call__", None)
+        )
+        is_async_gen = inspect.isasyncgenfunction(func)
+        node_executor = self._resolve_executor(
+            executor, is_async or is_async_gen, f"Node '{name}'"
+        )
+        if node_executor is NodeExecutor.PROCESS:
+            self._validate_process_node(name, func, sig, stream)
+        elif node_executor is NodeExecutor.REMOTE:
+            self._validate_remote_node(name, sig, stream)
 
-        sig = inspect.signature(original_func)
         inputs = list(sig.parameters.keys())
+        inject = tuple(
+            input_name
+            for input_name, param in sig.parameters.items()
+            if input_name != "state"
+            and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)
+        )
 
         outputs = []
         if sig.return_annotation != inspect.Signature.empty:
@@ -98,12 +422,209 @@ class AIGooFlow:
         node = Node(
             name=name,
             node_type=node_type,
-            func=wrapped_func,
+            func=func,
             inputs=inputs,
             outputs=outputs,
             stream=stream,
+            readonly=readonly,
+            inject=inject,
+            wants_state="state" in sig.parameters,
+            is_async=is_async,
+            is_async_gen=is_async_gen,
+            output_key=outputs[0] if len(outputs) == 1 else None,
+            cache=cache or None,
+            timeout=timeout,
+            executor=node_executor,
+            join=join,
+            retry=retry or None,
+            circuit_breaker=circuit_breaker or None,
+        )
+        self.nodes[name] = node
+        self._plan = None
+
+    def add_subflow(
+        self,
+        name: str,
+        flow: "AIGooFlow",
+        input_map: Union[Dict[str, str], List[str]],
+        output_map: Union[Dict[str, str], List[str]],
+        timeout: Optional[float] = None,
+        join: Union[str, int, None] = None,
+    ) -> None:
+        """
+        Add another workflow as a single node.
+
+        The subflow runs inside the parent run: it shares its deadline, events and
+        trace, but has a state of its own built from the subflow's initial state and
+        the mapped parent keys. Only mapped keys cross the boundary, by reference, and
+        the subflow graph is validated here once. Memory and checkpointer of the
+        subflow are not used.
+
+        Args:
+            name (str): Node name.
+            flow (AIGooFlow): Workflow to embed.
+            input_map (Union[Dict[str, str], List[str]]): Parent key to subflow key, a list maps keys
+                to the same name.
+            output_map (Union[Dict[str, str], List[str]]): Subflow key to parent key, a list maps keys
+                to the same name.
+            timeout (Optional[float], optional): Seconds the subflow may run. Defaults to None.
+            join (Union[str, int, None], optional): Predecessors to wait for, like `add_node`.
+                Defaults to None.
+
+        Raises:
+            ValueError: When the name is reserved or the subflow is this workflow.
+        """
+        if name in (START, END):
+            raise ValueError(f"Cannot add node with reserved name {name}")
+        self._validate_join(name, join)
+        if flow is self:
+            raise ValueError("A workflow can not contain itself")
+
+        if isinstance(input_map, list):
+            input_map = {key: key for key in input_map}
+        if isinstance(output_map, list):
+            output_map = {key: key for key in output_map}
+
+        # Fails early on an invalid subflow, and runs reuse the compiled plan
+        flow.compile()
+
+        self.nodes[name] = Node(
+            name=name,
+            node_type=NodeType.SUBFLOW,
+            inputs=list(input_map),
+            outputs=list(output_map.values()),
+            # Subflow writes are copied on write, so inputs need no copy
+            readonly=True,
+            inject=tuple(input_map),
+            timeout=timeout,
+            subflow=flow,
+            input_map=dict(input_map),
+            output_map=dict(output_map),
+            join=join,
+        )
+        self._plan = None
+
+    def add_map(
+        self,
+        name: str,
+        items: Union[str, Callable],
+        worker: Union[Callable, "AIGooFlow"],
+        output_key: str,
+        concurrency: int = 10,
+        reducer: Optional[Callable[[List[Any]], Any]] = None,
+        on_error: Union[MapErrorMode, str] = MapErrorMode.RAISE,
+        max_failures: Optional[int] = None,
+        errors_key: Optional[str] = None,
+        item_key: str = "item",
+        result_key: Optional[str] = None,
+        item_timeout: Optional[float] = None,
+        timeout: Optional[float] = None,
+        readonly: bool = False,
+        executor: Union[NodeExecutor, str, None] = None,
+        join: Union[str, int, None] = None,
+    ) -> None:
+        """
+        Add a node that runs `worker` on every item of a list, `concurrency` items at a time.
+
+        Items are pulled one by one as workers free up, so a lazy producer is only
+        advanced as fast as the items are processed. Results are collected in item
+        order, passed through `reducer` and written to `output_key` once all items
+        are done.
+
+        Args:
+            name (str): Node name.
+            items (Union[str, Callable]): State key holding the items, or a function taking state
+                keys like a node and returning or yielding the items (sync or async).
+            worker (Union[Callable, AIGooFlow]): Function called with an item as its first parameter,
+                or a workflow run per item with the item in `item_key`.
+            output_key (str): State key the results are written to.
+            concurrency (int, optional): Items processed at the same time. Defaults to 10.
+            reducer (Optional[Callable[[List[Any]], Any]], optional): Turns the list of results into
+                the value written. Defaults to None (the list itself).
+            on_error (Union[MapErrorMode, str], optional): `raise` cancels the remaining items and
+                fails the node, `skip` leaves failed items out of the results. Defaults to `raise`.
+            max_failures (Optional[int], optional): With `skip`, fail the node once more items than
+                this failed. Defaults to None (no limit).
+            errors_key (Optional[str], optional): With `skip`, state key the failures are written to
+                as `{"index", "item", "error"}` dicts. Defaults to None.
+            item_key (str, optional): Key a workflow worker gets the item in. Defaults to "item".
+            result_key (Optional[str], optional): Key of a workflow worker's final state used as the
+                result. Defaults to None (the whole final state).
+            item_timeout (Optional[float], optional): Seconds one item may take, a timed out item is a
+                failure like any other. Defaults to None.
+            timeout (Optional[float], optional): Seconds the whole node may run. Defaults to None.
+            readonly (bool, optional): Pass the items by reference instead of copying them, the
+                worker must not mutate them. Defaults to False.
+            executor (Union[NodeExecutor, str, None], optional): Where a function worker runs, like
+                `add_node`. `remote` is not supported. Defaults to None.
+            join (Union[str, int, None], optional): Predecessors to wait for, like `add_node`.
+                Defaults to None.
+
+        Raises:
+            ValueError: On an invalid name, worker or setting.
+        """
+        if name in (START, END):
+            raise ValueError(f"Cannot add node with reserved name {name}")
+        self._validate_join(name, join)
+        if concurrency < 1:
+            raise ValueError("`concurrency` must be at least 1")
+        on_error = MapErrorMode(on_error)
+
+        spec = MapSpec(
+            items=items if isinstance(items, str) else None,
+            worker=worker,
+            output_key=output_key,
+            concurrency=concurrency,
+            reducer=reducer,
+            on_error=on_error,
+            max_failures=max_failures,
+            errors_key=errors_key,
+            item_key=item_key,
+            result_key=result_key,
+            item_timeout=item_timeout,
+        )
+        if isinstance(worker, AIGooFlow):
+            if worker is self:
+                raise ValueError("A workflow can not map itself")
+            # Fails early on an invalid workflow, and items reuse the compiled plan
+            worker.compile()
+        else:
+            worker_sig = inspect.signature(worker)
+            if not worker_sig.parameters:
+                raise ValueError(f"Worker of map '{name}' must take the item as a parameter")
+            spec.item_param = next(iter(worker_sig.parameters))
+            spec.worker_is_async = inspect.iscoroutinefunction(worker)
+            spec.executor = self._resolve_executor(
+                executor, spec.worker_is_async, f"Worker of map '{name}'"
+            )
+            if spec.executor is NodeExecutor.REMOTE:
+                raise ValueError(f"Worker of map '{name}' can not use the `remote` executor")
+            if spec.executor is NodeExecutor.PROCESS:
+                self._validate_process_node(name, worker, worker_sig, False)
+
+        node = Node(
+            name=name,
+            node_type=NodeType.MAP,
+            outputs=[output_key] + ([errors_key] if errors_key else []),
+            readonly=readonly,
+            timeout=timeout,
+            mapper=spec,
+            join=join,
         )
+        if isinstance(items, str):
+            node.inputs = [items]
+            node.inject = (items,)
+        else:
+            # The producer takes state keys like a node
+            sig = inspect.signature(items)
+            node.func = items
+            node.inputs = list(sig.parameters)
+            node.inject = tuple(key for key in sig.parameters if key != "state")
+            node.wants_state = "state" in sig.parameters
+            node.is_async = inspect.iscoroutinefunction(items)
+            node.is_async_gen = inspect.isasyncgenfunction(items)
         self.nodes[name] = node
+        self._plan = None
 
     def add_edge(self, source: str, target: str) -> None:
         """Add a direct edge between nodes."""
@@ -114,11 +635,33 @@ class AIGooFlow:
 
         edge = Edge(source=source, targets=[target])
         self.edges.append(edge)
+        self._plan = None
 
     def add_conditional_edge(
-        self, source: str, targets: Union[str, List[str]], condition: Callable
+        self,
+        source: str,
+        targets: Union[str, List[str]],
+        condition: Callable,
+        executor: Union[NodeExecutor, str, None] = None,
+        speculative: bool = False,
     ) -> None:
-        """Add a conditional edge with multiple possible targets."""
+        """
+        Add a conditional edge with multiple possible targets.
+
+        `condition` receives a read-only `StateView` and returns the target name.
+        Like sync nodes it runs in the thread pool when `offload_sync` is set, pass
+        `executor="inline"` to run it on the event loop instead.
+
+        A `speculative` edge starts the target `branch_predictor` expects together with
+        `source`, outside `max_concurrency`, on the state `source` starts from. The
+        target's events and stream chunks are held back until the edge picks it, and its
+        result is only used if `source` left the values it reads unchanged, otherwise it
+        runs again. A target the edge does not pick is cancelled and its updates dropped,
+        so the result is the same, but the work of a wrong guess (e.g. model tokens) is
+        still done. Only for targets that have no side effects besides their updates.
+        Targets that take `state` or are join nodes are never started early. Hooks and
+        metrics only see the runs the edge picks.
+        """
         if source not in self.nodes:
             raise ValueError(f"Source node '{source}' not found")
 
@@ -130,119 +673,1204 @@ class AIGooFlow:
 
         original_condition = condition
 
-        def wrapped_condition(*args, **kwargs):
-            result = original_condition(self.state)
+        def wrapped_condition(state):
+            result = original_condition(state)
             if result not in target_list and result != END:
                 raise ValueError(
                     f"Condition returned '{result}' which is not in targets: {target_list}"
                 )
             return result
 
-        edge = Edge(source=source, targets=target_list, condition=wrapped_condition)
+        edge_executor = self._resolve_executor(
+            executor, False, f"Condition of '{source}'"
+        )
+        if edge_executor in (NodeExecutor.PROCESS, NodeExecutor.REMOTE):
+            raise ValueError("Conditions can only use the `inline` or `thread` executor")
+
+        edge = Edge(
+            source=source,
+            targets=target_list,
+            condition=wrapped_condition,
+            executor=edge_executor,
+            speculative=speculative,
+        )
         self.edges.append(edge)
+        self._plan = None
 
-    def _handle_state_update(self, additional_state, thread_id=None):
-        updated_state = (
-            self.memory.update_memory(thread_id, additional_state)
-            if self.memory and thread_id
-            else additional_state
-        )
-        self.state._update(updated_state)
+    async def _run_node(
+        self,
+        plan: ExecutionPlan,
+        context: RunContext,
+        name: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a single node and return its state updates without applying them.
 
-    async def execute(
+        Updates are merged by the caller, so nodes running concurrently in the same
+        wave all read the state as it was when the wave started.
+        """
+        speculations = context.speculations
+        if speculations and name in speculations:
+            updates = await self._commit_speculation(context, speculations.pop(name))
+            if updates is not None:
+                return updates
+
+        if context.wants("node_start"):
+            context.emit(FlowEvent("node_start", node=name))  # type: ignore
+
+        if name == START:
+            return []
+
+        node = plan.nodes[name]
+        updates: List[Dict[str, Any]] = []
+
+        hooks = self._hooks
+        if hooks is not None and context.speculation is not None:
+            # Held back until the edge picks the run, discarded branches are not counted
+            hooks = context.speculation
+        if hooks is not None:
+            hooks.node_start(context, name)
+            started = time.perf_counter()
+
+        try:
+            state = context.state
+            view = state.view()
+
+            cache_key = None
+            if node.cache is not None:
+                cache_key = node.cache.make_key(
+                    name, {key: view[key] for key in node.inject if key in view}
+                )
+                cached = await node.cache.get(cache_key)
+                if cached is not NodeCache.MISS:
+                    if hooks is not None:
+                        hooks.node_end(
+                            context, name, time.perf_counter() - started, cached
+                        )
+                    return cached
+
+            # Only the injected values are copied, never the whole state. Process
+            # and remote nodes receive pickled copies anyway
+            get = (
+                view.get
+                if node.readonly
+                or node.executor in (NodeExecutor.PROCESS, NodeExecutor.REMOTE)
+                else state.get
+            )
+            func_inputs = {
+                input_name: get(input_name)
+                for input_name in node.inject
+                if input_name in view
+            }
+            if node.wants_state:
+                func_inputs["state"] = view if node.readonly else state
+
+            if node.func or node.subflow is not None or node.mapper is not None:
+                call = (
+                    self._call_node
+                    if node.timeout is None
+                    else self._call_node_with_timeout
+                )
+                if node.retry is None and node.circuit_breaker is None:
+                    waited = await self._call_node_attempt(
+                        call, context, node, func_inputs, updates
+                    )
+                else:
+                    waited = await self._call_node_with_retry(
+                        call, context, node, func_inputs, updates
+                    )
+                if hooks is not None:
+                    # Node latency leaves out the time spent in the queue
+                    started += waited
+
+            if cache_key is not None:
+                await node.cache.set(cache_key, updates)
+
+        except (AIGooLimitException, AIGooCircuitOpenException) as e:
+            # Typed, so callers can tell a limit or an open breaker from a node error
+            if hooks is not None:
+                hooks.error(context, name, e)
+            if context.wants("error"):
+                context.emit(FlowEvent("error", node=name, error=str(e)))  # type: ignore
+            raise
+        except Exception as e:
+            if hooks is not None:
+                hooks.error(context, name, e)
+            error_msg = f"Error executing node {name}: {str(e)}"
+            if context.wants("error"):
+                context.emit(FlowEvent("error", node=name, error=error_msg))  # type: ignore
+            raise AIGooException(error_msg)
+
+        if hooks is not None:
+            hooks.node_end(context, name, time.perf_counter() - started, updates)
+        return updates
+
+    async def run_node(
         self,
-        additional_state: Dict[str, Any],
-        thread_id: Optional[str] = None,
-    ) -> Dict[str, Any]:
+        node: Union[str, Node],
+        inputs: Dict[str, Any],
+        run_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """
-        Execute the workflow in standard (non-streaming) mode.
+        Call a single node with `inputs`, outside of a workflow run.
+
+        Used by `FlowWorker` to serve remote nodes. Hooks, cache, retries and the
+        circuit breaker are left to the caller.
 
         Args:
-            additional_state: Initial state to add to the workflow
-            thread_id: Optional thread ID for memory management
+            node (Union[str, Node]): Name of the node, or a node, e.g. a copy set to another executor.
+            inputs (Dict[str, Any]): Keyword arguments of the node function.
+            run_id (Optional[str], optional): ID of the run context. Defaults to a new one.
 
         Returns:
-            The final workflow state
+            List[Dict[str, Any]]: The state updates of the node.
         """
+        if isinstance(node, str):
+            node = self.nodes[node]
+        context = RunContext(state=WorkflowState({}))
+        if run_id:
+            context.run_id = run_id
+        updates: List[Dict[str, Any]] = []
+        await self._call_node(context, node, inputs, updates)
+        return updates
+
+    async def _call_node(
+        self,
+        context: RunContext,
+        node: Node,
+        func_inputs: Dict[str, Any],
+        updates: List[Dict[str, Any]],
+    ) -> None:
+        """Call the node function and collect its state updates."""
+        if node.mapper is not None:
+            updates.append(await self._call_map(context, node, func_inputs))
+            return
+        if node.subflow is not None:
+            updates.append(await self._call_subflow(context, node, func_inputs))
+            return
+        if node.executor is NodeExecutor.REMOTE:
+            updates.extend(await self._run_remote(context, node, func_inputs))
+            return
+
+        offload = node.executor is NodeExecutor.THREAD
+        if offload:
+            result = await self._run_in_thread(node.func, **func_inputs)  # type: ignore
+        elif node.executor is NodeExecutor.PROCESS:
+            result = await self._run_in_process(node.func, func_inputs)  # type: ignore
+        else:
+            result = node.func(**func_inputs)  # type: ignore
+            if node.is_async:
+                result = await result
+
+        if node.stream:
+            # Handle streaming node
+            if node.is_async_gen or hasattr(result, "__aiter__"):
+                async for chunk in result:
+                    await self._handle_chunk(context, node.name, chunk, updates)
+            elif offload:
+                # A blocking iterator (e.g. a sync model stream) is advanced in the pool
+                iterator = iter(result)
+                lock = threading.Lock()
+
+                def advance():
+                    with lock:
+                        return next(iterator, _EXHAUSTED)
+
+                chunk = None
+                try:
+                    while (chunk := await self._run_in_thread(advance)) is not _EXHAUSTED:
+                        await self._handle_chunk(context, node.name, chunk, updates)
+                finally:
+                    close = getattr(iterator, "close", None)
+                    if chunk is not _EXHAUSTED and close is not None:
+                        # Stopped early, e.g. cancelled. The lock makes the close wait
+                        # for a `next` still running in the pool
+                        def close_iterator():
+                            with lock:
+                                close()
+
+                        self._get_thread_pool().submit(close_iterator)
+            else:
+                for chunk in result:
+                    await self._handle_chunk(context, node.name, chunk, updates)
+        elif isinstance(result, dict):
+            # Handle non-streaming node
+            updates.append(result)
+        elif node.output_key is not None:
+            updates.append({node.output_key: result})
+
+    async def _call_node_attempt(
+        self,
+        call: Callable,
+        context: RunContext,
+        node: Node,
+        func_inputs: Dict[str, Any],
+        updates: List[Dict[str, Any]],
+    ) -> float:
+        """Call the node once, through the scheduler when there is one, return the seconds queued."""
+        # A subflow or map only waits for its own calls, holding a slot meanwhile could deadlock
+        if self.scheduler is None or node.subflow is not None or node.mapper is not None:
+            await call(context, node, func_inputs, updates)
+            return 0.0
+        return await self._call_node_scheduled(call, context, node, func_inputs, updates)
+
+    async def _call_node_with_retry(
+        self,
+        call: Callable,
+        context: RunContext,
+        node: Node,
+        func_inputs: Dict[str, Any],
+        updates: List[Dict[str, Any]],
+    ) -> float:
+        """
+        Call the node under its circuit breaker, again after failures its retry policy allows.
+
+        Updates of a failed attempt are dropped. No attempt is made that could not
+        start before the run deadline, the last error is raised instead.
+        """
+        policy: Optional[RetryPolicy] = node.retry
+        breaker: Optional[CircuitBreaker] = node.circuit_breaker
+        metrics = self.metrics
+        mark = len(updates)
+        waited = 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            if breaker is not None:
+                try:
+                    breaker.allow()
+                except AIGooCircuitOpenException:
+                    if metrics is not None:
+                        metrics.observe_breaker_rejection(breaker.name)
+                    raise
+
+            streamed = [0]
+            token = _STREAMED.set(streamed)
+            try:
+                waited += await self._call_node_attempt(
+                    call, context, node, func_inputs, updates
+                )
+            except Exception as e:
+                if breaker is not None:
+                    breaker.record_failure(e)
+                    if metrics is not None:
+                        metrics.observe_breaker_state(breaker.name, breaker.state.value)
+                if (
+                    policy is None
+                    or attempt >= policy.max_attempts
+                    or streamed[0]
+                    or not policy.is_retryable(e)
+                ):
+                    raise
+                delay = policy.delay(attempt, e)
+                remaining = remaining_time()
+                if remaining is not None and delay >= remaining:
+                    raise
+
+                del updates[mark:]
+                if metrics is not None:
+                    metrics.observe_retry(node.name)
+                if context.wants("retry"):
+                    context.emit(  # type: ignore
+                        FlowEvent(
+                            "retry", node=node.name, error=str(e), attempt=attempt, delay=delay
+                        )
+                    )
+                await asyncio.sleep(delay)
+            except BaseException:
+                # Cancelled, the attempt says nothing about the resource
+                if breaker is not None:
+                    breaker.release()
+                raise
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+                    if metrics is not None:
+                        metrics.observe_breaker_state(breaker.name, breaker.state.value)
+                return waited
+            finally:
+                _STREAMED.reset(token)
+
+    async def _call_node_scheduled(
+        self,
+        call: Callable,
+        context: RunContext,
+        node: Node,
+        func_inputs: Dict[str, Any],
+        updates: List[Dict[str, Any]],
+    ) -> float:
+        """Call the node once the scheduler grants it a slot, return the seconds waited."""
+        async with self.scheduler.slot(  # type: ignore
+            node.name, context.priority, context.tenant
+        ) as waited:
+            if self.metrics is not None:
+                self.metrics.observe_queue_wait(context.priority.value, waited)
+            await call(context, node, func_inputs, updates)
+        return waited
+
+    async def _call_subflow(
+        self, context: RunContext, node: Node, func_inputs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run an embedded workflow on the mapped inputs and return its mapped outputs."""
+        subflow: AIGooFlow = node.subflow  # type: ignore
+        initial_state = dict(subflow.initial_state)
+        for key, value in func_inputs.items():
+            initial_state[node.input_map[key]] = value
+
+        view = await self._run_subflow(context, node.name, subflow, initial_state)
+        return {
+            parent_key: view[sub_key]
+            for sub_key, parent_key in node.output_map.items()
+            if sub_key in view
+        }
+
+    async def _run_subflow(
+        self,
+        context: RunContext,
+        label: str,
+        subflow: "AIGooFlow",
+        initial_state: Dict[str, Any],
+    ) -> StateView:
+        """Run `subflow` inside the run of `context`, its events prefixed with `label`."""
+        emit: Optional[Callable[[FlowEvent], None]] = None
+        if context.emit is not None:
+            parent_emit = context.emit
+
+            def emit_prefixed(event: FlowEvent) -> None:
+                event.node = f"{label}/{event.node}"
+                parent_emit(event)
+
+            emit = emit_prefixed
+
+        sub_context = RunContext(
+            state=WorkflowState(initial_state, history_limit=0),
+            run_id=f"{context.run_id}/{label}",
+            max_steps=subflow.max_steps,
+            deadline=context.deadline,
+            emit=emit,
+            # Subflow results are reported once, as the result of this node
+            event_types=_SUBFLOW_EVENTS
+            if context.event_types is None
+            else context.event_types & _SUBFLOW_EVENTS,
+            trace=context.trace,
+            stream_callback=context.stream_callback,
+            cancel_token=context.cancel_token,
+            priority=context.priority,
+            tenant=context.tenant,
+        )
+        await subflow._run(subflow.compile(), sub_context)
+        return sub_context.state.view()
+
+    async def _call_map(
+        self, context: RunContext, node: Node, func_inputs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run the worker of a map node on every item and return the reduced results."""
+        spec: MapSpec = node.mapper  # type: ignore
+        if spec.items is not None:
+            # A key not in the state yet maps nothing, like an empty list
+            source = func_inputs.get(spec.items) or []
+        elif node.is_async_gen:
+            source = node.func(**func_inputs)  # type: ignore
+        elif node.is_async:
+            source = await node.func(**func_inputs)  # type: ignore
+        elif self.offload_sync:
+            source = await self._run_in_thread(node.func, **func_inputs)  # type: ignore
+        else:
+            source = node.func(**func_inputs)  # type: ignore
+
+        if hasattr(source, "__aiter__"):
+            iterator = source.__aiter__()
+            next_item = iterator.__anext__
+        else:
+            sync_iterator = iter(source)
+            if inspect.isgenerator(sync_iterator) and self.offload_sync:
+                # A producing generator may block, advance it in the pool
+                async def next_item():
+                    item = await self._run_in_thread(next, sync_iterator, _EXHAUSTED)
+                    if item is _EXHAUSTED:
+                        raise StopAsyncIteration
+                    return item
+            else:
+                async def next_item():
+                    item = next(sync_iterator, _EXHAUSTED)
+                    if item is _EXHAUSTED:
+                        raise StopAsyncIteration
+                    return item
+
+        results: Dict[int, Any] = {}
+        errors: List[Dict[str, Any]] = []
+        # Workers take turns on the source, which is only advanced when one is free
+        pull = asyncio.Lock()
+        indexes = iter(range(sys.maxsize))
+
+        async def work():
+            while True:
+                async with pull:
+                    try:
+                        item = await next_item()
+                    except StopAsyncIteration:
+                        return
+                    index = next(indexes)
+                try:
+                    results[index] = await self._call_map_item(context, node, index, item)
+                except AIGooLimitException:
+                    # Deadline, budget or cancellation of the whole run, not of the item
+                    raise
+                except Exception as e:
+                    if spec.on_error is MapErrorMode.RAISE:
+                        raise AIGooException(f"Item {index} failed: {e}") from e
+                    errors.append(map_error(index, item, e))
+                    if spec.max_failures is not None and len(errors) > spec.max_failures:
+                        raise AIGooException(
+                            f"{len(errors)} items failed, more than the {spec.max_failures} allowed"
+                        ) from e
+
         try:
-            # validate thread_id
-            if self.memory and not thread_id:
+            async with asyncio.TaskGroup() as group:
+                for _ in range(spec.concurrency):
+                    group.create_task(work())
+        except BaseExceptionGroup as e:
+            # Surface the first failure, the other items are cancelled by the group
+            raise e.exceptions[0]
+
+        ordered = [results[index] for index in sorted(results)]
+        update = {spec.output_key: spec.reducer(ordered) if spec.reducer else ordered}
+        if spec.errors_key is not None:
+            errors.sort(key=lambda error: error["index"])
+            update[spec.errors_key] = errors
+        return update
+
+    async def _call_map_item(
+        self, context: RunContext, node: Node, index: int, item: Any
+    ) -> Any:
+        """Run the worker of a map node on one item, under the item timeout."""
+        spec: MapSpec = node.mapper  # type: ignore
+        label = f"{node.name}[{index}]"
+        if spec.item_timeout is None:
+            return await self._call_map_worker(context, node.name, spec, label, item)
+
+        timeout_scope = asyncio.timeout(spec.item_timeout)
+        try:
+            with deadline_scope(spec.item_timeout):
+                async with timeout_scope:
+                    return await self._call_map_worker(context, node.name, spec, label, item)
+        except TimeoutError:
+            if timeout_scope.expired():
+                # Only this item failed, the run itself still has time
                 raise AIGooException(
-                    "`thread_id` required because workflow has memory."
+                    f"{label} timed out after {spec.item_timeout}s"
+                ) from None
+            raise
+
+    async def _call_map_worker(
+        self, context: RunContext, name: str, spec: MapSpec, label: str, item: Any
+    ) -> Any:
+        if spec.is_subflow:
+            worker: AIGooFlow = spec.worker
+            initial_state = dict(worker.initial_state)
+            initial_state[spec.item_key] = item
+            view = await self._run_subflow(context, label, worker, initial_state)
+            if spec.result_key is None:
+                return dict(view)
+            return view.get(spec.result_key)
+
+        if self.scheduler is not None:
+            # Items go through the scheduler under the name of the map node
+            async with self.scheduler.slot(name, context.priority, context.tenant) as waited:
+                if self.metrics is not None:
+                    self.metrics.observe_queue_wait(context.priority.value, waited)
+                return await self._call_map_function(spec, item)
+        return await self._call_map_function(spec, item)
+
+    async def _call_map_function(self, spec: MapSpec, item: Any) -> Any:
+        inputs = {spec.item_param: item}
+        if spec.executor is NodeExecutor.THREAD:
+            return await self._run_in_thread(spec.worker, **inputs)
+        if spec.executor is NodeExecutor.PROCESS:
+            return await self._run_in_process(spec.worker, inputs)
+        result = spec.worker(**inputs)
+        if spec.worker_is_async:
+            result = await result
+        return result
+
+    async def _call_node_with_timeout(
+        self,
+        context: RunContext,
+        node: Node,
+        func_inputs: Dict[str, Any],
+        updates: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Call the node under its timeout.
+
+        Only awaiting code can be interrupted, a sync node that blocks the event loop
+        is stopped at its next await.
+        """
+        timeout_scope = asyncio.timeout(node.timeout)
+        try:
+            # Model calls inside the node see the shorter of the node and run budgets
+            with deadline_scope(node.timeout):
+                async with timeout_scope:
+                    await self._call_node(context, node, func_inputs, updates)
+        except TimeoutError:
+            if timeout_scope.expired():
+                raise AIGooLimitException(
+                    f"Node {node.name} timed out after {node.timeout}s",
+                    reason="node_timeout",
+                ) from None
+            raise
+
+    async def _handle_chunk(
+        self,
+        context: RunContext,
+        name: str,
+        chunk: Any,
+        updates: List[Dict[str, Any]],
+    ) -> None:
+        """Collect a dict chunk as a state update, forward any other chunk."""
+        if isinstance(chunk, dict):
+            updates.append(chunk)
+            return
+
+        streamed = _STREAMED.get()
+        if streamed is not None:
+            streamed[0] += 1
+
+        # For raw non-dict chunks (like string tokens)
+        if context.wants("stream_chunk"):
+            context.emit(FlowEvent("stream_chunk", node=name, content=chunk))  # type: ignore
+        if context.stream_callback:
+            await context.stream_callback(chunk)
+
+    async def _complete_node(
+        self,
+        plan: ExecutionPlan,
+        context: RunContext,
+        name: str,
+        updates: List[Dict[str, Any]],
+    ) -> List[str]:
+        """Apply the updates of a finished node and resolve its next nodes."""
+        emit = context.emit
+        report_results = context.wants("node_result")
+        for update in updates:
+            changes = context.update_state(update)
+            if not report_results:
+                continue
+            if context.deltas:
+                # Clients that track the state only need what changed
+                if changes:
+                    emit(FlowEvent("node_result", node=name, delta=changes))  # type: ignore
+            else:
+                emit(FlowEvent("node_result", node=name, result=update, state=None))  # type: ignore
+
+        if name != START:
+            context.step += 1
+        if context.wants("node_complete"):
+            emit(FlowEvent("node_complete", node=name))  # type: ignore
+
+        # Get next nodes
+        next_nodes = []
+        hooks = self._hooks
+        for edge in plan.outgoing.get(name, ()):
+            if edge.condition is None:
+                next_nodes.extend(edge.targets)
+                if hooks is not None:
+                    for target in edge.targets:
+                        hooks.edge(context, name, target)
+            else:
+                if edge.executor is NodeExecutor.THREAD:
+                    target = await self._run_in_thread(
+                        edge.condition, context.state.view()
+                    )
+                else:
+                    target = edge.condition(context.state.view())
+                if edge.speculative:
+                    self.branch_predictor.record(name, target or END)
+                    if context.speculations:
+                        self._discard_speculations(context, edge.targets, target)
+                if target and target != END:
+                    next_nodes.append(target)
+                if hooks is not None and target:
+                    hooks.edge(context, name, target)
+
+        if plan.joins:
+            next_nodes = self._arrive(plan, context, name, next_nodes)
+        if context.wants("next_nodes"):
+            emit(FlowEvent("next_nodes", nodes=next_nodes))  # type: ignore
+        return next_nodes
+
+    def _arrive(
+        self, plan: ExecutionPlan, context: RunContext, source: str, targets: List[str]
+    ) -> List[str]:
+        """
+        Keep the targets of `source` that run now.
+
+        A join node only runs once enough of its predecessors arrived, the others
+        of the round are dropped. A round ends when every predecessor arrived, one
+        arrives a second time or the loop around the node starts over.
+        """
+        ready = []
+        for target in targets:
+            reset = plan.join_resets.get((source, target))
+            if reset:
+                for name in reset:
+                    context.joins.pop(name, None)
+
+            join = plan.joins.get(target)
+            if join is None or source not in join[1]:
+                ready.append(target)
+                continue
+            required, sources = join
+            arrived = context.joins.get(target)
+            if arrived is None or source in arrived:
+                arrived = context.joins[target] = set()
+            arrived.add(source)
+            if len(arrived) == required:
+                ready.append(target)
+            if len(arrived) == len(sources):
+                del context.joins[target]
+        return ready
+
+    def _speculate(self, plan: ExecutionPlan, context: RunContext, source: str) -> None:
+        """Start the predicted targets of the speculative edges leaving `source`."""
+        if context.speculations is None:
+            context.speculations = {}
+        speculations = context.speculations
+        view = None
+        for edge in plan.speculative_edges[source]:
+            for target in self.branch_predictor.predict(source, edge.targets):
+                # A join node may still have to wait for other branches, and a node
+                # reading the whole state is stale after any update of `source`
+                if (
+                    target in (END, source)
+                    or target in speculations
+                    or target in plan.joins
+                    or plan.nodes[target].wants_state
+                ):
+                    continue
+                if view is None:
+                    view = context.state.view()
+                speculations[target] = self._start_speculation(
+                    plan, context, plan.nodes[target], view
                 )
 
-            if additional_state:
-                self._handle_state_update(additional_state, thread_id)
-                # if self.memory and thread_id:
-                #     # using memory
-                #     self.state._update(
-                #         self.memory.update_memory(thread_id, additional_state)
-                #     )
-                # else:
-                #     self.state._update(additional_state)
-
-            # Validate workflow before execution
-            self.validate_workflow()
+    def _start_speculation(
+        self, plan: ExecutionPlan, context: RunContext, node: Node, view: StateView
+    ) -> SpeculativeRun:
+        run = SpeculativeRun(node, view)
+        # Own state, so nothing the node does reaches the run before it is picked
+        speculative_context = RunContext(
+            state=WorkflowState(view, history_limit=0),
+            thread_id=context.thread_id,
+            run_id=context.run_id,
+            deadline=context.deadline,
+            emit=run.emit if context.emit is not None else None,
+            event_types=context.event_types,
+            deltas=context.deltas,
+            trace=context.trace,
+            stream_callback=run.stream_callback if context.stream_callback else None,
+            cancel_token=context.cancel_token,
+            priority=context.priority,
+            tenant=context.tenant,
+            speculation=run,
+        )
+        run_node = self._run_node if context.trace is None else self._run_node_traced
+        run.start(run_node(plan, speculative_context, node.name))
+        return run
+
+    async def _commit_speculation(
+        self, context: RunContext, run: SpeculativeRun
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Get the updates of a speculative run, None when its inputs changed and the node must run again."""
+        metrics = self.metrics
+        if not run.matches(context.state.view()):
+            run.cancel()
+            if metrics is not None:
+                metrics.observe_speculation(run.node.name, "stale")
+            return None
 
-            nodes_to_process = [START]
-            # processed_nodes = set()
+        try:
+            updates = await run.commit(context.emit, context.stream_callback)
+        except Exception:
+            # The node failed like it would have without speculation
+            if self._hooks is not None:
+                run.replay_hooks(self._hooks, context)
+            if metrics is not None:
+                metrics.observe_speculation(run.node.name, "failed")
+            raise
+        if self._hooks is not None:
+            run.replay_hooks(self._hooks, context)
+        if metrics is not None:
+            metrics.observe_speculation(run.node.name, "hit")
+        return updates
+
+    def _discard_speculations(
+        self, context: RunContext, targets: List[str], chosen: Optional[str]
+    ) -> None:
+        """Cancel the speculative runs of the targets an edge did not pick."""
+        for target in targets:
+            if target == chosen:
+                continue
+            run = context.speculations.pop(target, None)  # type: ignore
+            if run is not None:
+                run.cancel()
+                if self.metrics is not None:
+                    self.metrics.observe_speculation(target, "wrong_branch")
+
+    def _resolve_executor(
+        self,
+        executor: Union[NodeExecutor, str, None],
+        is_async: bool,
+        owner: str,
+    ) -> NodeExecutor:
+        """Pick where a function runs, async functions always run on the event loop."""
+        if executor is None:
+            if is_async or not self.offload_sync:
+                return NodeExecutor.INLINE
+            return NodeExecutor.THREAD
+
+        executor = NodeExecutor(executor)
+        if is_async and executor in (NodeExecutor.THREAD, NodeExecutor.PROCESS):
+            raise ValueError(
+                f"{owner} is async, it can only use the `inline` or `remote` executor"
+            )
+        return executor
+
+    def _validate_join(self, name: str, join: Union[str, int, None]) -> None:
+        if join is None or join == "all":
+            return
+        if isinstance(join, bool) or not isinstance(join, int) or join < 1:
+            raise ValueError(
+                f"`join` of node '{name}' must be \"all\" or a positive number of predecessors"
+            )
+
+    def _validate_process_node(
+        self, name: str, func: Callable, sig: inspect.Signature, stream: bool
+    ) -> None:
+        if "state" in sig.parameters:
+            raise ValueError(
+                f"Process node '{name}' can not take `state`, it does not live in the worker"
+            )
+        if stream:
+            raise ValueError(f"Process node '{name}' can not stream")
+        try:
+            pickle.dumps(func)
+        except Exception as e:
+            raise ValueError(
+                f"Process node '{name}' must be a picklable module-level function: {e}"
+            )
 
+    def _validate_remote_node(
+        self, name: str, sig: inspect.Signature, stream: bool
+    ) -> None:
+        if not self.name:
+            raise ValueError(
+                f"Remote node '{name}' needs the workflow `name` it is registered under on the workers"
+            )
+        if "state" in sig.parameters:
+            raise ValueError(
+                f"Remote node '{name}' can not take `state`, it does not live on the worker"
+            )
+        if stream:
+            raise ValueError(f"Remote node '{name}' can not stream")
+
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self._thread_pool_size,
+                thread_name_prefix="aigooflow",
+            )
+        return self._thread_pool
+
+    async def _run_in_thread(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a sync callable in the thread pool, keeping the caller's context variables."""
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._get_thread_pool(),
+            functools.partial(context.run, func, *args, **kwargs),
+        )
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            # Forking a process that runs an event loop and threads is unsafe
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self._process_pool_size,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._process_pool
+
+    async def _run_in_process(self, func: Callable, func_inputs: Dict[str, Any]) -> Any:
+        """Run a node function in the process pool, moving large buffers through shared memory."""
+        blocks: List[Any] = []
+        try:
+            inputs = share(func_inputs, self.shared_memory_min_size, blocks)
+            future = self._get_process_pool().submit(
+                call_in_process, func, inputs, self.shared_memory_min_size
+            )
+            try:
+                shared = await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                # The worker keeps going, free its output once it is done
+                future.add_done_callback(
+                    lambda done: None
+                    if done.cancelled() or done.exception()
+                    else discard(done.result())
+                )
+                raise
+        finally:
+            release(blocks, unlink=True)
+
+        try:
+            return restore(shared, blocks)
+        finally:
+            release(blocks, unlink=True)
+
+    async def _run_remote(
+        self, context: RunContext, node: Node, func_inputs: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Run a node on a flow worker, sending only its inputs and receiving only its updates."""
+        if self.task_queue is None:
+            raise AIGooException(f"Remote node '{node.name}' needs a workflow `task_queue`")
+        if self._dispatcher is None:
+            self._dispatcher = TaskDispatcher(self.task_queue)
+
+        result = await self._dispatcher.submit(
+            FlowTask(
+                flow=self.name,  # type: ignore
+                kind=TaskKind.NODE,
+                payload=encode(func_inputs),
+                reply_to=self._dispatcher.client_id,
+                node=node.name,
+            )
+        )
+        if not result.ok:
+            raise AIGooException(result.error)
+        return decode(result.payload)  # type: ignore
+
+    def close(self) -> None:
+        """Shut down the thread and process pools the workflow created."""
+        if self._owns_thread_pool and self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False)
+            self._thread_pool = None
+        if self._owns_process_pool and self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+    def _save_checkpoint(
+        self, context: RunContext, queue: List[str], completed: bool = False
+    ) -> None:
+        if self.checkpointer:
+            self.checkpointer.put(
+                Checkpoint(
+                    run_id=context.run_id,
+                    state=dict(context.state.view()),
+                    queue=queue,
+                    step=context.step,
+                    thread_id=context.thread_id,
+                    completed=completed,
+                    joins={
+                        name: sorted(arrived) for name, arrived in context.joins.items()
+                    }
+                    or None,
+                )
+            )
+
+    def _check_step_budget(self, context: RunContext, steps: int) -> None:
+        """Stop the run before it executes more nodes than `max_steps` allows."""
+        if context.max_steps is not None and context.step + steps > context.max_steps:
+            raise AIGooLimitException(
+                f"Workflow exceeded its budget of {context.max_steps} steps",
+                reason="max_steps",
+            )
+
+    async def _run(
+        self,
+        plan: ExecutionPlan,
+        context: RunContext,
+        queue: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Process the workflow wave by wave, starting from `queue` (START by default).
+
+        A wave is every node queued by the previous wave. With `max_concurrency`
+        of 1 the wave runs in queue order, one node after another. Otherwise its
+        nodes run at the same time and their results are merged in queue order, so
+        the final state does not depend on which node finished first.
+        """
+        semaphore = (
+            asyncio.Semaphore(self.max_concurrency)
+            if self.max_concurrency is not None and self.max_concurrency > 1
+            else None
+        )
+
+        run_node = self._run_node if context.trace is None else self._run_node_traced
+
+        async def run_limited(name: str) -> List[Dict[str, Any]]:
+            if semaphore is None:
+                return await run_node(plan, context, name)
+            async with semaphore:
+                return await run_node(plan, context, name)
+
+        emit = context.emit
+        report_end = context.wants("node_complete")
+        checkpointer = self.checkpointer
+
+        nodes_to_process = deque([START] if queue is None else queue)
+
+        metrics = self.metrics
+        speculative_sources = plan.speculative_edges
+        try:
             while nodes_to_process:
-                current_node = nodes_to_process.pop(0)
-                if current_node == END:
+                wave = list(nodes_to_process)
+                nodes_to_process.clear()
+                if metrics is not None:
+                    metrics.observe_queue_depth(len(wave))
+
+                if self.max_concurrency == 1 or len(wave) < 2:
+                    for position, name in enumerate(wave):
+                        if name == END:
+                            if report_end:
+                                emit(FlowEvent("node_complete", node=END))  # type: ignore
+                            continue
+                        if name != START:
+                            self._check_step_budget(context, 1)
+                        if name in speculative_sources:
+                            self._speculate(plan, context, name)
+                        updates = await run_node(plan, context, name)
+                        nodes_to_process.extend(
+                            await self._complete_node(plan, context, name, updates)
+                        )
+                        if checkpointer:
+                            self._save_checkpoint(
+                                context, wave[position + 1 :] + list(nodes_to_process)
+                            )
                     continue
 
-                if current_node != START:
-                    node = self.nodes[current_node]
+                self._check_step_budget(
+                    context, sum(1 for name in wave if name not in (START, END))
+                )
+                for name in wave:
+                    if name in speculative_sources:
+                        self._speculate(plan, context, name)
+                try:
+                    async with asyncio.TaskGroup() as group:
+                        tasks = {
+                            position: group.create_task(run_limited(name))
+                            for position, name in enumerate(wave)
+                            if name != END
+                        }
+                except BaseExceptionGroup as e:
+                    # Surface the first failure, siblings are cancelled by the group
+                    raise e.exceptions[0]
+
+                for position, name in enumerate(wave):
+                    if name == END:
+                        if report_end:
+                            emit(FlowEvent("node_complete", node=END))  # type: ignore
+                        continue
+                    updates = tasks[position].result()
+                    nodes_to_process.extend(
+                        await self._complete_node(plan, context, name, updates)
+                    )
+
+                if checkpointer:
+                    self._save_checkpoint(context, list(nodes_to_process))
+
+            waiting = {
+                name: arrived
+                for name, arrived in context.joins.items()
+                if len(arrived) < plan.joins[name][0]
+            }
+            if waiting:
+                # Nothing is left to run, these joins would be skipped without a trace
+                raise AIGooException(
+                    "Run ended with join nodes still waiting: "
+                    + ", ".join(
+                        f"'{name}' ({len(arrived)} of {plan.joins[name][0]} predecessors arrived)"
+                        for name, arrived in waiting.items()
+                    )
+                )
+        finally:
+            if context.speculations:
+                # Nobody will pick these anymore
+                for run in context.speculations.values():
+                    run.cancel()
+                context.speculations.clear()
+
+    async def _run_node_traced(
+        self,
+        plan: ExecutionPlan,
+        context: RunContext,
+        name: str,
+    ) -> List[Dict[str, Any]]:
+        """`_run_node` recorded as a span on a track of its own while it runs."""
+        if name == START:
+            return await self._run_node(plan, context, name)
+        with context.trace.track():  # type: ignore
+            with trace_span(name, "node"):
+                return await self._run_node(plan, context, name)
+
+    async def _run_to_end(
+        self,
+        plan: ExecutionPlan,
+        context: RunContext,
+        queue: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Run the workflow under the run deadline.
 
+        With a checkpointer, a checkpoint is also saved at the start and once the run
+        has finished. A run stopped by a limit gets its partial state attached to the
+        raised `AIGooLimitException`.
+        """
+        if self.checkpointer:
+            self._save_checkpoint(context, [START] if queue is None else queue)
+
+        trace = context.trace
+        if trace is not None:
+            started = trace.now()
+
+        # `cancel` may come from any thread, the run is interrupted on its loop
+        task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        interrupt = {"running": True, "cancelled": False}
+
+        def cancel_task() -> None:
+            if interrupt["running"]:
+                interrupt["cancelled"] = True
+                task.cancel()  # type: ignore
+
+        token = context.cancel_token
+        unregister = token.add_callback(lambda: loop.call_soon_threadsafe(cancel_task))
+        self._runs[context.run_id] = context
+        completed = False
+        try:
+            # Model calls close their streams through the cancel scope
+            with cancel_scope(token):
+                if context.deadline is None:
+                    await self._run(plan, context, queue)
+                else:
+                    timeout = context.deadline - time.monotonic()
                     try:
-                        func_inputs = {
-                            input_name: self.state.get(input_name)
-                            for input_name in node.inputs
-                            if input_name != "state"
-                            and input_name in self.state.get_current()
-                        }
+                        # Model calls see the remaining budget through the deadline scope
+                        with deadline_scope(timeout):
+                            async with asyncio.timeout(timeout):
+                                await self._run(plan, context, queue)
+                    except TimeoutError:
+                        raise AIGooLimitException(
+                            "Workflow exceeded its timeout", reason="timeout"
+                        ) from None
+            completed = True
+        except asyncio.CancelledError:
+            if not interrupt["cancelled"]:
+                raise
+            task.uncancel()  # type: ignore
+            raise AIGooCancelledException(
+                f"Run {context.run_id} was cancelled", state=context.state.get_current()
+            ) from None
+        except AIGooLimitException as e:
+            if e.state is None:
+                e.state = context.state.get_current()
+            raise
+        finally:
+            interrupt["running"] = False
+            unregister()
+            if self._runs.get(context.run_id) is context:
+                del self._runs[context.run_id]
+            if trace is not None:
+                trace.add_span(
+                    "workflow", "workflow", started, trace.now(), 0, {"run_id": context.run_id}
+                )
+            if self.checkpointer:
+                if completed:
+                    self._save_checkpoint(context, [], completed=True)
+                # Also after a failure or cancellation, the run is resumed from these.
+                # Shielded, so a second cancellation does not drop the write
+                await asyncio.shield(self.checkpointer.flush())
 
-                        if node.func:
-                            result = await node.func(**func_inputs)
-                            # print(f"execute@AIGooFlow result: {result}")
-                            if isinstance(result, dict):
-                                self._handle_state_update(result, thread_id)
-                                # self.state._update(result)
-                            elif len(node.outputs) == 1:
-                                self._handle_state_update(
-                                    {node.outputs[0]: result}, thread_id
-                                )
-                                # self.state._update({node.outputs[0]: result})
-
-                    except Exception as e:
-                        raise AIGooException(
-                            f"Error executing node {current_node}: {str(e)}"
-                        )
+    async def execute(
+        self,
+        additional_state: Dict[str, Any],
+        thread_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        trace: Optional[TraceRecorder] = None,
+        priority: Union[Priority, str] = Priority.NORMAL,
+        tenant: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Execute the workflow in standard (non-streaming) mode.
 
-                # Get next nodes
-                next_nodes = []
-                for edge in self.edges:
-                    if edge.source == current_node:
-                        if edge.condition is None:
-                            next_nodes.extend(edge.targets)
-                        else:
-                            target = edge.condition()
-                            if target and target != END:
-                                next_nodes.append(target)
+        Args:
+            additional_state: Initial state to add to the workflow
+            thread_id: Optional thread ID for memory management
+            run_id: Optional run ID, used to `resume` the run from its checkpoint
+            timeout: Optional seconds the whole run may take
+            trace: Optional recorder collecting a timeline of the run, see `TraceRecorder.save`
+            priority: Priority class of the run's node calls with a `scheduler`
+            tenant: Optional key the `scheduler` shares slots fairly by, e.g. a customer ID
 
-                nodes_to_process.extend(next_nodes)
+        Raises:
+            AIGooLimitException: When the run hits its timeout, a node timeout or `max_steps`.
+                The partial state is available as `state` on the exception.
+            AIGooCancelledException: When the run is cancelled with `cancel`, with the partial
+                state like a limit.
+            AIGooCircuitOpenException: When a node's circuit breaker is open.
 
-            return self.state.get_current()
+        Returns:
+            The final workflow state
+        """
+        try:
+            return await self._execute(
+                additional_state, thread_id, run_id, timeout, trace, priority, tenant
+            )
+        except (AIGooLimitException, AIGooCircuitOpenException):
+            raise
         except Exception as e:
             raise AIGooException(e)
 
+    async def _execute(
+        self,
+        additional_state: Dict[str, Any],
+        thread_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        trace: Optional[TraceRecorder] = None,
+        priority: Union[Priority, str] = Priority.NORMAL,
+        tenant: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """`execute` without wrapping errors, so batches keep the error a node raised."""
+        context = self.create_run_context(
+            thread_id,
+            run_id=run_id,
+            timeout=timeout,
+            trace=trace,
+            priority=priority,
+            tenant=tenant,
+        )
+
+        if additional_state:
+            context.update_state(additional_state)
+
+        # Validated once, reused until the graph changes
+        plan = self.compile()
+        await self._run_to_end(plan, context)
+
+        return context.state.get_current()
+
     async def stream(
         self,
         additional_state: Dict[str, Any],
         thread_id: Optional[str] = None,
         stream_callback: Optional[Callable] = None,
-    ) -> AsyncGenerator[Dict[str, Any], None]:
+        run_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        mode: Union[StreamMode, str] = StreamMode.FULL,
+        events: Optional[Iterable[str]] = None,
+        trace: Optional[TraceRecorder] = None,
+        priority: Union[Priority, str] = Priority.NORMAL,
+        tenant: Optional[str] = None,
+    ) -> AsyncGenerator[FlowEvent, None]:
         """
         Execute the workflow in streaming mode, yielding results as they become available.
 
@@ -250,132 +1878,328 @@ class AIGooFlow:
             additional_state: Initial state to add to the workflow
             thread_id: Optional thread ID for memory management
             stream_callback: Optional callback function for handling streaming chunks (content only)
+            run_id: Optional run ID, used to `resume` the run from its checkpoint
+            timeout: Optional seconds the whole run may take
+            mode: `full` reports node results and the final state. `deltas` reports only the
+                keys each update changed (`delta`) and leaves the state out of `workflow_complete`
+                and `workflow_interrupted`, clients rebuild it from the deltas
+            events: Optional event types to yield, see `EVENT_TYPES`. Other events are never built
+            trace: Optional recorder collecting a timeline of the run, see `TraceRecorder.save`
+            priority: Priority class of the run's node calls with a `scheduler`
+            tenant: Optional key the `scheduler` shares slots fairly by, e.g. a customer ID
+
+        Raises:
+            AIGooLimitException: When the run hits a limit or is cancelled, after a
+                `workflow_interrupted` event carrying the partial state. Closing the
+                generator early cancels the run.
+            AIGooCircuitOpenException: When a node's circuit breaker is open, after a
+                `workflow_error` event.
 
         Returns:
-            An async generator yielding state and event updates
+            An async generator yielding `FlowEvent`s
         """
+        deltas = StreamMode(mode) is StreamMode.DELTAS
+        event_types = None
+        if events is not None:
+            event_types = frozenset(events)
+            unknown = event_types - EVENT_TYPES
+            if unknown:
+                raise ValueError(f"Unknown event types: {', '.join(sorted(unknown))}")
+
+        def wants(event_type: str) -> bool:
+            return event_types is None or event_type in event_types
+
         try:
-            # validate thread_id
-            if self.memory and not thread_id:
-                raise AIGooException(
-                    "`thread_id` required because workflow has memory."
-                )
+            # Nodes may run concurrently, so events are funneled through a queue
+            queue: asyncio.Queue = asyncio.Queue()
+            finished = object()
+            context = self.create_run_context(
+                thread_id,
+                run_id=run_id,
+                timeout=timeout,
+                emit=queue.put_nowait,
+                event_types=event_types,
+                deltas=deltas,
+                trace=trace,
+                stream_callback=stream_callback,
+                priority=priority,
+                tenant=tenant,
+            )
 
             if additional_state:
-                updated_state = self._handle_state_update(additional_state, thread_id)
-                yield {"type": "state_update", "state": updated_state}
-
-            # Validate workflow before execution
-            self.validate_workflow()
-            yield {"type": "workflow_start"}
+                changes = context.update_state(additional_state)
+                if wants("state_update"):
+                    yield (
+                        FlowEvent("state_update", delta=changes)
+                        if deltas
+                        else FlowEvent("state_update", state=None)
+                    )
+
+            # Validated once, reused until the graph changes
+            plan = self.compile()
+            if wants("workflow_start"):
+                yield FlowEvent("workflow_start")
+
+            async def run():
+                try:
+                    await self._run_to_end(plan, context)
+                finally:
+                    queue.put_nowait(finished)
+
+            task = asyncio.create_task(run())
+            try:
+                while (event := await queue.get()) is not finished:
+                    yield event
+                await task
+            finally:
+                if not task.done():
+                    # The consumer stopped reading, so stop the nodes and their model streams
+                    task.cancel()
+                    context.cancel_token.cancel()
+                    # Nobody awaits the run anymore
+                    task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+            if wants("workflow_complete"):
+                yield (
+                    FlowEvent("workflow_complete")
+                    if deltas
+                    else FlowEvent("workflow_complete", state=context.state.get_current())
+                )
+        except AIGooLimitException as e:
+            if wants("workflow_interrupted"):
+                event = FlowEvent("workflow_interrupted", reason=e.reason, error=str(e))
+                if not deltas:
+                    event.state = e.state
+                yield event
+            raise
+        except Exception as e:
+            if wants("workflow_error"):
+                yield FlowEvent("workflow_error", error=str(e))
+            if isinstance(e, AIGooCircuitOpenException):
+                raise
+            raise AIGooException(e)
 
-            nodes_to_process = [START]
+    async def execute_many(
+        self,
+        inputs: Iterable[Dict[str, Any]],
+        concurrency: int = 10,
+        thread_ids: Optional[Iterable[Optional[str]]] = None,
+        timeout: Optional[float] = None,
+        priority: Union[Priority, str] = Priority.NORMAL,
+        tenant: Optional[str] = None,
+    ) -> List[BatchItemResult]:
+        """
+        Execute the workflow once for every input, `concurrency` runs at a time.
 
-            while nodes_to_process:
-                current_node = nodes_to_process.pop(0)
+        All runs share the compiled graph. A failing run does not stop the batch,
+        its exception is kept on its `BatchItemResult`.
 
-                if current_node == END:
-                    yield {"type": "node_complete", "node": END}
-                    continue
+        Args:
+            inputs: Initial state of every run
+            concurrency: Maximum number of runs in flight
+            thread_ids: Optional thread ID of every run, required when the workflow has memory
+            timeout: Optional seconds each run may take
+            priority: Priority class of every run with a `scheduler`, e.g. `batch`
+            tenant: Optional key the `scheduler` shares slots fairly by
 
-                yield {"type": "node_start", "node": current_node}
+        Returns:
+            One `BatchItemResult` per input, in input order
+        """
+        results = [
+            result
+            async for result in self.execute_many_as_completed(
+                inputs, concurrency, thread_ids, timeout, priority, tenant
+            )
+        ]
+        results.sort(key=lambda result: result.index)
+        return results
+
+    async def execute_many_as_completed(
+        self,
+        inputs: Iterable[Dict[str, Any]],
+        concurrency: int = 10,
+        thread_ids: Optional[Iterable[Optional[str]]] = None,
+        timeout: Optional[float] = None,
+        priority: Union[Priority, str] = Priority.NORMAL,
+        tenant: Optional[str] = None,
+    ) -> AsyncIterator[BatchItemResult]:
+        """
+        Like `execute_many`, but yield every `BatchItemResult` as soon as its run finishes.
 
-                if current_node != START:
-                    node = self.nodes[current_node]
+        Inputs are pulled lazily, so `inputs` can be a generator over a large
+        batch. Closing the iterator early cancels the runs still in flight.
+        """
+        if concurrency < 1:
+            raise ValueError("`concurrency` must be at least 1")
 
-                    try:
-                        func_inputs = {
-                            input_name: self.state.get(input_name)
-                            for input_name in node.inputs
-                            if input_name != "state"
-                            and input_name in self.state.get_current()
-                        }
+        # Validate once here instead of failing every run
+        self.compile()
 
-                        if node.func:
-                            if node.stream:
-                                # Handle streaming node
-                                async for chunk in await node.func(**func_inputs):
-                                    if isinstance(chunk, dict):
-                                        # Update state
-                                        updated_state = self._handle_state_update(
-                                            chunk, thread_id
-                                        )
-                                        yield {
-                                            "type": "node_result",
-                                            "node": current_node,
-                                            "result": chunk,
-                                            "state": updated_state,
-                                        }
-
-                                    else:
-                                        # For raw non-dict chunks (like string tokens)
-                                        yield {
-                                            "type": "stream_chunk",
-                                            "node": current_node,
-                                            "content": chunk,
-                                        }
-
-                                        if stream_callback:
-                                            await stream_callback(chunk)
-                            else:
-                                # Handle non-streaming node
-                                result = await node.func(**func_inputs)
-                                if isinstance(result, dict):
-                                    updated_state = self._handle_state_update(
-                                        result, thread_id
-                                    )
-                                    yield {
-                                        "type": "node_result",
-                                        "node": current_node,
-                                        "result": result,
-                                        "state": updated_state,
-                                    }
-                                elif len(node.outputs) == 1:
-                                    result_dict = {node.outputs[0]: result}
-                                    updated_state = self._handle_state_update(
-                                        result_dict, thread_id
-                                    )
-                                    yield {
-                                        "type": "node_result",
-                                        "node": current_node,
-                                        "result": result_dict,
-                                        "state": updated_state,
-                                    }
-
-                    except Exception as e:
-                        error_msg = f"Error executing node {current_node}: {str(e)}"
-                        yield {
-                            "type": "error",
-                            "node": current_node,
-                            "error": error_msg,
-                        }
-                        raise AIGooException(error_msg)
+        items = enumerate(
+            zip(inputs, thread_ids)
+            if thread_ids is not None
+            else ((item, None) for item in inputs)
+        )
+        results: asyncio.Queue = asyncio.Queue()
 
-                yield {"type": "node_complete", "node": current_node}
+        async def run_item(index, item, thread_id) -> BatchItemResult:
+            try:
+                state = await self._execute(
+                    item, thread_id, timeout=timeout, priority=priority, tenant=tenant
+                )
+            except Exception as e:
+                return BatchItemResult(index=index, input=item, error=e)
+            return BatchItemResult(index=index, input=item, state=state)
+
+        async def worker():
+            try:
+                # Workers share the iterator, so inputs are only read as runs free up
+                for index, (item, thread_id) in items:
+                    results.put_nowait(await run_item(index, item, thread_id))
+            except Exception as e:
+                # Raised by `inputs` itself, not by a run
+                results.put_nowait(e)
+            finally:
+                results.put_nowait(_WORKER_DONE)
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        running = len(workers)
+        try:
+            while running:
+                result = await results.get()
+                if result is _WORKER_DONE:
+                    running -= 1
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def resume(
+        self, run_id: str, timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Continue a run from its last checkpoint.
 
-                # Get next nodes
-                next_nodes = []
-                for edge in self.edges:
-                    if edge.source == current_node:
-                        if edge.condition is None:
-                            next_nodes.extend(edge.targets)
-                        else:
-                            target = edge.condition()
-                            if target and target != END:
-                                next_nodes.append(target)
+        Nodes that finished before the checkpoint are not run again. A run that has
+        already completed returns its final state.
 
-                nodes_to_process.extend(next_nodes)
-                yield {"type": "next_nodes", "nodes": next_nodes}
+        Args:
+            run_id: ID of the run to continue
+            timeout: Optional seconds the rest of the run may take
 
-            yield {"type": "workflow_complete", "state": self.state.get_current()}
+        Returns:
+            The final workflow state
+        """
+        try:
+            if not self.checkpointer:
+                raise AIGooException("`resume` requires a workflow with a checkpointer.")
+
+            checkpoint = await self.checkpointer.get(run_id)
+            if checkpoint is None:
+                raise AIGooException(f"No checkpoint found for run '{run_id}'.")
+
+            context = self.create_run_context(
+                checkpoint.thread_id,
+                initial_state=checkpoint.state,
+                run_id=run_id,
+                timeout=timeout,
+                step=checkpoint.step,
+                joins={
+                    name: set(arrived)
+                    for name, arrived in (checkpoint.joins or {}).items()
+                },
+            )
+            if not checkpoint.completed:
+                plan = self.compile()
+                await self._run_to_end(plan, context, checkpoint.queue)
+
+            return context.state.get_current()
+        except (AIGooLimitException, AIGooCircuitOpenException):
+            raise
         except Exception as e:
-            yield {"type": "workflow_error", "error": str(e)}
             raise AIGooException(e)
 
+    def cancel(self, run_id: str) -> bool:
+        """
+        Cancel a run in progress. Safe to call from any thread.
+
+        Running nodes are cancelled at their next await, and model streams the run
+        is reading (`OpenAIModel.generate_stream`, `BedrockModel.generate_stream`) are
+        closed at once. Their usage so far is still recorded by the stream usage
+        trackers. The run raises `AIGooCancelledException`, `stream` yields a
+        `workflow_interrupted` event with reason `cancelled` first.
+
+        Args:
+            run_id: ID the run was started with, see `execute` and `stream`
+
+        Returns:
+            False when no run with that ID is in progress
+        """
+        context = self._runs.get(run_id)
+        if context is None:
+            return False
+        context.cancel_token.cancel()
+        return True
+
     def get_diagram_code(self) -> str:
         """Get code for the workflow diagram."""
         return self.visualizer.create_mermaid_diagram(self)
 
+    def get_profile_diagram_code(
+        self, metrics: Union[MetricsRegistry, Dict[str, Any], None] = None
+    ) -> str:
+        """
+        Get code for the workflow diagram with run statistics.
+
+        Nodes show p50/p95 latency, call count and error rate and are coloured by p95,
+        edges show how often they were taken.
+
+        Args:
+            metrics (Union[MetricsRegistry, Dict[str, Any], None], optional): Registry or its
+                `to_dict()` output. Defaults to the registry given to the constructor.
+        """
+        return self.visualizer.create_mermaid_profile_diagram(
+            self, self._profile_overlay(metrics)
+        )
+
+    def save_profile_diagram(
+        self, path: str, metrics: Union[MetricsRegistry, Dict[str, Any], None] = None
+    ) -> str:
+        """
+        Render the profile diagram offline and save it.
+
+        Args:
+            path (str): Output file, `.svg` writes the diagram only, anything else an
+                HTML page with the diagram and a node statistics table.
+            metrics (Union[MetricsRegistry, Dict[str, Any], None], optional): Registry or its
+                `to_dict()` output. Defaults to the registry given to the constructor.
+
+        Returns:
+            str: The path written.
+        """
+        overlay = self._profile_overlay(metrics)
+        if path.lower().endswith(".svg"):
+            content = self.visualizer.create_profile_svg(self, overlay)
+        else:
+            content = self.visualizer.create_profile_html(self, overlay)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def _profile_overlay(
+        self, metrics: Union[MetricsRegistry, Dict[str, Any], None]
+    ) -> ProfileOverlay:
+        metrics = metrics if metrics is not None else self.metrics
+        if metrics is None:
+            raise AIGooException(
+                "No metrics to profile, pass `metrics` here or to the constructor"
+            )
+        return ProfileOverlay.from_metrics(metrics)
+
     def get_diagram_base64(self):
         """Generate Mermaid diagram base64 for the workflow.
 
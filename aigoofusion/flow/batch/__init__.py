@@ -0,0 +1,3 @@
+from .batch_item_result import BatchItemResult
+
+__all__ = ["BatchItemResult"]
@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class BatchItemResult:
+    """
+    Outcome of one input of `AIGooFlow.execute_many`.
+
+    Attributes:
+        index: Position of the input in the batch.
+        input: The input state, as passed in.
+        state: Final state of the run, None when it failed.
+        error: Exception that stopped the run, as the failing node raised it, e.g. an
+            `AIGooException` or `AIGooLimitException`. None when it succeeded.
+    """
+
+    index: int
+    input: Dict[str, Any]
+    state: Optional[Dict[str, Any]] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the run finished without an error."""
+        return self.error is None
@@ -0,0 +1,4 @@
+from .cache_key import make_cache_key
+from .node_cache import NodeCache
+
+__all__ = ["NodeCache", "make_cache_key"]
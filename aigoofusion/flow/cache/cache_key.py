@@ -0,0 +1,42 @@
+import hashlib
+import pickle
+from typing import Any, Dict
+
+from pydantic import BaseModel
+
+
+def _normalize(value: Any) -> Any:
+    """Turn `value` into a structure whose pickle does not depend on ordering."""
+    if isinstance(value, (str, int, float, bool, bytes, type(None))):
+        return value
+    if isinstance(value, BaseModel):
+        return (type(value).__qualname__, _normalize(value.model_dump()))
+    if isinstance(value, dict):
+        return (
+            "dict",
+            tuple(
+                sorted(
+                    ((_normalize(key), _normalize(item)) for key, item in value.items()),
+                    key=repr,
+                )
+            ),
+        )
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_normalize(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", tuple(sorted((_normalize(item) for item in value), key=repr)))
+    try:
+        return ("pickle", pickle.dumps(value, protocol=4))
+    except Exception:
+        return ("repr", type(value).__qualname__, repr(value))
+
+
+def make_cache_key(node_name: str, inputs: Dict[str, Any]) -> str:
+    """
+    Stable hash of a node call.
+
+    The same node name and input values give the same key across runs and
+    processes, independent of dict and set ordering.
+    """
+    payload = pickle.dumps((node_name, _normalize(inputs)), protocol=4)
+    return hashlib.sha256(payload).hexdigest()
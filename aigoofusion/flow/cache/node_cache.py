@@ -0,0 +1,193 @@
+import asyncio
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from aigoofusion.flow.cache.cache_key import make_cache_key
+
+_DISK_TRIM_EVERY = 64
+
+
+class NodeCache:
+    """
+    Memoizing cache for pure workflow nodes.
+
+    Results are keyed on a stable hash of the node name and its input values.
+    Lookups go to an in-memory LRU first, then to an optional SQLite disk tier,
+    which survives restarts and can be shared between processes.
+
+    Every `get` returns a copy of the cached value, so callers may mutate what
+    they get without changing later hits. A miss returns `NodeCache.MISS`, any
+    other value, None included, is a hit.
+
+    Example:
+    ```python
+    cache = NodeCache(maxsize=512, ttl=3600, disk_path="node_cache.db")
+    workflow.add_node("classify", classify, cache=cache)
+    ...
+    print(cache.stats())
+    ```
+    """
+
+    # Returned by `get` on a miss
+    MISS: Any = object()
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        disk_path: Optional[str] = None,
+        disk_maxsize: Optional[int] = 100_000,
+    ):
+        """
+        Args:
+            maxsize (int, optional): Maximum entries kept in memory. Defaults to 1024.
+            ttl (Optional[float], optional): Seconds an entry stays valid, None never expires. Defaults to None.
+            disk_path (Optional[str], optional): SQLite file for the disk tier, None disables it. Defaults to None.
+            disk_maxsize (Optional[int], optional): Maximum entries kept on disk, least recently used
+                are removed first. Enforced every few writes. None for no limit. Defaults to 100_000.
+        """
+        if maxsize < 0:
+            raise ValueError("`maxsize` must be at least 0")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.disk_maxsize = disk_maxsize
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._memory: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._disk_lock = Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_writes = 0
+
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            with self._disk_lock, self._disk:
+                self._disk.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS node_cache (
+                        key TEXT PRIMARY KEY,
+                        value BLOB NOT NULL,
+                        expires_at REAL,
+                        accessed_at REAL NOT NULL
+                    )
+                    """
+                )
+                self._disk.execute(
+                    "CREATE INDEX IF NOT EXISTS node_cache_accessed_at ON node_cache (accessed_at)"
+                )
+
+    def make_key(self, node_name: str, inputs: Dict[str, Any]) -> str:
+        """Build the cache key of a node call."""
+        return make_cache_key(node_name, inputs)
+
+    async def get(self, key: str) -> Any:
+        """Get a copy of a cached value, `NodeCache.MISS` on a miss."""
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > now:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return deepcopy(value)
+            del self._memory[key]
+
+        if self._disk is not None:
+            entry = await asyncio.to_thread(self._disk_get, key, now)
+            if entry is not None:
+                expires_at, value = entry
+                self._memory_set(key, expires_at, value)
+                self.hits += 1
+                self.disk_hits += 1
+                return deepcopy(value)
+
+        self.misses += 1
+        return self.MISS
+
+    async def set(self, key: str, value: Any) -> None:
+        """Cache a copy of a value in every tier."""
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        # The caller keeps using `value`, e.g. as the node result it emits
+        self._memory_set(key, expires_at, deepcopy(value))
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk_set, key, expires_at, value)
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        self._memory.clear()
+        self.hits = self.misses = self.memory_hits = self.disk_hits = 0
+        self.evictions = 0
+        if self._disk is not None:
+            with self._disk_lock, self._disk:
+                self._disk.execute("DELETE FROM node_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "size": len(self._memory),
+        }
+
+    def _memory_set(self, key: str, expires_at: Optional[float], value: Any) -> None:
+        if self.maxsize == 0:
+            return
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[Optional[float], Any]]:
+        assert self._disk is not None
+        with self._disk_lock, self._disk:
+            row = self._disk.execute(
+                "SELECT value, expires_at FROM node_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._disk.execute("DELETE FROM node_cache WHERE key = ?", (key,))
+                return None
+            self._disk.execute(
+                "UPDATE node_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return row[1], pickle.loads(row[0])
+
+    def _disk_set(self, key: str, expires_at: Optional[float], value: Any) -> None:
+        assert self._disk is not None
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._disk_lock, self._disk:
+            self._disk.execute(
+                "INSERT OR REPLACE INTO node_cache VALUES (?, ?, ?, ?)",
+                (key, payload, expires_at, time.time()),
+            )
+            # Trimming sorts the table, so only do it every few writes
+            self._disk_writes += 1
+            if (
+                self.disk_maxsize is not None
+                and self._disk_writes % _DISK_TRIM_EVERY == 0
+            ):
+                self._disk.execute(
+                    """
+                    DELETE FROM node_cache WHERE key IN (
+                        SELECT key FROM node_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.disk_maxsize,),
+                )
@@ -0,0 +1,13 @@
+from .checkpoint import Checkpoint
+from .base_checkpointer import BaseCheckpointer
+from .memory_checkpointer import MemoryCheckpointer
+from .file_checkpointer import FileCheckpointer
+from .sqlite_checkpointer import SQLiteCheckpointer
+
+__all__ = [
+    "Checkpoint",
+    "BaseCheckpointer",
+    "MemoryCheckpointer",
+    "FileCheckpointer",
+    "SQLiteCheckpointer",
+]
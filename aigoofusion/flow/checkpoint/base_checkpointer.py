@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+from aigoofusion.flow.checkpoint.checkpoint import Checkpoint
+
+
+class BaseCheckpointer(ABC):
+    """
+    BaseCheckpointer Abstract
+
+    `put` only records the checkpoint and returns at once. A background task
+    writes pending checkpoints in batches, off the event loop, keeping only the
+    latest checkpoint of each run, so saving after every node adds little
+    latency to the run. Batches are written one at a time in the order they were
+    taken, so an older checkpoint never overwrites a newer one.
+    """
+
+    def __init__(self, flush_interval: float = 0.05):
+        """
+        Args:
+            flush_interval (float, optional): Seconds to wait for more checkpoints
+                before writing a batch. Defaults to 0.05.
+        """
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Checkpoint] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # Guards `_pending`, which worker threads take batches from
+        self._pending_lock = threading.Lock()
+        # Held while a batch is taken and written, and while reading behind it
+        self._write_lock = threading.Lock()
+
+    @abstractmethod
+    def _write_batch(self, checkpoints: List[Checkpoint]) -> None:
+        """Persist checkpoints, replacing older ones of the same run. Runs in a worker thread."""
+        pass
+
+    @abstractmethod
+    def _read(self, run_id: str) -> Optional[Checkpoint]:
+        """Read the latest persisted checkpoint of a run. Runs in a worker thread."""
+        pass
+
+    @abstractmethod
+    def _delete(self, run_id: str) -> None:
+        """Delete the checkpoint of a run. Runs in a worker thread."""
+        pass
+
+    def put(self, checkpoint: Checkpoint) -> None:
+        """Schedule a checkpoint to be written."""
+        with self._pending_lock:
+            self._pending[checkpoint.run_id] = checkpoint
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_later()
+            )
+
+    async def get(self, run_id: str) -> Optional[Checkpoint]:
+        """Get the latest checkpoint of a run."""
+        with self._pending_lock:
+            checkpoint = self._pending.get(run_id)
+        if checkpoint is not None:
+            return checkpoint
+        return await asyncio.to_thread(self._read_written, run_id)
+
+    async def delete(self, run_id: str) -> None:
+        """Delete the checkpoint of a run."""
+        with self._pending_lock:
+            self._pending.pop(run_id, None)
+        await asyncio.to_thread(self._delete_written, run_id)
+
+    async def flush(self) -> None:
+        """Write every pending checkpoint now."""
+        if self._pending:
+            await asyncio.to_thread(self._write_pending)
+
+    def _write_pending(self) -> None:
+        # Taking the batch under the write lock keeps batches in order, a batch
+        # taken later is always written later
+        with self._write_lock:
+            while True:
+                with self._pending_lock:
+                    if not self._pending:
+                        return
+                    batch = list(self._pending.values())
+                    self._pending = {}
+                self._write_batch(batch)
+
+    def _read_written(self, run_id: str) -> Optional[Checkpoint]:
+        # A batch being written is no longer pending, wait for it
+        with self._write_lock:
+            return self._read(run_id)
+
+    def _delete_written(self, run_id: str) -> None:
+        with self._write_lock:
+            self._delete(run_id)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await self.flush()
@@ -0,0 +1,29 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Checkpoint:
+    """
+    Saved position of a workflow run at a node boundary.
+
+    Attributes:
+        run_id: ID of the run.
+        state: Run state after the last finished node.
+        queue: Nodes still waiting to run, in order.
+        step: Number of nodes finished so far.
+        thread_id: Thread ID used for memory management.
+        completed: Whether the run has finished.
+        joins: Predecessors that already reached each waiting join node.
+        created_at: Unix time the checkpoint was taken.
+    """
+
+    run_id: str
+    state: Dict[str, Any]
+    queue: List[str]
+    step: int = 0
+    thread_id: Optional[str] = None
+    completed: bool = False
+    joins: Optional[Dict[str, List[str]]] = None
+    created_at: float = field(default_factory=time.time)
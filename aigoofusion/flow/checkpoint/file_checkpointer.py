@@ -0,0 +1,55 @@
+import os
+import pickle
+import tempfile
+from typing import List, Optional
+
+from aigoofusion.flow.checkpoint.base_checkpointer import BaseCheckpointer
+from aigoofusion.flow.checkpoint.checkpoint import Checkpoint
+
+
+class FileCheckpointer(BaseCheckpointer):
+    """
+    Checkpointer that keeps one pickle file per run in a directory.
+
+    Example:
+    ```python
+    workflow = AIGooFlow(checkpointer=FileCheckpointer("./checkpoints"))
+    ```
+    """
+
+    def __init__(self, directory: str, flush_interval: float = 0.05):
+        super().__init__(flush_interval=flush_interval)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, run_id: str) -> str:
+        return os.path.join(self.directory, f"{run_id}.ckpt")
+
+    def _write_batch(self, checkpoints: List[Checkpoint]) -> None:
+        for checkpoint in checkpoints:
+            path = self._path(checkpoint.run_id)
+            # A temp file of its own, writers never share one
+            fd, temp_path = tempfile.mkstemp(
+                prefix=f"{checkpoint.run_id}.", suffix=".tmp", dir=self.directory
+            )
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    pickle.dump(checkpoint, file, protocol=pickle.HIGHEST_PROTOCOL)
+                # Atomic, a crash never leaves a half written checkpoint
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+
+    def _read(self, run_id: str) -> Optional[Checkpoint]:
+        try:
+            with open(self._path(run_id), "rb") as file:
+                return pickle.load(file)
+        except FileNotFoundError:
+            return None
+
+    def _delete(self, run_id: str) -> None:
+        try:
+            os.remove(self._path(run_id))
+        except FileNotFoundError:
+            pass
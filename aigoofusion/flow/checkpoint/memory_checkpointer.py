@@ -0,0 +1,26 @@
+from typing import Dict, List, Optional
+
+from aigoofusion.flow.checkpoint.base_checkpointer import BaseCheckpointer
+from aigoofusion.flow.checkpoint.checkpoint import Checkpoint
+
+
+class MemoryCheckpointer(BaseCheckpointer):
+    """
+    In-process checkpointer.
+
+    Does not survive a restart, use it for tests or to resume runs in the same process.
+    """
+
+    def __init__(self, flush_interval: float = 0.0):
+        super().__init__(flush_interval=flush_interval)
+        self._checkpoints: Dict[str, Checkpoint] = {}
+
+    def _write_batch(self, checkpoints: List[Checkpoint]) -> None:
+        for checkpoint in checkpoints:
+            self._checkpoints[checkpoint.run_id] = checkpoint
+
+    def _read(self, run_id: str) -> Optional[Checkpoint]:
+        return self._checkpoints.get(run_id)
+
+    def _delete(self, run_id: str) -> None:
+        self._checkpoints.pop(run_id, None)
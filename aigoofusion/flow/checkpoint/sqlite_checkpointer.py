@@ -0,0 +1,74 @@
+import pickle
+import sqlite3
+from threading import Lock
+from typing import List, Optional
+
+from aigoofusion.flow.checkpoint.base_checkpointer import BaseCheckpointer
+from aigoofusion.flow.checkpoint.checkpoint import Checkpoint
+
+
+class SQLiteCheckpointer(BaseCheckpointer):
+    """
+    Checkpointer backed by a SQLite database.
+
+    Each batch is written in a single transaction.
+
+    Example:
+    ```python
+    workflow = AIGooFlow(checkpointer=SQLiteCheckpointer("checkpoints.db"))
+    ```
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.05):
+        super().__init__(flush_interval=flush_interval)
+        self.path = path
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    run_id TEXT PRIMARY KEY,
+                    thread_id TEXT,
+                    step INTEGER NOT NULL,
+                    completed INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    payload BLOB NOT NULL
+                )
+                """
+            )
+
+    def _write_batch(self, checkpoints: List[Checkpoint]) -> None:
+        rows = [
+            (
+                checkpoint.run_id,
+                checkpoint.thread_id,
+                checkpoint.step,
+                int(checkpoint.completed),
+                checkpoint.created_at,
+                pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL),
+            )
+            for checkpoint in checkpoints
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def _read(self, run_id: str) -> Optional[Checkpoint]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload FROM checkpoints WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def _delete(self, run_id: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM checkpoints WHERE run_id = ?", (run_id,)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,82 @@
+import uuid
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, Optional, Set
+
+from aigoofusion.flow.event.flow_event import FlowEvent
+from aigoofusion.flow.scheduler.priority import Priority
+from aigoofusion.flow.state.memory_manager import MemoryManager
+from aigoofusion.flow.state.workflow_state import WorkflowState
+from aigoofusion.runtime.cancellation import CancelToken
+from aigoofusion.runtime.trace import TraceRecorder
+
+if TYPE_CHECKING:
+    from aigoofusion.flow.speculation.speculative_run import SpeculativeRun
+
+
+@dataclass
+class RunContext:
+    """
+    Everything that belongs to a single workflow run.
+
+    `AIGooFlow` only holds the graph definition. Each `execute` or `stream` call
+    gets its own `RunContext`, so one flow can serve many concurrent runs.
+
+    Attributes:
+        state: State of this run, including its history.
+        thread_id: Thread ID used for memory management.
+        memory: Memory manager the state updates are persisted to.
+        run_id: Unique ID of this run.
+        step: Number of nodes finished so far.
+        max_steps: Maximum number of nodes the run may execute.
+        deadline: Monotonic time (`time.monotonic()`) the run must finish by.
+        emit: Receives stream events, None when nobody listens.
+        event_types: Event types `emit` receives, None for all of them.
+        deltas: Report only the changed keys instead of results and full states.
+        trace: Collects the timeline of the run, None when it is not traced.
+        stream_callback: Receives raw chunks of streaming nodes.
+        cancel_token: Set by `AIGooFlow.cancel`, stops the nodes and model streams of the run.
+        speculations: Nodes started ahead of their conditional edge, by node name.
+        speculation: Set on the context of a node started ahead of its edge, its
+            hook calls are held back there until the edge picks it.
+        joins: Predecessors that already reached each join node in its current round.
+        priority: Priority class of the node calls with a `FlowScheduler`.
+        tenant: Key the `FlowScheduler` shares slots fairly by, None for the shared default.
+    """
+
+    state: WorkflowState
+    thread_id: Optional[str] = None
+    memory: Optional[MemoryManager] = None
+    run_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    step: int = 0
+    max_steps: Optional[int] = None
+    deadline: Optional[float] = None
+    emit: Optional[Callable[[FlowEvent], None]] = None
+    event_types: Optional[FrozenSet[str]] = None
+    deltas: bool = False
+    trace: Optional[TraceRecorder] = None
+    stream_callback: Optional[Callable] = None
+    cancel_token: CancelToken = field(default_factory=CancelToken)
+    speculations: Optional[Dict[str, "SpeculativeRun"]] = None
+    speculation: Optional["SpeculativeRun"] = None
+    joins: Dict[str, Set[str]] = field(default_factory=dict)
+    priority: Priority = Priority.NORMAL
+    tenant: Optional[str] = None
+
+    def wants(self, event_type: str) -> bool:
+        """Whether an event of `event_type` should be built at all."""
+        return self.emit is not None and (
+            self.event_types is None or event_type in self.event_types
+        )
+
+    def update_state(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply `values` to the run state, through memory when it is bound.
+
+        Returns the keys that changed, which must not be mutated.
+        """
+        updated_state = (
+            self.memory.update_memory(self.thread_id, values)
+            if self.memory and self.thread_id
+            else values
+        )
+        return self.state._update(updated_state)
@@ -0,0 +1,24 @@
+from .base_task_queue import BaseTaskQueue
+from .codec import decode, encode
+from .flow_task import FlowTask, TaskKind, TaskResult
+from .flow_worker import FlowWorker, run_worker, spawn_workers
+from .local_task_queue import LocalTaskQueue
+from .memory_task_queue import MemoryTaskQueue
+from .remote_flow import RemoteFlow
+from .task_dispatcher import TaskDispatcher
+
+__all__ = [
+    "BaseTaskQueue",
+    "FlowTask",
+    "FlowWorker",
+    "LocalTaskQueue",
+    "MemoryTaskQueue",
+    "RemoteFlow",
+    "TaskDispatcher",
+    "TaskKind",
+    "TaskResult",
+    "decode",
+    "encode",
+    "run_worker",
+    "spawn_workers",
+]
@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from aigoofusion.flow.distributed.flow_task import FlowTask, TaskResult
+
+
+class BaseTaskQueue(ABC):
+    """
+    BaseTaskQueue Abstract
+
+    Queue between clients submitting `FlowTask`s and the workers running them,
+    with at-least-once delivery: a leased task that is not completed within the
+    lease timeout is handed out again, up to `max_attempts` times. Completion is
+    idempotent, the first result of a task wins and later ones are dropped, so a
+    task that ran twice is still reported once.
+
+    Methods block and are called from worker threads, never on the event loop.
+    """
+
+    @abstractmethod
+    def put(self, task: FlowTask) -> None:
+        """Add a task."""
+        pass
+
+    @abstractmethod
+    def lease(self, timeout: float) -> Optional[FlowTask]:
+        """Take the next task, waiting up to `timeout` seconds. None when there is none or the queue is closed."""
+        pass
+
+    @abstractmethod
+    def complete(self, result: TaskResult) -> bool:
+        """Record the result of a leased task. Returns False when the task was already completed."""
+        pass
+
+    @abstractmethod
+    def results(self, reply_to: str, timeout: float) -> List[TaskResult]:
+        """Take the results for a client, waiting up to `timeout` seconds for at least one."""
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Stop handing out tasks, workers waiting in `lease` return."""
+        pass
+
+    @abstractmethod
+    def is_closed(self) -> bool:
+        pass
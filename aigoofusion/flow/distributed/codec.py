@@ -0,0 +1,26 @@
+import pickle
+import zlib
+from typing import Any
+
+# Payloads at least this large are compressed before they cross the queue
+COMPRESS_MIN_SIZE = 4096
+
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+
+
+def encode(value: Any) -> bytes:
+    """Serialize a payload compactly: pickled, and zlib-compressed when large."""
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) >= COMPRESS_MIN_SIZE:
+        compressed = zlib.compress(data, 1)
+        if len(compressed) < len(data):
+            return _ZLIB + compressed
+    return _RAW + data
+
+
+def decode(data: bytes) -> Any:
+    """Inverse of `encode`."""
+    if data[:1] == _ZLIB:
+        return pickle.loads(zlib.decompress(data[1:]))
+    return pickle.loads(data[1:])
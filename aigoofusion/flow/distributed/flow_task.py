@@ -0,0 +1,60 @@
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Optional
+
+
+class TaskKind(Enum):
+    """What a worker runs for a task."""
+
+    RUN = "run"
+    NODE = "node"
+
+
+@dataclass
+class FlowTask:
+    """
+    Unit of work sent to flow workers.
+
+    Attributes:
+        flow: Name the workflow is registered under on the workers.
+        kind: Whole run, or a single node.
+        payload: Encoded inputs, see `codec.encode`. For a run the state to add to the
+            initial state, for a node the values of its parameters.
+        reply_to: Client that receives the result.
+        node: Node to run, for `TaskKind.NODE`.
+        thread_id: Thread ID of the run, for workflows with memory.
+        task_id: Unique ID, also the run ID of a run task.
+        attempt: Number of times the task has been handed to a worker.
+    """
+
+    flow: str
+    kind: TaskKind
+    payload: bytes
+    reply_to: str
+    node: Optional[str] = None
+    thread_id: Optional[str] = None
+    task_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    attempt: int = 0
+
+
+@dataclass
+class TaskResult:
+    """
+    Outcome of a `FlowTask`.
+
+    Attributes:
+        task_id: ID of the task.
+        reply_to: Client that receives the result.
+        payload: Encoded result, the changed keys of a run or the update of a node.
+        error: Error message when the task failed.
+    """
+
+    task_id: str
+    reply_to: str
+    payload: Optional[bytes] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
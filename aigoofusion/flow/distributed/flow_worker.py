@@ -0,0 +1,152 @@
+import asyncio
+import dataclasses
+import multiprocessing
+import os
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from aigoofusion.flow.distributed.base_task_queue import BaseTaskQueue
+from aigoofusion.flow.distributed.codec import decode, encode
+from aigoofusion.flow.distributed.flow_task import FlowTask, TaskKind, TaskResult
+from aigoofusion.flow.node.node import Node, NodeExecutor
+from aigoofusion.flow.state.workflow_state import _is_unchanged
+
+if TYPE_CHECKING:
+    from aigoofusion.flow.aigoo_flow import AIGooFlow
+
+
+class FlowWorker:
+    """
+    Runs tasks from a task queue.
+
+    Workflows are registered by name and must be defined the same way as on the
+    clients. A worker runs up to `concurrency` tasks at a time on its event loop.
+    """
+
+    def __init__(
+        self,
+        queue: BaseTaskQueue,
+        flows: Dict[str, "AIGooFlow"],
+        concurrency: int = 8,
+        poll_timeout: float = 1.0,
+    ):
+        """
+        Args:
+            queue (BaseTaskQueue): Queue to take tasks from.
+            flows (Dict[str, AIGooFlow]): Workflows by the name clients use.
+            concurrency (int, optional): Tasks run at the same time. Defaults to 8.
+            poll_timeout (float, optional): Seconds a lease waits before checking for a stop. Defaults to 1.0.
+        """
+        self.queue = queue
+        self.flows = flows
+        self.concurrency = concurrency
+        self.poll_timeout = poll_timeout
+        self._stopped = False
+        self._local_nodes: Dict[Tuple[str, str], Node] = {}
+
+    def stop(self) -> None:
+        """Finish the running tasks and stop taking new ones."""
+        self._stopped = True
+
+    async def run(self) -> None:
+        """Take and run tasks until `stop` is called or the queue is closed."""
+        await asyncio.gather(*(self._consume() for _ in range(self.concurrency)))
+
+    async def _consume(self) -> None:
+        while not self._stopped:
+            task = await asyncio.to_thread(self.queue.lease, self.poll_timeout)
+            if task is None:
+                if await asyncio.to_thread(self.queue.is_closed):
+                    return
+                continue
+            result = await self.handle(task)
+            # A duplicate completion is dropped by the queue
+            await asyncio.to_thread(self.queue.complete, result)
+
+    async def handle(self, task: FlowTask) -> TaskResult:
+        """Run a task and build its result, failures included."""
+        try:
+            flow = self.flows.get(task.flow)
+            if flow is None:
+                raise KeyError(f"Workflow '{task.flow}' is not registered on this worker")
+
+            if task.kind is TaskKind.RUN:
+                payload = await self._run_flow(flow, task)
+            else:
+                payload = await self._run_node(flow, task)
+            return TaskResult(task.task_id, task.reply_to, payload=encode(payload))
+        except Exception as e:
+            return TaskResult(
+                task.task_id, task.reply_to, error=f"{type(e).__name__}: {e}"
+            )
+
+    async def _run_flow(self, flow: "AIGooFlow", task: FlowTask) -> Dict[str, Any]:
+        inputs = decode(task.payload)
+        state = await flow.execute(inputs, task.thread_id, run_id=task.task_id)
+
+        # The client knows the initial state and inputs, only send what the run changed
+        base = {**flow.initial_state, **inputs}
+        return {
+            key: value
+            for key, value in state.items()
+            if key not in base or not _is_unchanged(base[key], value)
+        }
+
+    async def _run_node(self, flow: "AIGooFlow", task: FlowTask) -> List[Dict[str, Any]]:
+        node = self._local_node(flow, task)
+        return await flow.run_node(node, decode(task.payload), run_id=task.task_id)
+
+    def _local_node(self, flow: "AIGooFlow", task: FlowTask) -> Node:
+        """The remote node, set to run here."""
+        key = (task.flow, task.node or "")
+        node = self._local_nodes.get(key)
+        if node is None:
+            remote = flow.nodes[task.node]  # type: ignore
+            node = self._local_nodes[key] = dataclasses.replace(
+                remote,
+                executor=NodeExecutor.INLINE
+                if remote.is_async or remote.is_async_gen
+                else NodeExecutor.THREAD,
+            )
+        return node
+
+
+def run_worker(
+    queue: BaseTaskQueue,
+    flow_factory: Callable[[], Dict[str, "AIGooFlow"]],
+    concurrency: int = 8,
+) -> None:
+    """Entry point of a worker process: build the workflows and run tasks until the queue closes."""
+    asyncio.run(FlowWorker(queue, flow_factory(), concurrency).run())
+
+
+def spawn_workers(
+    queue: BaseTaskQueue,
+    flow_factory: Callable[[], Dict[str, "AIGooFlow"]],
+    processes: Optional[int] = None,
+    concurrency: int = 8,
+) -> List[multiprocessing.Process]:
+    """
+    Start worker processes.
+
+    Args:
+        queue (BaseTaskQueue): Queue the workers take tasks from, must be usable from
+            other processes, e.g. `LocalTaskQueue`.
+        flow_factory (Callable[[], Dict[str, AIGooFlow]]): Module-level function building the
+            workflows by name, called once in every worker.
+        processes (Optional[int], optional): Number of workers. Defaults to one per core.
+        concurrency (int, optional): Tasks each worker runs at the same time. Defaults to 8.
+
+    Returns:
+        List[multiprocessing.Process]: The started workers, they exit when the queue is closed.
+    """
+    context = multiprocessing.get_context("spawn")
+    workers = []
+    for _ in range(processes or os.cpu_count() or 1):
+        worker = context.Process(
+            target=run_worker,
+            args=(queue, flow_factory, concurrency),
+            daemon=True,
+        )
+        worker.start()
+        workers.append(worker)
+    return workers
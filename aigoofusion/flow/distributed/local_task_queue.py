@@ -0,0 +1,116 @@
+import multiprocessing
+import os
+from multiprocessing.managers import BaseManager
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from aigoofusion.flow.distributed.base_task_queue import BaseTaskQueue
+from aigoofusion.flow.distributed.flow_task import FlowTask, TaskResult
+from aigoofusion.flow.distributed.memory_task_queue import MemoryTaskQueue
+
+# The queue held by the server process
+_served_queue: Optional[MemoryTaskQueue] = None
+
+
+def _create_queue(options: Dict[str, Any]) -> None:
+    global _served_queue
+    _served_queue = MemoryTaskQueue(**options)
+
+
+def _get_queue() -> Optional[MemoryTaskQueue]:
+    return _served_queue
+
+
+class _QueueManager(BaseManager):
+    pass
+
+
+_QueueManager.register("queue", callable=_get_queue)
+
+
+class LocalTaskQueue(BaseTaskQueue):
+    """
+    Task queue shared by the processes of one machine, no external service needed.
+
+    `start` runs a `MemoryTaskQueue` in a server process reachable over a local
+    socket (TCP on localhost or a Unix socket path). Workers and clients `connect`
+    to it. An instance can be passed to another process as is, it reconnects there.
+    """
+
+    def __init__(
+        self,
+        manager: _QueueManager,
+        address: Union[Tuple[str, int], str],
+        authkey: bytes,
+        owner: bool = False,
+    ):
+        self._manager = manager
+        self._queue = manager.queue()  # type: ignore
+        self.address = address
+        self.authkey = authkey
+        self._owner = owner
+
+    @classmethod
+    def start(
+        cls,
+        address: Union[Tuple[str, int], str] = ("127.0.0.1", 0),
+        authkey: Optional[bytes] = None,
+        **options: Any,
+    ) -> "LocalTaskQueue":
+        """
+        Start the queue server.
+
+        Args:
+            address (Union[Tuple[str, int], str], optional): Host and port, port 0 picks a free
+                one, or a Unix socket path. Defaults to ("127.0.0.1", 0).
+            authkey (Optional[bytes], optional): Key clients must present. Defaults to a random key.
+            **options: `MemoryTaskQueue` options, e.g. `lease_timeout` and `max_attempts`.
+
+        Returns:
+            LocalTaskQueue: Queue connected to the new server.
+        """
+        authkey = authkey or os.urandom(32)
+        manager = _QueueManager(
+            address=address,
+            authkey=authkey,
+            ctx=multiprocessing.get_context("spawn"),
+        )
+        manager.start(_create_queue, (options,))
+        return cls(manager, manager.address, authkey, owner=True)
+
+    @classmethod
+    def connect(
+        cls, address: Union[Tuple[str, int], str], authkey: bytes
+    ) -> "LocalTaskQueue":
+        """Connect to a queue server started with `start`."""
+        manager = _QueueManager(address=address, authkey=authkey)
+        manager.connect()
+        return cls(manager, address, authkey)
+
+    def __reduce__(self):
+        return (LocalTaskQueue.connect, (self.address, self.authkey))
+
+    def put(self, task: FlowTask) -> None:
+        self._queue.put(task)
+
+    def lease(self, timeout: float) -> Optional[FlowTask]:
+        return self._queue.lease(timeout)
+
+    def complete(self, result: TaskResult) -> bool:
+        return self._queue.complete(result)
+
+    def results(self, reply_to: str, timeout: float) -> List[TaskResult]:
+        return self._queue.results(reply_to, timeout)
+
+    def close(self) -> None:
+        self._queue.close()
+
+    def is_closed(self) -> bool:
+        return self._queue.is_closed()
+
+    def shutdown(self) -> None:
+        """Close the queue and, when this instance started it, stop the server."""
+        try:
+            self.close()
+        finally:
+            if self._owner:
+                self._manager.shutdown()  # type: ignore
@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from aigoofusion.flow.distributed.base_task_queue import BaseTaskQueue
+from aigoofusion.flow.distributed.flow_task import FlowTask, TaskResult
+
+
+class MemoryTaskQueue(BaseTaskQueue):
+    """
+    Task queue for workers in the same process, e.g. threads or tests.
+
+    Also the state behind `LocalTaskQueue`, which serves it to other processes.
+    """
+
+    def __init__(
+        self,
+        lease_timeout: float = 60.0,
+        max_attempts: int = 3,
+        completed_limit: int = 100_000,
+        result_ttl: float = 600.0,
+    ):
+        """
+        Args:
+            lease_timeout (float, optional): Seconds a worker has to complete a task before it
+                is handed out again. Defaults to 60.0.
+            max_attempts (int, optional): Times a task is handed out before it fails. Defaults to 3.
+            completed_limit (int, optional): Completed task IDs remembered to drop duplicate
+                results. Defaults to 100_000.
+            result_ttl (float, optional): Seconds results wait for their client to take them,
+                e.g. one that stopped polling, before they are dropped. Defaults to 600.0.
+        """
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.completed_limit = completed_limit
+        self.result_ttl = result_ttl
+        self._pending: Deque[FlowTask] = deque()
+        self._leased: Dict[str, Tuple[FlowTask, float]] = {}
+        self._results: Dict[str, List[TaskResult]] = defaultdict(list)
+        self._completed: "OrderedDict[str, None]" = OrderedDict()
+        # Clients with results to take, by the time the oldest of them arrived
+        self._waiting_since: "OrderedDict[str, float]" = OrderedDict()
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def put(self, task: FlowTask) -> None:
+        with self._condition:
+            self._pending.append(task)
+            self._condition.notify_all()
+
+    def _requeue_expired(self) -> None:
+        now = time.monotonic()
+        expired = [
+            task_id
+            for task_id, (_, lease_deadline) in self._leased.items()
+            if lease_deadline <= now
+        ]
+        for task_id in expired:
+            task, _ = self._leased.pop(task_id)
+            if task.attempt >= self.max_attempts:
+                self._finish(
+                    TaskResult(
+                        task_id=task.task_id,
+                        reply_to=task.reply_to,
+                        error=f"Task gave up after {task.attempt} attempts",
+                    )
+                )
+            else:
+                self._pending.appendleft(task)
+
+    def _next_expiry(self) -> Optional[float]:
+        if not self._leased:
+            return None
+        return min(lease_deadline for _, lease_deadline in self._leased.values())
+
+    def lease(self, timeout: float) -> Optional[FlowTask]:
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    return None
+                self._requeue_expired()
+                while self._pending:
+                    task = self._pending.popleft()
+                    if task.task_id in self._completed:
+                        # Finished by an earlier attempt that was thought lost
+                        continue
+                    task.attempt += 1
+                    self._leased[task.task_id] = (
+                        task,
+                        time.monotonic() + self.lease_timeout,
+                    )
+                    return task
+
+                now = time.monotonic()
+                if now >= deadline:
+                    return None
+                wait = deadline - now
+                expiry = self._next_expiry()
+                if expiry is not None:
+                    wait = min(wait, max(expiry - now, 0.001))
+                self._condition.wait(wait)
+
+    def _finish(self, result: TaskResult) -> bool:
+        if result.task_id in self._completed:
+            return False
+        self._completed[result.task_id] = None
+        if len(self._completed) > self.completed_limit:
+            self._completed.popitem(last=False)
+        self._leased.pop(result.task_id, None)
+        self._expire_results()
+        self._results[result.reply_to].append(result)
+        self._waiting_since.setdefault(result.reply_to, time.monotonic())
+        self._condition.notify_all()
+        return True
+
+    def _expire_results(self) -> None:
+        cutoff = time.monotonic() - self.result_ttl
+        while self._waiting_since:
+            reply_to, since = next(iter(self._waiting_since.items()))
+            if since > cutoff:
+                return
+            del self._waiting_since[reply_to]
+            self._results.pop(reply_to, None)
+
+    def complete(self, result: TaskResult) -> bool:
+        with self._condition:
+            return self._finish(result)
+
+    def results(self, reply_to: str, timeout: float) -> List[TaskResult]:
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                self._requeue_expired()
+                results = self._results.pop(reply_to, None)
+                self._waiting_since.pop(reply_to, None)
+                if results:
+                    return results
+                now = time.monotonic()
+                if self._closed or now >= deadline:
+                    return []
+                wait = deadline - now
+                expiry = self._next_expiry()
+                if expiry is not None:
+                    wait = min(wait, max(expiry - now, 0.001))
+                self._condition.wait(wait)
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def is_closed(self) -> bool:
+        return self._closed
@@ -0,0 +1,102 @@
+import asyncio
+import uuid
+from copy import deepcopy
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.exception.aigoo_limit_exception import AIGooLimitException
+from aigoofusion.flow.batch.batch_item_result import BatchItemResult
+from aigoofusion.flow.distributed.base_task_queue import BaseTaskQueue
+from aigoofusion.flow.distributed.codec import decode, encode
+from aigoofusion.flow.distributed.flow_task import FlowTask, TaskKind
+from aigoofusion.flow.distributed.task_dispatcher import TaskDispatcher
+
+if TYPE_CHECKING:
+    from aigoofusion.flow.aigoo_flow import AIGooFlow
+
+
+class RemoteFlow:
+    """
+    Runs a workflow on flow workers instead of in this process.
+
+    Only the input state goes to the worker and only the keys the run changed come
+    back, the final state is rebuilt here from the workflow's initial state.
+    """
+
+    def __init__(self, flow: "AIGooFlow", name: str, queue: BaseTaskQueue):
+        """
+        Args:
+            flow (AIGooFlow): Local definition of the workflow, for its initial state.
+            name (str): Name the workflow is registered under on the workers.
+            queue (BaseTaskQueue): Queue the workers take tasks from.
+        """
+        self.flow = flow
+        self.name = name
+        self.dispatcher = TaskDispatcher(queue)
+
+    async def execute(
+        self,
+        additional_state: Dict[str, Any],
+        thread_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Execute the workflow on a worker.
+
+        Args:
+            additional_state: Initial state to add to the workflow
+            thread_id: Optional thread ID for memory management, the memory lives on the worker
+            run_id: Optional run ID, also the task ID, a run is completed at most once
+            timeout: Optional seconds to wait for the result
+
+        Raises:
+            AIGooLimitException: When the result does not arrive within `timeout`.
+
+        Returns:
+            The final workflow state
+        """
+        additional_state = additional_state or {}
+        task = FlowTask(
+            flow=self.name,
+            kind=TaskKind.RUN,
+            payload=encode(additional_state),
+            reply_to=self.dispatcher.client_id,
+            thread_id=thread_id,
+            task_id=run_id or str(uuid.uuid4()),
+        )
+        try:
+            result = await asyncio.wait_for(self.dispatcher.submit(task), timeout)
+        except TimeoutError:
+            raise AIGooLimitException(
+                "Remote workflow exceeded its timeout", reason="timeout"
+            ) from None
+
+        if not result.ok:
+            raise AIGooException(result.error)
+        return {
+            **deepcopy(self.flow.initial_state),
+            **deepcopy(additional_state),
+            **decode(result.payload),  # type: ignore
+        }
+
+    async def execute_many(
+        self,
+        inputs: Iterable[Dict[str, Any]],
+        concurrency: int = 100,
+        timeout: Optional[float] = None,
+    ) -> List[BatchItemResult]:
+        """Execute the workflow on workers for every input, see `AIGooFlow.execute_many`."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(index: int, item: Dict[str, Any]) -> BatchItemResult:
+            async with semaphore:
+                try:
+                    state = await self.execute(item, timeout=timeout)
+                except Exception as e:
+                    return BatchItemResult(index=index, input=item, error=e)
+                return BatchItemResult(index=index, input=item, state=state)
+
+        return list(
+            await asyncio.gather(*(run(index, item) for index, item in enumerate(inputs)))
+        )
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from aigoofusion.flow.distributed.base_task_queue import BaseTaskQueue
+from aigoofusion.flow.distributed.flow_task import FlowTask, TaskResult
+
+# Seconds a results poll blocks, bounds how long an idle pump thread lingers
+_POLL_TIMEOUT = 0.5
+
+
+class TaskDispatcher:
+    """
+    Client side of a task queue: submits tasks and awaits their results.
+
+    One pump thread per dispatcher collects the results of every outstanding
+    task with a single blocking call, and hands them to the waiting coroutines.
+    It exits once nothing is outstanding.
+    """
+
+    def __init__(self, queue: BaseTaskQueue):
+        self.queue = queue
+        self.client_id = str(uuid.uuid4())
+        self._waiting: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._lock = threading.Lock()
+        self._pump: Optional[threading.Thread] = None
+
+    async def submit(self, task: FlowTask) -> TaskResult:
+        """Put `task` on the queue and wait for its result."""
+        task.reply_to = self.client_id
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            self._waiting[task.task_id] = (loop, future)
+            if self._pump is None:
+                self._pump = threading.Thread(
+                    target=self._collect, name="aigooflow-results", daemon=True
+                )
+                self._pump.start()
+
+        try:
+            await asyncio.to_thread(self.queue.put, task)
+            return await future
+        finally:
+            # Also on cancellation, a late result is then dropped
+            with self._lock:
+                self._waiting.pop(task.task_id, None)
+
+    def _collect(self) -> None:
+        while True:
+            with self._lock:
+                if not self._waiting:
+                    self._pump = None
+                    return
+            try:
+                results = self.queue.results(self.client_id, _POLL_TIMEOUT)
+            except Exception as e:
+                self._fail_all(e)
+                # The rejected waiters leave once their loops run, do not spin until then
+                time.sleep(_POLL_TIMEOUT)
+                continue
+
+            for result in results:
+                with self._lock:
+                    waiting = self._waiting.get(result.task_id)
+                if waiting is not None:
+                    loop, future = waiting
+                    loop.call_soon_threadsafe(_resolve, future, result)
+
+    def _fail_all(self, error: Exception) -> None:
+        with self._lock:
+            waiting = list(self._waiting.values())
+        for loop, future in waiting:
+            loop.call_soon_threadsafe(_reject, future, error)
+
+
+def _resolve(future: asyncio.Future, result: TaskResult) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _reject(future: asyncio.Future, error: Exception) -> None:
+    if not future.done():
+        future.set_exception(error)
@@ -1,12 +1,17 @@
 from dataclasses import dataclass
 from typing import Callable, List, Optional, Union
 
+from aigoofusion.flow.node.node import NodeExecutor
+
 
 @dataclass
 class Edge:
     source: str
     targets: Union[str, List[str]]
     condition: Optional[Callable] = None
+    executor: NodeExecutor = NodeExecutor.INLINE
+    # Start the predicted target before the condition is decided, see `AIGooFlow.add_conditional_edge`
+    speculative: bool = False
     
     def __post_init__(self):
         if isinstance(self.targets, str):
@@ -0,0 +1,3 @@
+from .flow_event import EVENT_TYPES, FlowEvent, StreamMode
+
+__all__ = ["EVENT_TYPES", "FlowEvent", "StreamMode"]
@@ -0,0 +1,96 @@
+from collections.abc import Mapping
+from enum import Enum
+from typing import Any, Dict, Iterator
+
+
+class StreamMode(Enum):
+    """What `AIGooFlow.stream` reports about the state."""
+
+    FULL = "full"
+    DELTAS = "deltas"
+
+
+# Every event type `AIGooFlow.stream` can yield
+EVENT_TYPES = frozenset(
+    {
+        "state_update",
+        "workflow_start",
+        "node_start",
+        "stream_chunk",
+        "node_result",
+        "node_complete",
+        "next_nodes",
+        "error",
+        "retry",
+        "workflow_complete",
+        "workflow_interrupted",
+        "workflow_error",
+    }
+)
+
+
+class FlowEvent(Mapping):
+    """
+    Event yielded by `AIGooFlow.stream`.
+
+    A slotted object instead of a dict, fields an event does not carry are left
+    unset. It still reads like the dicts earlier versions yielded, so
+    `event["type"]`, `event.get("state")` and `"node" in event` keep working, and
+    `to_dict()` gives a plain dict, e.g. for JSON.
+
+    Attributes:
+        type: Event type, one of `EVENT_TYPES`.
+        node: Node the event belongs to.
+        content: Raw chunk of a streaming node.
+        result: Update returned by a node.
+        delta: Keys an update changed, in `deltas` mode. Must not be mutated.
+        state: Workflow state.
+        nodes: Nodes queued after a node completed.
+        error: Error message.
+        reason: Limit that interrupted the run.
+        attempt: Number of the failed attempt of a retried node.
+        delay: Seconds until a retried node is called again.
+    """
+
+    __slots__ = (
+        "type",
+        "node",
+        "content",
+        "result",
+        "delta",
+        "state",
+        "nodes",
+        "error",
+        "reason",
+        "attempt",
+        "delay",
+    )
+
+    def __init__(self, type: str, **fields: Any):
+        self.type = type
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.__slots__:
+            if hasattr(self, key):
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the event as a plain dict."""
+        return {key: getattr(self, key) for key in self}
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={getattr(self, key)!r}" for key in self)
+        return f"FlowEvent({fields})"
@@ -0,0 +1,12 @@
+from .process_call import call_in_process
+from .shared_payload import SHARED_MEMORY_MIN_SIZE, SharedPayload, discard, release, restore, share
+
+__all__ = [
+    "SHARED_MEMORY_MIN_SIZE",
+    "SharedPayload",
+    "call_in_process",
+    "discard",
+    "release",
+    "restore",
+    "share",
+]
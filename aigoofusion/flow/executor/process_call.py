@@ -0,0 +1,37 @@
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List
+
+from aigoofusion.flow.executor.shared_payload import release, restore, share
+
+
+def call_in_process(func: Callable, inputs: Dict[str, Any], min_size: int) -> Any:
+    """
+    Run a node function inside a pool worker.
+
+    Large inputs arrive and large outputs leave through shared memory, see
+    `share`. The workflow unlinks both once the call is done.
+
+    Args:
+        func (Callable): Node function, must be importable by the worker.
+        inputs (Dict[str, Any]): Shared keyword arguments of the function.
+        min_size (int): Smallest buffer moved through shared memory.
+
+    Returns:
+        Any: The shared result of the function.
+    """
+    attached: List[SharedMemory] = []
+    try:
+        kwargs = restore(inputs, attached)
+    finally:
+        release(attached)
+
+    result = func(**kwargs)
+
+    created: List[SharedMemory] = []
+    try:
+        shared = share(result, min_size, created)
+    except BaseException:
+        release(created, unlink=True)
+        raise
+    release(created)
+    return shared
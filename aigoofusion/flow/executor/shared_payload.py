@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Iterator, List, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Buffers smaller than this are cheaper to pickle than to map
+SHARED_MEMORY_MIN_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class SharedPayload:
+    """
+    Reference to a buffer moved through shared memory instead of being pickled.
+
+    Only the reference crosses the process boundary, the receiving side copies
+    the data out of the block and the sending side unlinks it once it has been read.
+    """
+
+    name: str
+    size: int
+    kind: str
+    dtype: Any = None
+    shape: Tuple[int, ...] = ()
+
+
+def _to_block(data: memoryview, blocks: List[SharedMemory]) -> SharedMemory:
+    block = SharedMemory(create=True, size=max(data.nbytes, 1))
+    blocks.append(block)
+    block.buf[: data.nbytes] = data.cast("B")
+    return block
+
+
+def share(value: Any, min_size: int, blocks: List[SharedMemory]) -> Any:
+    """
+    Replace large `bytes`, `bytearray` and numpy arrays in `value` with `SharedPayload`s.
+
+    Dicts, lists and tuples are walked recursively. Created blocks are appended to
+    `blocks`, the caller releases them with `release`.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {key: share(item, min_size, blocks) for key, item in value.items()}
+    if value_type is list or value_type is tuple:
+        return value_type(share(item, min_size, blocks) for item in value)
+
+    if value_type is bytes or value_type is bytearray:
+        if len(value) < min_size:
+            return value
+        block = _to_block(memoryview(value), blocks)
+        return SharedPayload(block.name, len(value), value_type.__name__)
+
+    if (
+        np is not None
+        and value_type is np.ndarray
+        and not value.dtype.hasobject
+        and value.nbytes >= min_size
+    ):
+        block = _to_block(memoryview(np.ascontiguousarray(value)), blocks)
+        return SharedPayload(
+            block.name, value.nbytes, "ndarray", value.dtype, value.shape
+        )
+
+    return value
+
+
+def restore(value: Any, blocks: List[SharedMemory]) -> Any:
+    """
+    Inverse of `share`, copying every `SharedPayload` back into a regular object.
+
+    Attached blocks are appended to `blocks`, the caller releases them with `release`.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {key: restore(item, blocks) for key, item in value.items()}
+    if value_type is list or value_type is tuple:
+        return value_type(restore(item, blocks) for item in value)
+    if value_type is not SharedPayload:
+        return value
+
+    block = SharedMemory(name=value.name)
+    blocks.append(block)
+    if value.kind == "ndarray":
+        if np is None:
+            raise ImportError("numpy is required to receive a shared array")
+        shared = np.ndarray(value.shape, dtype=value.dtype, buffer=block.buf)
+        array = shared.copy()
+        # The block can only be closed once no array points into it
+        del shared
+        return array
+
+    data = block.buf[: value.size]
+    try:
+        return bytearray(data) if value.kind == "bytearray" else bytes(data)
+    finally:
+        data.release()
+
+
+def _payloads(value: Any) -> Iterator[SharedPayload]:
+    value_type = type(value)
+    if value_type is dict:
+        for item in value.values():
+            yield from _payloads(item)
+    elif value_type is list or value_type is tuple:
+        for item in value:
+            yield from _payloads(item)
+    elif value_type is SharedPayload:
+        yield value
+
+
+def discard(value: Any) -> None:
+    """Unlink the blocks referenced by a payload that will never be restored, without reading them."""
+    blocks: List[SharedMemory] = []
+    for payload in _payloads(value):
+        try:
+            blocks.append(SharedMemory(name=payload.name))
+        except FileNotFoundError:
+            # Already released by the other side
+            pass
+    release(blocks, unlink=True)
+
+
+def release(blocks: List[SharedMemory], unlink: bool = False) -> None:
+    """Close shared memory blocks, and remove them when `unlink` is set."""
+    for block in blocks:
+        try:
+            block.close()
+            if unlink:
+                block.unlink()
+        except FileNotFoundError:
+            pass
+    blocks.clear()
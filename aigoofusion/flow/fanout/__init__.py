@@ -0,0 +1,3 @@
+from .map_spec import MapErrorMode, MapSpec
+
+__all__ = ["MapErrorMode", "MapSpec"]
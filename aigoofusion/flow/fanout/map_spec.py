@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, List, Optional, Union
+
+from aigoofusion.flow.node.node import NodeExecutor
+
+
+class MapErrorMode(Enum):
+    """What a map node does when one of its items fails."""
+
+    # Cancel the other items and fail the node
+    RAISE = "raise"
+    # Leave the item out of the results and go on
+    SKIP = "skip"
+
+
+@dataclass
+class MapSpec:
+    """
+    Settings of a map node, see `AIGooFlow.add_map`.
+
+    `items` is a state key holding the items, or None when the node function
+    produces them. `worker` is a function called with `item_param` set to an item,
+    or an `AIGooFlow` run with `item_key` set to an item.
+    """
+
+    items: Optional[str]
+    worker: Any
+    output_key: str
+    concurrency: int = 10
+    reducer: Optional[Callable[[List[Any]], Any]] = None
+    on_error: MapErrorMode = MapErrorMode.RAISE
+    max_failures: Optional[int] = None
+    errors_key: Optional[str] = None
+    item_param: Optional[str] = None
+    item_key: str = "item"
+    result_key: Optional[str] = None
+    item_timeout: Optional[float] = None
+    executor: NodeExecutor = NodeExecutor.INLINE
+    worker_is_async: bool = False
+
+    @property
+    def is_subflow(self) -> bool:
+        return self.item_param is None
+
+
+def map_error(index: int, item: Any, error: Union[BaseException, str]) -> dict:
+    """Failure record of one item, as written to `errors_key`."""
+    return {"index": index, "item": item, "error": str(error)}
@@ -0,0 +1,3 @@
+from .flow_hooks import FlowHooks
+
+__all__ = ["FlowHooks"]
@@ -0,0 +1,52 @@
+from typing import Any, Callable, Dict, List
+
+from aigoofusion.flow.context.run_context import RunContext
+
+
+class FlowHooks:
+    """
+    Callbacks registered on an `AIGooFlow`.
+
+    Hooks are plain sync callables called on the event loop, so they should be
+    cheap. An exception raised by a hook fails the run.
+
+    - `on_node_start(context, node)`
+    - `on_node_end(context, node, duration, updates)`, `duration` in seconds
+    - `on_edge(context, source, target)`, once per resolved transition
+    - `on_error(context, node, error)`
+    """
+
+    __slots__ = ("on_node_start", "on_node_end", "on_edge", "on_error")
+
+    def __init__(self):
+        self.on_node_start: List[Callable] = []
+        self.on_node_end: List[Callable] = []
+        self.on_edge: List[Callable] = []
+        self.on_error: List[Callable] = []
+
+    def add(self, event: str, callback: Callable) -> None:
+        if event not in self.__slots__:
+            raise ValueError(f"Unknown hook '{event}'")
+        getattr(self, event).append(callback)
+
+    def node_start(self, context: RunContext, node: str) -> None:
+        for callback in self.on_node_start:
+            callback(context, node)
+
+    def node_end(
+        self,
+        context: RunContext,
+        node: str,
+        duration: float,
+        updates: List[Dict[str, Any]],
+    ) -> None:
+        for callback in self.on_node_end:
+            callback(context, node, duration, updates)
+
+    def edge(self, context: RunContext, source: str, target: str) -> None:
+        for callback in self.on_edge:
+            callback(context, source, target)
+
+    def error(self, context: RunContext, node: str, error: Exception) -> None:
+        for callback in self.on_error:
+            callback(context, node, error)
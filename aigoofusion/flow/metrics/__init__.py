@@ -0,0 +1,4 @@
+from .histogram import LATENCY_BUCKETS, SIZE_BUCKETS, Histogram, percentile_from_buckets
+from .metrics_registry import MetricsRegistry
+
+__all__ = ["Histogram", "LATENCY_BUCKETS", "MetricsRegistry", "SIZE_BUCKETS", "percentile_from_buckets"]
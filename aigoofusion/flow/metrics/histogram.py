@@ -0,0 +1,75 @@
+import bisect
+from typing import Any, Dict, Optional, Sequence
+
+# Seconds, from fast pure-Python nodes up to slow model calls
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+# Counts, e.g. keys written by an update or nodes waiting in the queue
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+def percentile_from_buckets(buckets: Dict[str, int], fraction: float) -> Optional[float]:
+    """
+    Estimate a percentile from cumulative `le` buckets, as in `Histogram.cumulative`.
+
+    Interpolates linearly inside the bucket holding the percentile, like Prometheus'
+    `histogram_quantile`. Values in the `+Inf` bucket are reported as the last bound.
+
+    Args:
+        buckets (Dict[str, int]): Cumulative counts by upper bound.
+        fraction (float): Percentile as a fraction, e.g. 0.95.
+
+    Returns:
+        Optional[float]: The estimate, None without observations.
+    """
+    bounds = [(float(bound), count) for bound, count in buckets.items()]
+    total = bounds[-1][1] if bounds else 0
+    if not total:
+        return None
+
+    rank = fraction * total
+    lower, below = 0.0, 0
+    for upper, count in bounds:
+        if count >= rank:
+            if upper == float("inf"):
+                return lower
+            inside = count - below
+            return lower + (upper - lower) * ((rank - below) / inside if inside else 1.0)
+        lower, below = upper, count
+    return lower
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus semantics (cumulative `le` buckets)."""
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(sorted(bounds))
+        # One extra slot for observations above the last bound (+Inf)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> Dict[str, int]:
+        """Bucket counts keyed by their `le` label, the last one is `+Inf`."""
+        buckets: Dict[str, int] = {}
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            buckets["+Inf" if bound == float("inf") else repr(bound)] = total
+        return buckets
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Estimated percentile, see `percentile_from_buckets`."""
+        return percentile_from_buckets(self.cumulative(), fraction)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "sum": self.sum, "buckets": self.cumulative()}
@@ -0,0 +1,255 @@
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+from aigoofusion.flow.context.run_context import RunContext
+from aigoofusion.flow.metrics.histogram import LATENCY_BUCKETS, SIZE_BUCKETS, Histogram
+
+
+@dataclass
+class _NodeMetrics:
+    duration: Histogram
+    update_keys: Histogram
+    calls: int = 0
+    errors: int = 0
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    In-process metrics of workflow runs.
+
+    Pass it as `AIGooFlow(metrics=...)`, one registry can be shared by several
+    workflows. Keeps per node the number of calls and errors, a latency histogram
+    and a histogram of the number of keys each update writes, how often every edge
+    is taken, how speculative runs ended, how often nodes were retried, the state
+    and rejected calls of every circuit breaker, plus a histogram of the number of
+    nodes queued per scheduling wave and, with a `FlowScheduler`, histograms of the
+    time node calls waited for a slot per priority class.
+
+    Export with `to_dict()` or, for scraping, `to_prometheus()`.
+    """
+
+    def __init__(
+        self,
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS,
+    ):
+        self._latency_buckets = latency_buckets
+        self._size_buckets = size_buckets
+        self._nodes: Dict[str, _NodeMetrics] = {}
+        self._edges: Dict[Tuple[str, str], int] = {}
+        self._speculations: Dict[Tuple[str, str], int] = {}
+        self._queue_depth = Histogram(size_buckets)
+        self._queue_wait: Dict[str, Histogram] = {}
+        self._retries: Dict[str, int] = {}
+        self._breaker_states: Dict[str, str] = {}
+        self._breaker_rejections: Dict[str, int] = {}
+        # Runs on other threads' event loops may report at the same time
+        self._lock = threading.Lock()
+
+    def _node(self, node: str) -> _NodeMetrics:
+        metrics = self._nodes.get(node)
+        if metrics is None:
+            metrics = self._nodes[node] = _NodeMetrics(
+                duration=Histogram(self._latency_buckets),
+                update_keys=Histogram(self._size_buckets),
+            )
+        return metrics
+
+    def on_node_start(self, context: RunContext, node: str) -> None:
+        with self._lock:
+            self._node(node).calls += 1
+
+    def on_node_end(
+        self,
+        context: RunContext,
+        node: str,
+        duration: float,
+        updates: List[Dict[str, Any]],
+    ) -> None:
+        with self._lock:
+            metrics = self._node(node)
+            metrics.duration.observe(duration)
+            for update in updates:
+                metrics.update_keys.observe(len(update))
+
+    def on_error(self, context: RunContext, node: str, error: Exception) -> None:
+        with self._lock:
+            self._node(node).errors += 1
+
+    def on_edge(self, context: RunContext, source: str, target: str) -> None:
+        with self._lock:
+            self._edges[(source, target)] = self._edges.get((source, target), 0) + 1
+
+    def observe_speculation(self, node: str, outcome: str) -> None:
+        """Count a speculative run of `node` by outcome: `hit`, `wrong_branch`, `stale` or `failed`."""
+        with self._lock:
+            key = (node, outcome)
+            self._speculations[key] = self._speculations.get(key, 0) + 1
+
+    def observe_queue_depth(self, depth: int) -> None:
+        with self._lock:
+            self._queue_depth.observe(depth)
+
+    def observe_queue_wait(self, priority: str, seconds: float) -> None:
+        """Record how long a node call of `priority` waited for a `FlowScheduler` slot."""
+        with self._lock:
+            histogram = self._queue_wait.get(priority)
+            if histogram is None:
+                histogram = self._queue_wait[priority] = Histogram(self._latency_buckets)
+            histogram.observe(seconds)
+
+    def observe_retry(self, node: str) -> None:
+        """Count a failed attempt of `node` that is going to be retried."""
+        with self._lock:
+            self._retries[node] = self._retries.get(node, 0) + 1
+
+    def observe_breaker_state(self, breaker: str, state: str) -> None:
+        """Record the state of circuit breaker `breaker` after a call: `closed`, `open` or `half_open`."""
+        with self._lock:
+            self._breaker_states[breaker] = state
+
+    def observe_breaker_rejection(self, breaker: str) -> None:
+        """Count a call failed fast by open circuit breaker `breaker`."""
+        with self._lock:
+            self._breaker_states[breaker] = "open"
+            self._breaker_rejections[breaker] = self._breaker_rejections.get(breaker, 0) + 1
+
+    def reset(self) -> None:
+        """Drop everything recorded so far."""
+        with self._lock:
+            self._nodes.clear()
+            self._edges.clear()
+            self._speculations.clear()
+            self._queue_depth = Histogram(self._size_buckets)
+            self._queue_wait.clear()
+            self._retries.clear()
+            self._breaker_states.clear()
+            self._breaker_rejections.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Get the recorded metrics.
+
+        Returns:
+            Dict[str, Any]: `nodes` maps every node to its `calls`, `errors`,
+                `duration` and `update_keys`, `edges` maps source to target to the
+                number of traversals, `speculations` maps node to outcome to count,
+                `queue_depth` is the wave histogram, `queue_wait` maps priority class
+                to the histogram of scheduler wait times, `retries` maps node to the
+                number of retried attempts and `circuit_breakers` maps breaker name to
+                its last known `state` and its `rejections`.
+        """
+        with self._lock:
+            edges: Dict[str, Dict[str, int]] = {}
+            for (source, target), count in self._edges.items():
+                edges.setdefault(source, {})[target] = count
+            speculations: Dict[str, Dict[str, int]] = {}
+            for (node, outcome), count in self._speculations.items():
+                speculations.setdefault(node, {})[outcome] = count
+            return {
+                "nodes": {
+                    node: {
+                        "calls": metrics.calls,
+                        "errors": metrics.errors,
+                        "duration": metrics.duration.to_dict(),
+                        "update_keys": metrics.update_keys.to_dict(),
+                    }
+                    for node, metrics in self._nodes.items()
+                },
+                "edges": edges,
+                "speculations": speculations,
+                "queue_depth": self._queue_depth.to_dict(),
+                "queue_wait": {
+                    priority: histogram.to_dict()
+                    for priority, histogram in self._queue_wait.items()
+                },
+                "retries": dict(self._retries),
+                "circuit_breakers": {
+                    breaker: {
+                        "state": state,
+                        "rejections": self._breaker_rejections.get(breaker, 0),
+                    }
+                    for breaker, state in self._breaker_states.items()
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "aigooflow") -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def histogram(name: str, values: Histogram, labels: str):
+            separator = "," if labels else ""
+            for bound, count in values.cumulative().items():
+                lines.append(
+                    f'{prefix}_{name}_bucket{{{labels}{separator}le="{bound}"}} {count}'
+                )
+            braces = f"{{{labels}}}" if labels else ""
+            lines.append(f"{prefix}_{name}_sum{braces} {values.sum}")
+            lines.append(f"{prefix}_{name}_count{braces} {values.count}")
+
+        with self._lock:
+            nodes = [(f'node="{_label(node)}"', metrics) for node, metrics in self._nodes.items()]
+
+            header("node_calls_total", "counter", "Number of node executions started.")
+            for labels, metrics in nodes:
+                lines.append(f"{prefix}_node_calls_total{{{labels}}} {metrics.calls}")
+
+            header("node_errors_total", "counter", "Number of node executions that failed.")
+            for labels, metrics in nodes:
+                lines.append(f"{prefix}_node_errors_total{{{labels}}} {metrics.errors}")
+
+            header("node_duration_seconds", "histogram", "Duration of successful node executions.")
+            for labels, metrics in nodes:
+                histogram("node_duration_seconds", metrics.duration, labels)
+
+            header("state_update_keys", "histogram", "Number of state keys written per node update.")
+            for labels, metrics in nodes:
+                histogram("state_update_keys", metrics.update_keys, labels)
+
+            header("edge_traversals_total", "counter", "Number of times an edge was taken.")
+            for (source, target), count in self._edges.items():
+                lines.append(
+                    f'{prefix}_edge_traversals_total{{source="{_label(source)}",target="{_label(target)}"}} {count}'
+                )
+
+            header("speculations_total", "counter", "Number of speculative node runs by outcome.")
+            for (node, outcome), count in self._speculations.items():
+                lines.append(
+                    f'{prefix}_speculations_total{{node="{_label(node)}",outcome="{outcome}"}} {count}'
+                )
+
+            header("queue_depth", "histogram", "Number of nodes queued per scheduling wave.")
+            histogram("queue_depth", self._queue_depth, "")
+
+            header("queue_wait_seconds", "histogram", "Time node calls waited for a scheduler slot.")
+            for priority, values in self._queue_wait.items():
+                histogram("queue_wait_seconds", values, f'priority="{_label(priority)}"')
+
+            header("node_retries_total", "counter", "Number of failed node attempts that were retried.")
+            for node, count in self._retries.items():
+                lines.append(f'{prefix}_node_retries_total{{node="{_label(node)}"}} {count}')
+
+            header("circuit_breaker_state", "gauge", "Circuit breaker state, 1 for the current one.")
+            for breaker, current in self._breaker_states.items():
+                for state in ("closed", "open", "half_open"):
+                    lines.append(
+                        f'{prefix}_circuit_breaker_state{{breaker="{_label(breaker)}",state="{state}"}} '
+                        f"{int(state == current)}"
+                    )
+
+            header("circuit_breaker_rejections_total", "counter", "Number of calls failed fast by an open breaker.")
+            for breaker, count in self._breaker_rejections.items():
+                lines.append(
+                    f'{prefix}_circuit_breaker_rejections_total{{breaker="{_label(breaker)}"}} {count}'
+                )
+
+        return "\n".join(lines) + "\n"
@@ -1,3 +1,3 @@
-from .node import Node, NodeType, START, END
+from .node import Node, NodeType, NodeExecutor, START, END
 
-__all__ = ["Node", "NodeType", "START", "END"]
+__all__ = ["Node", "NodeType", "NodeExecutor", "START", "END"]
@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Callable, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from aigoofusion.flow.cache.node_cache import NodeCache
 
 
 class NodeType(Enum):
@@ -8,6 +10,17 @@ class NodeType(Enum):
     END = "end"
     FUNCTION = "function"
     CONDITIONAL = "conditional"
+    SUBFLOW = "subflow"
+    MAP = "map"
+
+
+class NodeExecutor(Enum):
+    """Where a node function or condition runs."""
+
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+    REMOTE = "remote"
 
 
 # Special node identifiers
@@ -17,9 +30,37 @@ END = "END"
 
 @dataclass
 class Node:
+    """
+    Workflow node.
+
+    The call plan (`inject`, `wants_state`, `is_async`, `is_async_gen` and
+    `output_key`) is worked out once by `AIGooFlow.add_node`, so running the
+    node needs no reflection.
+    """
+
     name: str
     node_type: NodeType
     func: Optional[Callable] = None
     inputs: List[str] = field(default_factory=list)
     outputs: List[str] = field(default_factory=list)
     stream: bool = field(default=False)
+    readonly: bool = field(default=False)
+    inject: Tuple[str, ...] = field(default=())
+    wants_state: bool = field(default=False)
+    is_async: bool = field(default=False)
+    is_async_gen: bool = field(default=False)
+    output_key: Optional[str] = field(default=None)
+    cache: Optional[NodeCache] = field(default=None)
+    timeout: Optional[float] = field(default=None)
+    executor: NodeExecutor = field(default=NodeExecutor.INLINE)
+    # Embedded `AIGooFlow` and the keys mapped into and out of it, see `AIGooFlow.add_subflow`
+    subflow: Optional[Any] = field(default=None)
+    input_map: Dict[str, str] = field(default_factory=dict)
+    output_map: Dict[str, str] = field(default_factory=dict)
+    # Fan-out settings (`MapSpec`), see `AIGooFlow.add_map`
+    mapper: Optional[Any] = field(default=None)
+    # Predecessors to wait for before running, "all" or a count. None runs on every arrival
+    join: Optional[Union[str, int]] = field(default=None)
+    # `RetryPolicy` and `CircuitBreaker` the node is called under
+    retry: Optional[Any] = field(default=None)
+    circuit_breaker: Optional[Any] = field(default=None)
@@ -0,0 +1,13 @@
+from .execution_plan import (
+    DuplicateExecutionWarning,
+    ExecutionPlan,
+    UnreachableNodeWarning,
+    UnsatisfiableJoinWarning,
+)
+
+__all__ = [
+    "DuplicateExecutionWarning",
+    "ExecutionPlan",
+    "UnreachableNodeWarning",
+    "UnsatisfiableJoinWarning",
+]
@@ -0,0 +1,293 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Sequence, Set, Tuple
+
+from aigoofusion.flow.edge.edge import Edge
+from aigoofusion.flow.node.node import END, START, Node
+
+
+class DuplicateExecutionWarning(UserWarning):
+    """A node without `join` can be reached from several predecessors and run once per arrival."""
+
+
+class UnsatisfiableJoinWarning(UserWarning):
+    """A join node waits for predecessors that exclusive conditional branches lead to."""
+
+
+class UnreachableNodeWarning(UserWarning):
+    """A node has no path from START and never runs."""
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """
+    Immutable, pre-indexed view of a workflow graph.
+
+    Built once by `AIGooFlow.compile()` and reused by every run, so finding the
+    successors of a node costs O(out-degree) instead of a scan over all edges.
+
+    Attributes:
+        nodes: Node lookup by name.
+        outgoing: Edges indexed by source, in the order they were added.
+        successors: Targets of plain (unconditional) edges indexed by source.
+        conditional_edges: Conditional edges indexed by source.
+        speculative_edges: Speculative conditional edges indexed by source.
+        levels: Topological levels of the graph. Nodes that are part of the same
+            cycle share a level.
+        cycles: Groups of nodes that form a cycle.
+        unreachable: Nodes that can not be reached from START.
+        joins: Join nodes with the number of predecessors they wait for and the
+            predecessors that count. Edges that close a loop do not count.
+        join_resets: Loop-closing edges with the join nodes of the loop, whose
+            waiting starts over when the edge is taken.
+        duplicate_risks: Nodes without `join` that more than one predecessor of the
+            same run can lead to, outside of loops. Predecessors on exclusive
+            conditional branches do not count.
+        unsatisfiable_joins: Join nodes that no single node reaches enough of the
+            predecessors of over plain edges, so that the predecessors they wait for
+            are behind conditional edges that may never all be taken.
+    """
+
+    nodes: Mapping[str, Node]
+    outgoing: Mapping[str, Tuple[Edge, ...]]
+    successors: Mapping[str, Tuple[str, ...]]
+    conditional_edges: Mapping[str, Tuple[Edge, ...]]
+    speculative_edges: Mapping[str, Tuple[Edge, ...]]
+    levels: Tuple[Tuple[str, ...], ...]
+    cycles: Tuple[Tuple[str, ...], ...]
+    unreachable: FrozenSet[str]
+    joins: Mapping[str, Tuple[int, FrozenSet[str]]]
+    join_resets: Mapping[Tuple[str, str], FrozenSet[str]]
+    duplicate_risks: Tuple[str, ...]
+    unsatisfiable_joins: Tuple[str, ...]
+
+    @property
+    def is_cyclic(self) -> bool:
+        """Whether the graph has at least one cycle."""
+        return bool(self.cycles)
+
+    @classmethod
+    def build(cls, nodes: Dict[str, Node], edges: List[Edge]) -> "ExecutionPlan":
+        """
+        Index `nodes` and `edges` into a new plan.
+
+        Raises:
+            ValueError: When a join node waits for more predecessors than it has.
+        """
+        outgoing: Dict[str, List[Edge]] = {}
+        successors: Dict[str, List[str]] = {}
+        conditional_edges: Dict[str, List[Edge]] = {}
+        adjacency: Dict[str, List[str]] = {name: [] for name in nodes}
+
+        for edge in edges:
+            outgoing.setdefault(edge.source, []).append(edge)
+            if edge.condition is None:
+                successors.setdefault(edge.source, []).extend(edge.targets)
+            else:
+                conditional_edges.setdefault(edge.source, []).append(edge)
+            for target in edge.targets:
+                if target not in adjacency[edge.source]:
+                    adjacency[edge.source].append(target)
+
+        components = _strongly_connected_components(adjacency)
+        cycles = tuple(
+            tuple(component)
+            for component in components
+            if len(component) > 1 or component[0] in adjacency[component[0]]
+        )
+
+        # Loop-closing edges re-enter a node, they are not another branch joining it
+        back_edges = _back_edges(adjacency, START)
+        predecessors: Dict[str, Set[str]] = {}
+        for source, targets in adjacency.items():
+            for target in targets:
+                if (source, target) not in back_edges:
+                    predecessors.setdefault(target, set()).add(source)
+
+        # Nodes each node leads to without a branch choice, built on first use
+        plain_reach: Dict[str, FrozenSet[str]] = {}
+
+        def can_reach(sources: FrozenSet[str], count: int) -> bool:
+            """Whether one node leads to `count` of `sources` over plain edges, so they can all run."""
+            for root in adjacency:
+                if root not in plain_reach:
+                    plain_reach[root] = _reachable(successors, root)
+                if len(sources & plain_reach[root]) >= count:
+                    return True
+            return False
+
+        joins: Dict[str, Tuple[int, FrozenSet[str]]] = {}
+        duplicate_risks = []
+        for name, node in nodes.items():
+            sources = frozenset(predecessors.get(name, ()))
+            if node.join is None:
+                # Predecessors on exclusive conditional branches never both run
+                if len(sources) > 1 and name != END and can_reach(sources, 2):
+                    duplicate_risks.append(name)
+                continue
+            if not sources:
+                raise ValueError(f"Join node '{name}' has no incoming edges")
+            required = len(sources) if node.join == "all" else node.join
+            if not 1 <= required <= len(sources):  # type: ignore
+                raise ValueError(
+                    f"Join node '{name}' waits for {required} of its "
+                    f"{len(sources)} predecessors"
+                )
+            joins[name] = (required, sources)  # type: ignore
+
+        component_of = {
+            name: position
+            for position, component in enumerate(components)
+            for name in component
+        }
+        join_resets = {}
+        for source, target in back_edges:
+            loop = components[component_of[target]]
+            if reset := frozenset(name for name in loop if name in joins):
+                join_resets[(source, target)] = reset
+
+        return cls(
+            nodes=MappingProxyType(dict(nodes)),
+            outgoing=MappingProxyType(
+                {source: tuple(items) for source, items in outgoing.items()}
+            ),
+            successors=MappingProxyType(
+                {source: tuple(items) for source, items in successors.items()}
+            ),
+            conditional_edges=MappingProxyType(
+                {source: tuple(items) for source, items in conditional_edges.items()}
+            ),
+            speculative_edges=MappingProxyType(
+                {
+                    source: speculative
+                    for source, items in conditional_edges.items()
+                    if (speculative := tuple(edge for edge in items if edge.speculative))
+                }
+            ),
+            levels=_topological_levels(adjacency, components),
+            cycles=cycles,
+            unreachable=frozenset(adjacency) - _reachable(adjacency, START),
+            joins=MappingProxyType(joins),
+            join_resets=MappingProxyType(join_resets),
+            duplicate_risks=tuple(duplicate_risks),
+            unsatisfiable_joins=tuple(
+                name
+                for name, (required, sources) in joins.items()
+                if not can_reach(sources, required)
+            ),
+        )
+
+
+def _reachable(adjacency: Mapping[str, Sequence[str]], root: str) -> FrozenSet[str]:
+    """Nodes reachable from `root`, including `root` itself."""
+    seen = {root}
+    stack = [root]
+    while stack:
+        for target in adjacency.get(stack.pop(), ()):
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return frozenset(seen)
+
+
+def _back_edges(adjacency: Dict[str, List[str]], root: str) -> FrozenSet[Tuple[str, str]]:
+    """Edges that lead back to a node on the current path of a depth-first walk from `root`."""
+    back = set()
+    on_path = {root}
+    seen = {root}
+    work = [(root, iter(adjacency[root]))]
+    while work:
+        node, targets = work[-1]
+        for target in targets:
+            if target in on_path:
+                back.add((node, target))
+            elif target not in seen:
+                seen.add(target)
+                on_path.add(target)
+                work.append((target, iter(adjacency[target])))
+                break
+        else:
+            work.pop()
+            on_path.discard(node)
+    return frozenset(back)
+
+
+def _strongly_connected_components(
+    adjacency: Dict[str, List[str]],
+) -> List[List[str]]:
+    """Iterative Tarjan's algorithm, components are returned in reverse topological order."""
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+
+    for root in adjacency:
+        if root in index:
+            continue
+        work = [(root, iter(adjacency[root]))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, targets = work[-1]
+            advanced = False
+            for target in targets:
+                if target not in index:
+                    index[target] = lowlink[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(adjacency[target])))
+                    advanced = True
+                    break
+                if target in on_stack:
+                    lowlink[node] = min(lowlink[node], index[target])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component[::-1])
+
+    return components
+
+
+def _topological_levels(
+    adjacency: Dict[str, List[str]], components: List[List[str]]
+) -> Tuple[Tuple[str, ...], ...]:
+    """Longest-path levels of the condensed (acyclic) graph."""
+    component_of = {
+        node: position
+        for position, component in enumerate(components)
+        for node in component
+    }
+    depth = [0] * len(components)
+
+    # Tarjan yields sinks first, so walking backwards visits sources first.
+    for position in range(len(components) - 1, -1, -1):
+        for node in components[position]:
+            for target in adjacency[node]:
+                target_position = component_of[target]
+                if target_position != position:
+                    depth[target_position] = max(
+                        depth[target_position], depth[position] + 1
+                    )
+
+    levels: List[List[str]] = [[] for _ in range(max(depth, default=-1) + 1)]
+    for name in adjacency:
+        levels[depth[component_of[name]]].append(name)
+    return tuple(tuple(level) for level in levels)
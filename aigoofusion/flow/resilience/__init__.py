@@ -0,0 +1,4 @@
+from .retry_policy import RetryPolicy, is_transient_error
+from .circuit_breaker import CircuitBreaker, CircuitState
+
+__all__ = ["RetryPolicy", "is_transient_error", "CircuitBreaker", "CircuitState"]
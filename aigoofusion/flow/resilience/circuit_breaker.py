@@ -0,0 +1,157 @@
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+from aigoofusion.exception.aigoo_circuit_open_exception import AIGooCircuitOpenException
+from aigoofusion.exception.aigoo_limit_exception import AIGooLimitException
+
+
+class CircuitState(Enum):
+    """State of a `CircuitBreaker`."""
+
+    # Calls go through, failures are counted
+    CLOSED = "closed"
+    # Calls fail fast until `recovery_timeout` has passed
+    OPEN = "open"
+    # A few trial calls decide whether to close or open again
+    HALF_OPEN = "half_open"
+
+
+def _counts_as_failure(error: BaseException) -> bool:
+    # Run limits and cancellations say nothing about the dependency
+    if isinstance(error, AIGooLimitException):
+        return error.reason == "node_timeout"
+    return not isinstance(error, AIGooCircuitOpenException)
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast while the dependency behind them is down.
+
+    After `failure_threshold` failures in a row the breaker opens and every call
+    raises `AIGooCircuitOpenException` without running. Once `recovery_timeout`
+    has passed it lets `half_open_max_calls` trial calls through: a success closes
+    it, a failure opens it again.
+
+    Give it to `AIGooFlow.add_node(circuit_breaker=...)`. One breaker can guard
+    several nodes, or workflows, that use the same resource, e.g. one model
+    provider. It is thread-safe.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        is_failure: Optional[Callable[[BaseException], bool]] = None,
+    ):
+        """CircuitBreaker
+
+        Args:
+            name (str): Name of the guarded resource, used in errors and metrics.
+            failure_threshold (int, optional): Failures in a row that open the breaker. Defaults to 5.
+            recovery_timeout (float, optional): Seconds the breaker stays open. Defaults to 30.0.
+            half_open_max_calls (int, optional): Trial calls let through at the same time once the
+                timeout has passed. Defaults to 1.
+            is_failure (Optional[Callable[[BaseException], bool]], optional): Which errors count as a
+                failure of the resource. Defaults to every error except run limits and cancellation.
+
+        Raises:
+            ValueError: On an invalid setting.
+        """
+        if failure_threshold < 1:
+            raise ValueError("`failure_threshold` must be at least 1")
+        if half_open_max_calls < 1:
+            raise ValueError("`half_open_max_calls` must be at least 1")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.is_failure = is_failure or _counts_as_failure
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def allow(self) -> None:
+        """
+        Reserve a call, to be followed by `record_success`, `record_failure` or `release`.
+
+        Raises:
+            AIGooCircuitOpenException: While the breaker is open or its trial calls are taken.
+        """
+        with self._lock:
+            state = self._current_state()
+            if state is CircuitState.CLOSED:
+                return
+            if state is CircuitState.HALF_OPEN and self._trials < self.half_open_max_calls:
+                self._trials += 1
+                return
+            retry_after = max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+        raise AIGooCircuitOpenException(
+            f"Circuit breaker '{self.name}' is open, retry in {retry_after:.1f}s",
+            breaker=self.name,
+            retry_after=retry_after,
+        )
+
+    def record_success(self) -> None:
+        """Close the breaker, the resource answered."""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+            self._trials = 0
+
+    def record_failure(self, error: BaseException) -> None:
+        """
+        Count a failed call.
+
+        Errors that are not failures of the resource, e.g. a run deadline or a
+        cancellation, only give back the reserved call: the resource did not prove
+        it is healthy either.
+        """
+        if not self.is_failure(error):
+            self.release()
+            return
+        with self._lock:
+            state = self._current_state()
+            self._failures += 1
+            if state is CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                self._trials = 0
+
+    def release(self) -> None:
+        """Give back a reserved call that ended without a verdict, e.g. when it was cancelled."""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN and self._trials:
+                self._trials -= 1
+
+    def reset(self) -> None:
+        """Close the breaker and forget the failures."""
+        self.record_success()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self._current_state().value,
+                "failures": self._failures,
+            }
@@ -0,0 +1,141 @@
+import random
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple, Type, Union
+
+from aigoofusion.exception.aigoo_circuit_open_exception import AIGooCircuitOpenException
+from aigoofusion.exception.aigoo_limit_exception import AIGooLimitException
+
+# HTTP statuses of overloaded or briefly unavailable providers
+TRANSIENT_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504, 529})
+
+# Exception class names (OpenAI, Anthropic, httpx, botocore) and Bedrock error codes
+# of temporary failures, matched by name so no provider SDK has to be installed
+TRANSIENT_ERROR_NAMES = frozenset(
+    {
+        "RateLimitError",
+        "APITimeoutError",
+        "APIConnectionError",
+        "InternalServerError",
+        "ServiceUnavailableError",
+        "OverloadedError",
+        "ReadTimeout",
+        "ConnectTimeout",
+        "ReadTimeoutError",
+        "ConnectTimeoutError",
+        "EndpointConnectionError",
+        "ThrottlingException",
+        "TooManyRequestsException",
+        "ServiceUnavailableException",
+        "ModelNotReadyException",
+        "InternalServerException",
+    }
+)
+
+
+def _causes(error: Optional[BaseException]):
+    """`error` and the errors it wraps, model classes re-raise provider errors as `AIGooException`."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def _is_run_limit(error: BaseException) -> bool:
+    # A node timeout is worth another attempt, the run deadline, step budget or
+    # a cancellation is not
+    if isinstance(error, AIGooLimitException):
+        return error.reason != "node_timeout"
+    return isinstance(error, AIGooCircuitOpenException)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether `error`, or an error it wraps, looks like a temporary failure of a provider."""
+    for cause in _causes(error):
+        if _is_run_limit(cause):
+            return False
+        if isinstance(cause, (TimeoutError, ConnectionError, AIGooLimitException)):
+            return True
+        status = getattr(cause, "status_code", None) or getattr(cause, "status", None)
+        if isinstance(status, int) and status in TRANSIENT_STATUS_CODES:
+            return True
+        response = getattr(cause, "response", None)
+        if isinstance(response, dict):
+            # botocore `ClientError`
+            code = response.get("Error", {}).get("Code")
+            if code in TRANSIENT_ERROR_NAMES:
+                return True
+        if type(cause).__name__ in TRANSIENT_ERROR_NAMES:
+            return True
+    return False
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked to wait in a `Retry-After` header, None when it did not."""
+    for cause in _causes(error):
+        headers = getattr(getattr(cause, "response", None), "headers", None)
+        if headers is None:
+            continue
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    When and how often a failed node is called again, see `AIGooFlow.add_node`.
+
+    Attempt `n` waits `initial_delay * multiplier ** (n - 1)`, capped at `max_delay`,
+    before the next one. With `jitter` the wait is drawn uniformly between zero and
+    that value, so clients throttled together do not retry together. A `Retry-After`
+    sent by the provider is honoured up to `max_delay`.
+
+    Attributes:
+        max_attempts: Calls in total, including the first one.
+        initial_delay: Seconds to wait after the first failure.
+        max_delay: Longest wait between two attempts.
+        multiplier: Growth of the wait per attempt.
+        jitter: Randomize the waits.
+        retry_on: Exception types, or a predicate, of the errors worth retrying.
+            Defaults to `is_transient_error`: timeouts, connection errors, 429 and 5xx.
+    """
+
+    max_attempts: int = 3
+    initial_delay: float = 0.5
+    max_delay: float = 30.0
+    multiplier: float = 2.0
+    jitter: bool = True
+    retry_on: Union[
+        Tuple[Type[BaseException], ...], Callable[[BaseException], bool], None
+    ] = None
+
+    def __post_init__(self):
+        if self.max_attempts < 1:
+            raise ValueError("`max_attempts` must be at least 1")
+        if self.initial_delay < 0 or self.max_delay < 0:
+            raise ValueError("Retry delays can not be negative")
+        if self.multiplier < 1:
+            raise ValueError("`multiplier` must be at least 1")
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Whether a call that failed with `error` should be attempted again."""
+        if _is_run_limit(error):
+            return False
+        if self.retry_on is None:
+            return is_transient_error(error)
+        if isinstance(self.retry_on, tuple):
+            return isinstance(error, self.retry_on)
+        return bool(self.retry_on(error))
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """Seconds to wait after attempt number `attempt` (from 1) failed with `error`."""
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        requested = retry_after(error) if error is not None else None
+        if requested is not None:
+            delay = max(delay, min(requested, self.max_delay))
+        return delay
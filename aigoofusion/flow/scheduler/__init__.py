@@ -0,0 +1,4 @@
+from .flow_scheduler import FlowScheduler
+from .priority import Priority
+
+__all__ = ["FlowScheduler", "Priority"]
@@ -0,0 +1,254 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+from aigoofusion.flow.scheduler.priority import Priority
+
+
+@dataclass
+class _Waiter:
+    node: str
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    start: float = 0.0
+    granted: bool = False
+    cancelled: bool = False
+
+
+@dataclass
+class _PriorityQueue:
+    """Waiters of one priority class, ordered by weighted fair queuing across tenants."""
+
+    heap: List[Tuple[float, int, _Waiter]] = field(default_factory=list)
+    virtual_time: float = 0.0
+    # Virtual finish time of the last request of every tenant
+    finish: Dict[str, float] = field(default_factory=dict)
+
+
+class FlowScheduler:
+    """
+    Admits node calls of every run that shares it, by priority and fairly per tenant.
+
+    Pass the same scheduler to every `AIGooFlow` of the process. A node call that
+    would exceed `max_concurrency` or the limit of its node waits in a queue. Free
+    slots go to the highest `Priority` class first. Within a class, tenants share
+    them by weight with weighted fair queuing, earliest virtual finish time first, so
+    a tenant with a large batch gets its share but does not hold up the others. Calls
+    of one tenant keep their order.
+
+    Thread-safe, runs on different event loops can share one scheduler.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        node_limits: Optional[Dict[str, int]] = None,
+        tenant_weights: Optional[Dict[str, float]] = None,
+    ):
+        """FlowScheduler
+
+        Args:
+            max_concurrency (Optional[int], optional): Node calls running at the same time
+                across all runs. Defaults to None (no limit).
+            node_limits (Optional[Dict[str, int]], optional): Node name to the calls of that
+                node running at the same time, e.g. `{"llm": 20}`. Defaults to None.
+            tenant_weights (Optional[Dict[str, float]], optional): Tenant to its share of the
+                slots relative to other tenants, 1 for tenants not listed. Defaults to None.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("`max_concurrency` must be at least 1 or None")
+
+        self.max_concurrency = max_concurrency
+        self._node_limits: Dict[str, int] = {}
+        self._tenant_weights: Dict[str, float] = {}
+        self._running = 0
+        self._running_nodes: Dict[str, int] = {}
+        self._queues: Dict[Priority, _PriorityQueue] = {
+            priority: _PriorityQueue()
+            for priority in sorted(Priority, key=lambda item: item.rank)
+        }
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+        for node, limit in (node_limits or {}).items():
+            self.set_node_limit(node, limit)
+        for tenant, weight in (tenant_weights or {}).items():
+            self.set_tenant_weight(tenant, weight)
+
+    def set_node_limit(self, node: str, limit: Optional[int]) -> None:
+        """Limit the concurrent calls of `node`, None removes the limit."""
+        if limit is not None and limit < 1:
+            raise ValueError("A node limit must be at least 1 or None")
+        with self._lock:
+            if limit is None:
+                self._node_limits.pop(node, None)
+            else:
+                self._node_limits[node] = limit
+            granted = self._dispatch()
+        self._wake(granted)
+
+    def set_tenant_weight(self, tenant: str, weight: float) -> None:
+        """Set the share of `tenant`, e.g. 2 gets twice the slots of a tenant with 1."""
+        if weight <= 0:
+            raise ValueError("A tenant weight must be greater than 0")
+        with self._lock:
+            self._tenant_weights[tenant] = weight
+
+    @property
+    def running(self) -> int:
+        """Node calls holding a slot."""
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        """Node calls waiting for a slot."""
+        with self._lock:
+            return sum(
+                1
+                for queue in self._queues.values()
+                for _, _, waiter in queue.heap
+                if not waiter.cancelled
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Running calls per node and queued calls per priority class."""
+        with self._lock:
+            return {
+                "running": self._running,
+                "running_nodes": dict(self._running_nodes),
+                "queued": {
+                    priority.value: sum(
+                        1 for _, _, waiter in queue.heap if not waiter.cancelled
+                    )
+                    for priority, queue in self._queues.items()
+                },
+            }
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        node: str,
+        priority: Union[Priority, str] = Priority.NORMAL,
+        tenant: Optional[str] = None,
+    ) -> AsyncIterator[float]:
+        """
+        Hold a slot for a call of `node` while the block runs.
+
+        Yields:
+            float: Seconds spent waiting for the slot.
+        """
+        waited = await self.acquire(node, priority, tenant)
+        try:
+            yield waited
+        finally:
+            self.release(node)
+
+    async def acquire(
+        self,
+        node: str,
+        priority: Union[Priority, str] = Priority.NORMAL,
+        tenant: Optional[str] = None,
+    ) -> float:
+        """
+        Wait for a slot for a call of `node`, pair with `release`.
+
+        Returns:
+            float: Seconds spent waiting for the slot.
+        """
+        priority = Priority(priority)
+        with self._lock:
+            if self._has_capacity(node):
+                self._take(node)
+                return 0.0
+
+            loop = asyncio.get_running_loop()
+            waiter = _Waiter(node=node, loop=loop, future=loop.create_future())
+            self._enqueue(waiter, self._queues[priority], tenant or "")
+
+        queued_at = time.perf_counter()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    waiter.cancelled = True
+                    raise
+            # Granted while being cancelled, hand the slot on
+            self.release(node)
+            raise
+        return time.perf_counter() - queued_at
+
+    def release(self, node: str) -> None:
+        """Free the slot of a finished call of `node`."""
+        with self._lock:
+            self._running -= 1
+            remaining = self._running_nodes[node] - 1
+            if remaining:
+                self._running_nodes[node] = remaining
+            else:
+                del self._running_nodes[node]
+            granted = self._dispatch()
+        self._wake(granted)
+
+    def _has_capacity(self, node: str) -> bool:
+        if self.max_concurrency is not None and self._running >= self.max_concurrency:
+            return False
+        limit = self._node_limits.get(node)
+        return limit is None or self._running_nodes.get(node, 0) < limit
+
+    def _take(self, node: str) -> None:
+        self._running += 1
+        self._running_nodes[node] = self._running_nodes.get(node, 0) + 1
+
+    def _enqueue(self, waiter: _Waiter, queue: _PriorityQueue, tenant: str) -> None:
+        # Every call costs 1, a tenant's calls are spaced 1 / weight apart
+        start = max(queue.virtual_time, queue.finish.get(tenant, 0.0))
+        queue.finish[tenant] = start + 1 / self._tenant_weights.get(tenant, 1.0)
+        waiter.start = start
+        heapq.heappush(queue.heap, (queue.finish[tenant], next(self._sequence), waiter))
+
+    def _dispatch(self) -> List[_Waiter]:
+        """Grant free slots to queued calls, highest priority and earliest finish first."""
+        granted: List[_Waiter] = []
+        for queue in self._queues.values():
+            blocked = []
+            while queue.heap and (
+                self.max_concurrency is None or self._running < self.max_concurrency
+            ):
+                item = heapq.heappop(queue.heap)
+                waiter = item[2]
+                if waiter.cancelled:
+                    continue
+                if not self._has_capacity(waiter.node):
+                    # Its node is at its limit, calls of other nodes may still go
+                    blocked.append(item)
+                    continue
+                self._take(waiter.node)
+                waiter.granted = True
+                queue.virtual_time = waiter.start
+                granted.append(waiter)
+            for item in blocked:
+                heapq.heappush(queue.heap, item)
+            if not queue.heap:
+                # Idle, nobody is owed anything
+                queue.virtual_time = 0.0
+                queue.finish.clear()
+        return granted
+
+    def _wake(self, granted: List[_Waiter]) -> None:
+        for waiter in granted:
+            try:
+                waiter.loop.call_soon_threadsafe(_resolve, waiter.future)
+            except RuntimeError:
+                # Its event loop is closed, nobody is left to use the slot
+                self.release(waiter.node)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
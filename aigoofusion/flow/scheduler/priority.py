@@ -0,0 +1,17 @@
+from enum import Enum
+
+
+class Priority(Enum):
+    """Priority class of a run. Queued nodes of a higher class always go first."""
+
+    INTERACTIVE = "interactive"
+    NORMAL = "normal"
+    BATCH = "batch"
+
+    @property
+    def rank(self) -> int:
+        """Position in the scheduling order, 0 goes first."""
+        return _RANKS[self]
+
+
+_RANKS = {Priority.INTERACTIVE: 0, Priority.NORMAL: 1, Priority.BATCH: 2}
@@ -0,0 +1,4 @@
+from .branch_predictor import BranchPredictor
+from .speculative_run import SpeculativeRun
+
+__all__ = ["BranchPredictor", "SpeculativeRun"]
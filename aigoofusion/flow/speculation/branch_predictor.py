@@ -0,0 +1,94 @@
+from typing import Any, Dict, List, Sequence, Union
+
+from aigoofusion.flow.metrics.metrics_registry import MetricsRegistry
+
+
+class BranchPredictor:
+    """
+    Predicts the targets of conditional edges from the targets they took before.
+
+    `AIGooFlow` records every decision of a speculative conditional edge. Seed it
+    with edge statistics collected elsewhere, e.g. in production, with `load`.
+    """
+
+    def __init__(
+        self,
+        min_samples: int = 10,
+        min_probability: float = 0.6,
+        max_targets: int = 1,
+    ):
+        """BranchPredictor
+
+        Args:
+            min_samples (int, optional): Decisions a source needs before anything is predicted
+                for it. Defaults to 10.
+            min_probability (float, optional): Share of the decisions a target needs to be
+                predicted. Defaults to 0.6.
+            max_targets (int, optional): Most targets predicted at once. Defaults to 1.
+        """
+        if not 0 < min_probability <= 1:
+            raise ValueError("`min_probability` must be in (0, 1]")
+        if max_targets < 1:
+            raise ValueError("`max_targets` must be at least 1")
+
+        self.min_samples = min_samples
+        self.min_probability = min_probability
+        self.max_targets = max_targets
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._totals: Dict[str, int] = {}
+
+    def record(self, source: str, target: str, count: int = 1) -> None:
+        """Record that `source` continued with `target`."""
+        targets = self._counts.setdefault(source, {})
+        targets[target] = targets.get(target, 0) + count
+        self._totals[source] = self._totals.get(source, 0) + count
+
+    def probability(self, source: str, target: str) -> float:
+        """Share of the decisions of `source` that went to `target`."""
+        total = self._totals.get(source, 0)
+        if not total:
+            return 0.0
+        return self._counts[source].get(target, 0) / total
+
+    def predict(self, source: str, targets: Sequence[str]) -> List[str]:
+        """
+        Get the likely next nodes of `source` among `targets`, most likely first.
+
+        Returns:
+            List[str]: Empty until `source` has `min_samples` decisions.
+        """
+        total = self._totals.get(source, 0)
+        if total < self.min_samples:
+            return []
+        counts = self._counts[source]
+        likely = [
+            target
+            for target in targets
+            if counts.get(target, 0) / total >= self.min_probability
+        ]
+        likely.sort(key=lambda target: counts.get(target, 0), reverse=True)
+        return likely[: self.max_targets]
+
+    def load(self, metrics: Union[MetricsRegistry, Dict[str, Any]]) -> None:
+        """
+        Add edge statistics to the recorded decisions.
+
+        Args:
+            metrics (Union[MetricsRegistry, Dict[str, Any]]): A registry, or the `to_dict()`
+                output of a registry or a predictor. Only its `edges` are used.
+        """
+        data = metrics.to_dict() if isinstance(metrics, MetricsRegistry) else metrics
+        for source, targets in data.get("edges", {}).items():
+            for target, count in targets.items():
+                self.record(source, target, count)
+
+    def reset(self) -> None:
+        """Forget every recorded decision."""
+        self._counts.clear()
+        self._totals.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the recorded decisions as `edges`, source to target to count."""
+        return {
+            "edges": {source: dict(targets) for source, targets in self._counts.items()}
+        }
@@ -0,0 +1,99 @@
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from aigoofusion.flow.event.flow_event import FlowEvent
+from aigoofusion.flow.node.node import Node
+from aigoofusion.flow.state.state_view import StateView
+
+_MISSING = object()
+
+
+class SpeculativeRun:
+    """
+    A node started before the conditional edge leading to it was decided.
+
+    The node runs on its own copy of the state snapshot it was started from, and
+    its events and stream chunks are held back. Once the edge picks it, `commit`
+    checks that the node would have seen the same inputs, replays what was held
+    back and hands over its updates. Otherwise it is cancelled and forgotten.
+
+    It also stands in for the `FlowHooks` of the run, so that node starts, ends
+    and errors are only reported, on the run's own context, once it is picked.
+    """
+
+    def __init__(self, node: Node, view: StateView):
+        self.node = node
+        self.view = view
+        self.task: Optional[asyncio.Task] = None
+        self._held: Deque[Tuple[str, Any]] = deque()
+        self._emit: Optional[Callable[[FlowEvent], None]] = None
+        self._stream_callback: Optional[Callable] = None
+        self._live = False
+        self._hook_calls: List[Tuple[str, Tuple[Any, ...]]] = []
+
+    def emit(self, event: FlowEvent) -> None:
+        if self._live:
+            self._emit(event)  # type: ignore
+        else:
+            self._held.append(("event", event))
+
+    async def stream_callback(self, chunk: Any) -> None:
+        if self._live:
+            await self._stream_callback(chunk)  # type: ignore
+        else:
+            self._held.append(("chunk", chunk))
+
+    def node_start(self, context: Any, node: str) -> None:
+        self._hook_calls.append(("node_start", (node,)))
+
+    def node_end(
+        self, context: Any, node: str, duration: float, updates: List[Dict[str, Any]]
+    ) -> None:
+        self._hook_calls.append(("node_end", (node, duration, updates)))
+
+    def error(self, context: Any, node: str, error: Exception) -> None:
+        self._hook_calls.append(("error", (node, error)))
+
+    def replay_hooks(self, hooks: Any, context: Any) -> None:
+        """Report the hook calls held back to `hooks`, with the context of the run that picked it."""
+        calls, self._hook_calls = self._hook_calls, []
+        for method, args in calls:
+            getattr(hooks, method)(context, *args)
+
+    def start(self, coroutine) -> None:
+        self.task = asyncio.create_task(coroutine)
+        # A discarded run may fail unobserved
+        self.task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    def matches(self, view: StateView) -> bool:
+        """Whether the node would read the same values from `view` as it did."""
+        if self.node.wants_state:
+            return view.is_same_snapshot(self.view)
+        return all(
+            view.get(key, _MISSING) is self.view.get(key, _MISSING)
+            for key in self.node.inject
+        )
+
+    async def commit(
+        self,
+        emit: Optional[Callable[[FlowEvent], None]],
+        stream_callback: Optional[Callable],
+    ) -> List[Dict[str, Any]]:
+        """Forward what was held back, then the rest as it comes, and return the updates."""
+        self._emit = emit
+        self._stream_callback = stream_callback
+        while self._held:
+            kind, item = self._held.popleft()
+            if kind == "event":
+                emit(item)  # type: ignore
+            else:
+                await stream_callback(item)  # type: ignore
+        self._live = True
+        return await self.task  # type: ignore
+
+    def cancel(self) -> None:
+        self._held.clear()
+        self._hook_calls.clear()
+        if self.task is not None:
+            self.task.cancel()
@@ -1,5 +1,6 @@
 from .workflow_state import WorkflowState
 from .memory_manager import MemoryManager
+from .state_view import StateView
 
 
-__all__ = ["WorkflowState", "MemoryManager"]
+__all__ = ["WorkflowState", "MemoryManager", "StateView"]
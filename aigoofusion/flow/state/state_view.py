@@ -0,0 +1,42 @@
+from collections.abc import Mapping
+from copy import deepcopy
+from typing import Any, Dict, Iterator
+
+
+class StateView(Mapping):
+    """
+    Read-only view of a `WorkflowState` snapshot.
+
+    Creating a view does not copy anything. The snapshot it wraps is never
+    modified by later updates, because `WorkflowState` replaces its snapshot
+    on write instead of mutating it. Values are shared with the state, so
+    they must be treated as read-only.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __repr__(self) -> str:
+        return f"StateView({self._data!r})"
+
+    def is_same_snapshot(self, other: "StateView") -> bool:
+        """Whether both views wrap the same snapshot, i.e. no update happened in between."""
+        return self._data is other._data
+
+    def get_current(self) -> Dict[str, Any]:
+        """Get a mutable copy of the snapshot."""
+        return deepcopy(self._data)
@@ -1,26 +1,139 @@
+from collections import deque
 from copy import deepcopy
-from typing import Any, Dict, List
+from typing import Any, Deque, Dict, List, Optional
+
+from aigoofusion.flow.state.state_view import StateView
+
+# Values of these types can be shared without copying
+_IMMUTABLE_TYPES = (str, int, float, bool, bytes, complex, type(None))
+
+
+def _is_unchanged(current: Any, new: Any) -> bool:
+    """Whether writing `new` over `current` would leave the value as it is."""
+    if current is new:
+        return True
+    if type(current) is not type(new):
+        return False
+    try:
+        return bool(current == new)
+    except Exception:
+        return False
 
 
 class WorkflowState:
+    """
+    Workflow state with copy-on-write snapshots.
+
+    Every update builds a new top-level snapshot that shares the unchanged values
+    with the previous one, so an update costs as much as the values it writes, not
+    the size of the whole state. Old snapshots are never mutated, which lets
+    `view()` hand them out without copying.
+
+    History is kept as a journal of the keys each update changed. Older entries
+    are folded into a base snapshot once `history_limit` is exceeded.
+    """
+
     def __init__(
         self,
         initial_state: Dict[str, Any],
+        history_limit: Optional[int] = None,
     ):
-        self._state = initial_state or {}
-        self._history: List[Dict[str, Any]] = []
+        """WorkflowState
+
+        Args:
+            initial_state (Dict[str, Any]): Initial state.
+            history_limit (Optional[int], optional): Number of updates kept in history.
+                None keeps every update, 0 turns history off. Defaults to None.
+        """
+        if history_limit is not None and history_limit < 0:
+            raise ValueError("`history_limit` must be None or at least 0")
+
+        self._state: Dict[str, Any] = dict(initial_state or {})
+        self._history: Deque[Dict[str, Any]] = deque()
+        self._history_base: Dict[str, Any] = self._state
+        self._history_limit = history_limit
+        self._steps = 0
+
+    @property
+    def steps(self) -> int:
+        """Number of updates applied to the state."""
+        return self._steps
+
+    @property
+    def first_step(self) -> int:
+        """Oldest step that can still be rebuilt with `get_state_at`."""
+        return self._steps - len(self._history)
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get a value from the state."""
-        # Return a deep copy to prevent direct modifications
         value = self._state.get(key, default)
+        if isinstance(value, _IMMUTABLE_TYPES):
+            return value
+        # Return a deep copy to prevent direct modifications
         return deepcopy(value)
 
     def get_current(self) -> Dict[str, Any]:
         """Get the current state."""
         return deepcopy(self._state)
 
-    def _update(self, values: Dict[str, Any]) -> None:
-        """Internal method to update state. Only used by Workflow class."""
-        self._state.update(deepcopy(values))
-        self._history.append(deepcopy(self._state))
+    def view(self) -> StateView:
+        """Get a read-only view of the current state without copying it."""
+        return StateView(self._state)
+
+    def get_history(self) -> List[Dict[str, Any]]:
+        """Get the retained history, one dict of changed keys per update."""
+        return deepcopy(list(self._history))
+
+    def get_state_at(self, step: int) -> Dict[str, Any]:
+        """
+        Rebuild the state as it was after `step` updates.
+
+        Args:
+            step (int): Step to rebuild, 0 is the state before the first update.
+
+        Raises:
+            ValueError: When the step is not retained in history.
+
+        Returns:
+            Dict[str, Any]: The state at that step.
+        """
+        if not self.first_step <= step <= self._steps:
+            raise ValueError(
+                f"Step {step} is not in history, available steps: {self.first_step}-{self._steps}"
+            )
+
+        state = dict(self._history_base)
+        for position in range(step - self.first_step):
+            state.update(self._history[position])
+        return deepcopy(state)
+
+    def _update(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Internal method to update state. Only used by Workflow class.
+
+        Returns the keys the update changed, shared with the state so it must not be mutated.
+        """
+        current = self._state
+        changes = deepcopy(
+            {
+                key: value
+                for key, value in values.items()
+                if key not in current or not _is_unchanged(current[key], value)
+            }
+        )
+        self._steps += 1
+
+        if changes:
+            state = dict(current)
+            state.update(changes)
+            self._state = state
+
+        if self._history_limit == 0:
+            self._history_base = self._state
+            return changes
+
+        # Changed values are never mutated afterwards, so the journal can share them
+        self._history.append(changes)
+        if self._history_limit is not None and len(self._history) > self._history_limit:
+            self._history_base = {**self._history_base, **self._history.popleft()}
+        return changes
@@ -1,3 +1,4 @@
+from .profile_overlay import NodeStats, ProfileOverlay
 from .visualizer import WorkflowVisualizer
 
-__all__ = ["WorkflowVisualizer"]
+__all__ = ["WorkflowVisualizer", "ProfileOverlay", "NodeStats"]
@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple, Union
+
+from aigoofusion.flow.metrics.histogram import percentile_from_buckets
+from aigoofusion.flow.metrics.metrics_registry import MetricsRegistry
+
+# Heat scale, from cold to hot
+_COLD = (0x4C, 0xAF, 0x50)
+_WARM = (0xFF, 0xC1, 0x07)
+_HOT = (0xF4, 0x43, 0x36)
+
+
+@dataclass
+class NodeStats:
+    """Runtime statistics of one node, latencies in seconds."""
+
+    calls: int = 0
+    errors: int = 0
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.calls if self.calls else 0.0
+
+
+@dataclass
+class ProfileOverlay:
+    """
+    Run statistics laid over a workflow diagram.
+
+    Build it from a `MetricsRegistry` (or its `to_dict()` output, e.g. collected
+    in production and loaded from JSON) with `from_metrics`.
+    """
+
+    nodes: Dict[str, NodeStats] = field(default_factory=dict)
+    edges: Dict[Tuple[str, str], int] = field(default_factory=dict)
+
+    @classmethod
+    def from_metrics(
+        cls, metrics: Union[MetricsRegistry, Dict[str, Any]]
+    ) -> "ProfileOverlay":
+        data = metrics.to_dict() if isinstance(metrics, MetricsRegistry) else metrics
+        nodes = {
+            name: NodeStats(
+                calls=values.get("calls", 0),
+                errors=values.get("errors", 0),
+                p50=percentile_from_buckets(values["duration"]["buckets"], 0.50),
+                p95=percentile_from_buckets(values["duration"]["buckets"], 0.95),
+            )
+            for name, values in data.get("nodes", {}).items()
+        }
+        edges = {
+            (source, target): count
+            for source, targets in data.get("edges", {}).items()
+            for target, count in targets.items()
+        }
+        return cls(nodes=nodes, edges=edges)
+
+    def heat(self, node: str) -> Optional[float]:
+        """p95 latency of `node` relative to the slowest node, from 0 to 1."""
+        stats = self.nodes.get(node)
+        slowest = max((item.p95 or 0.0 for item in self.nodes.values()), default=0.0)
+        if stats is None or stats.p95 is None or not slowest:
+            return None
+        return stats.p95 / slowest
+
+    def edge_weight(self, source: str, target: str) -> float:
+        """Traversals of an edge relative to the most used edge, from 0 to 1."""
+        busiest = max(self.edges.values(), default=0)
+        return self.edges.get((source, target), 0) / busiest if busiest else 0.0
+
+
+def heat_color(heat: float) -> str:
+    """Hex colour for a heat from 0 (green) over yellow to 1 (red)."""
+    heat = min(max(heat, 0.0), 1.0)
+    start, end, position = (
+        (_COLD, _WARM, heat * 2) if heat < 0.5 else (_WARM, _HOT, (heat - 0.5) * 2)
+    )
+    return "#" + "".join(
+        f"{round(low + (high - low) * position):02x}" for low, high in zip(start, end)
+    )
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 0.001:
+        return f"{seconds * 1e6:.0f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
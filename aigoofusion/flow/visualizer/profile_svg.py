@@ -0,0 +1,192 @@
+import html
+from typing import Dict, List, Tuple
+
+from aigoofusion.flow.node.node import END, START
+from aigoofusion.flow.visualizer.profile_overlay import (
+    ProfileOverlay,
+    format_duration,
+    heat_color,
+)
+
+_NODE_WIDTH = 190
+_NODE_HEIGHT = 62
+_COLUMN_GAP = 40
+_ROW_GAP = 70
+_MARGIN = 40
+_IDLE_COLOR = "#e0e0e0"
+_TERMINAL_COLOR = "#777efe"
+
+
+def _layout(workflow) -> Tuple[Dict[str, Tuple[float, float]], float, float]:
+    """Top-left corner of every node, one row per topological level of the plan."""
+    levels = [list(level) for level in workflow.compile().levels]
+    # END is drawn last even when a short branch reaches it early
+    for level in levels:
+        if END in level and level is not levels[-1]:
+            level.remove(END)
+            levels.append([END])
+            break
+    levels = [level for level in levels if level]
+
+    widest = max(len(level) for level in levels)
+    width = 2 * _MARGIN + widest * _NODE_WIDTH + (widest - 1) * _COLUMN_GAP
+    positions: Dict[str, Tuple[float, float]] = {}
+    for row, level in enumerate(levels):
+        row_width = len(level) * _NODE_WIDTH + (len(level) - 1) * _COLUMN_GAP
+        left = (width - row_width) / 2
+        for column, name in enumerate(level):
+            positions[name] = (
+                left + column * (_NODE_WIDTH + _COLUMN_GAP),
+                _MARGIN + row * (_NODE_HEIGHT + _ROW_GAP),
+            )
+    height = 2 * _MARGIN + len(levels) * _NODE_HEIGHT + (len(levels) - 1) * _ROW_GAP
+    return positions, width, height
+
+
+def _node_svg(name: str, x: float, y: float, overlay: ProfileOverlay) -> List[str]:
+    label = html.escape(name)
+    if name in (START, END):
+        return [
+            f'<rect x="{x + 45}" y="{y + 14}" width="{_NODE_WIDTH - 90}" height="34" rx="17" fill="{_TERMINAL_COLOR}"/>',
+            f'<text x="{x + _NODE_WIDTH / 2}" y="{y + 36}" class="title" fill="white">{label}</text>',
+        ]
+
+    stats = overlay.nodes.get(name)
+    heat = overlay.heat(name)
+    fill = _IDLE_COLOR if heat is None else heat_color(heat)
+    lines = [
+        f'<g><title>{label}</title>',
+        f'<rect x="{x}" y="{y}" width="{_NODE_WIDTH}" height="{_NODE_HEIGHT}" rx="8" fill="{fill}" stroke="#555"/>',
+        f'<text x="{x + _NODE_WIDTH / 2}" y="{y + 20}" class="title">{label}</text>',
+    ]
+    if stats is None:
+        lines.append(
+            f'<text x="{x + _NODE_WIDTH / 2}" y="{y + 40}" class="stat">not run</text>'
+        )
+    else:
+        lines.append(
+            f'<text x="{x + _NODE_WIDTH / 2}" y="{y + 38}" class="stat">'
+            f"p50 {format_duration(stats.p50)} · p95 {format_duration(stats.p95)}</text>"
+        )
+        lines.append(
+            f'<text x="{x + _NODE_WIDTH / 2}" y="{y + 54}" class="stat">'
+            f"{stats.calls} calls · {stats.error_rate:.1%} errors</text>"
+        )
+    lines.append("</g>")
+    return lines
+
+
+def _edge_svg(
+    source: Tuple[float, float],
+    target: Tuple[float, float],
+    count: int,
+    weight: float,
+    conditional: bool,
+) -> List[str]:
+    (sx, sy), (tx, ty) = source, target
+    if ty > sy:
+        start = (sx + _NODE_WIDTH / 2, sy + _NODE_HEIGHT)
+        end = (tx + _NODE_WIDTH / 2, ty)
+        bend = (ty - sy - _NODE_HEIGHT) / 2
+        path = (
+            f"M {start[0]} {start[1]} C {start[0]} {start[1] + bend}, "
+            f"{end[0]} {end[1] - bend}, {end[0]} {end[1]}"
+        )
+        middle = ((start[0] + end[0]) / 2, (start[1] + end[1]) / 2)
+    else:
+        # Loop back: leave and enter on the right side
+        start = (sx + _NODE_WIDTH, sy + _NODE_HEIGHT / 2)
+        end = (tx + _NODE_WIDTH, ty + _NODE_HEIGHT / 2)
+        reach = max(start[0], end[0]) + 50
+        path = (
+            f"M {start[0]} {start[1]} C {reach} {start[1]}, "
+            f"{reach} {end[1]}, {end[0]} {end[1]}"
+        )
+        middle = (reach - 12, (start[1] + end[1]) / 2)
+
+    color = heat_color(weight) if count else "#9e9e9e"
+    dash = ' stroke-dasharray="6 4"' if conditional else ""
+    lines = [
+        f'<path d="{path}" fill="none" stroke="{color}" stroke-width="{1 + 5 * weight:.1f}"{dash} marker-end="url(#arrow)"/>'
+    ]
+    if count:
+        lines.append(
+            f'<text x="{middle[0] + 6}" y="{middle[1]}" class="edge">{count}</text>'
+        )
+    return lines
+
+
+def render_profile_svg(workflow, overlay: ProfileOverlay) -> str:
+    """
+    Draw the workflow with its profile as a standalone SVG.
+
+    Nodes are laid out by the topological levels of the compiled plan and coloured
+    by p95 latency. Edges are as thick as they are busy and labelled with their
+    traversal count, conditional edges are dashed.
+    """
+    positions, width, height = _layout(workflow)
+    svg = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width + 60}" height="{height}" '
+        f'viewBox="0 0 {width + 60} {height}" font-family="Helvetica, Arial, sans-serif">',
+        "<defs>",
+        '<marker id="arrow" viewBox="0 0 10 10" refX="9" refY="5" markerWidth="6" markerHeight="6" orient="auto-start-reverse">',
+        '<path d="M 0 0 L 10 5 L 0 10 z" fill="#555"/>',
+        "</marker>",
+        "<style>",
+        ".title { font-size: 13px; font-weight: bold; text-anchor: middle; }",
+        ".stat { font-size: 11px; text-anchor: middle; }",
+        ".edge { font-size: 11px; fill: #333; }",
+        "</style>",
+        "</defs>",
+    ]
+
+    for edge in workflow.edges:
+        for target in edge.targets:
+            if edge.source not in positions or target not in positions:
+                continue
+            svg.extend(
+                _edge_svg(
+                    positions[edge.source],
+                    positions[target],
+                    overlay.edges.get((edge.source, target), 0),
+                    overlay.edge_weight(edge.source, target),
+                    edge.condition is not None,
+                )
+            )
+
+    for name, (x, y) in positions.items():
+        svg.extend(_node_svg(name, x, y, overlay))
+
+    svg.append("</svg>")
+    return "\n".join(svg)
+
+
+def render_profile_html(workflow, overlay: ProfileOverlay, title: str = "Workflow profile") -> str:
+    """The profile SVG and a table of the node statistics, as a standalone HTML page."""
+    rows = []
+    for name, stats in sorted(
+        overlay.nodes.items(), key=lambda item: item[1].p95 or 0.0, reverse=True
+    ):
+        rows.append(
+            f"<tr><td>{html.escape(name)}</td><td>{stats.calls}</td>"
+            f"<td>{stats.error_rate:.1%}</td><td>{format_duration(stats.p50)}</td>"
+            f"<td>{format_duration(stats.p95)}</td></tr>"
+        )
+    return "\n".join(
+        [
+            "<!DOCTYPE html>",
+            '<html><head><meta charset="utf-8">',
+            f"<title>{html.escape(title)}</title>",
+            "<style>body { font-family: Helvetica, Arial, sans-serif; margin: 24px; }"
+            " table { border-collapse: collapse; margin-top: 16px; }"
+            " td, th { border: 1px solid #ccc; padding: 4px 10px; text-align: right; }"
+            " td:first-child, th:first-child { text-align: left; }</style>",
+            "</head><body>",
+            f"<h2>{html.escape(title)}</h2>",
+            render_profile_svg(workflow, overlay),
+            "<table><tr><th>node</th><th>calls</th><th>errors</th><th>p50</th><th>p95</th></tr>",
+            *rows,
+            "</table>",
+            "</body></html>",
+        ]
+    )
@@ -1,5 +1,14 @@
 import base64
 from aigoofusion.flow.node.node import END, START
+from aigoofusion.flow.visualizer.profile_overlay import (
+    ProfileOverlay,
+    format_duration,
+    heat_color,
+)
+from aigoofusion.flow.visualizer.profile_svg import (
+    render_profile_html,
+    render_profile_svg,
+)
 
 
 class WorkflowVisualizer:
@@ -48,6 +57,58 @@ class WorkflowVisualizer:
 
         return "\n".join(mermaid)
 
+    @staticmethod
+    def create_mermaid_profile_diagram(workflow, overlay: ProfileOverlay) -> str:
+        """Generate Mermaid diagram markdown with run statistics on nodes and edges."""
+        mermaid = [
+            "graph TD",
+            "    %% Nodes",
+        ]
+        styles = [
+            "style START fill:#777EFE,stroke:#4F54AA,color:white",
+            "style END fill:#777EFE,stroke:#4F54AA,color:white",
+        ]
+
+        for name in workflow.nodes:
+            if name in (START, END):
+                mermaid.append(f"    {name}([{name}])")
+                continue
+            stats = overlay.nodes.get(name)
+            if stats is None:
+                mermaid.append(f'    {name}("{name}<br/>not run")')
+                continue
+            mermaid.append(
+                f'    {name}("{name}<br/>p50 {format_duration(stats.p50)} · '
+                f"p95 {format_duration(stats.p95)}<br/>"
+                f'{stats.calls} calls · {stats.error_rate:.1%} err")'
+            )
+            heat = overlay.heat(name)
+            if heat is not None:
+                styles.append(f"style {name} fill:{heat_color(heat)},stroke:#555")
+
+        mermaid.append("    %% Edges")
+        link = 0
+        for edge in workflow.edges:
+            arrow = "-->" if edge.condition is None else "-.->"
+            for target in edge.targets:
+                count = overlay.edges.get((edge.source, target), 0)
+                mermaid.append(f"    {edge.source} {arrow}|{count}| {target}")
+                weight = overlay.edge_weight(edge.source, target)
+                styles.append(f"linkStyle {link} stroke-width:{1 + 5 * weight:.1f}px")
+                link += 1
+
+        return "\n".join(mermaid + styles)
+
+    @staticmethod
+    def create_profile_svg(workflow, overlay: ProfileOverlay) -> str:
+        """Render the workflow with run statistics as standalone SVG, no network needed."""
+        return render_profile_svg(workflow, overlay)
+
+    @staticmethod
+    def create_profile_html(workflow, overlay: ProfileOverlay) -> str:
+        """Render the profile SVG and a node statistics table as standalone HTML."""
+        return render_profile_html(workflow, overlay)
+
     @staticmethod
     def generate_diagram_url(mermaid_code: str) -> str:
         """Generate URL for Mermaid diagram image."""
@@ -0,0 +1,14 @@
+from .cancellation import CancelToken, cancel_scope, check_cancelled
+from .deadline import check_deadline, deadline_scope, remaining_time
+from .trace import TraceRecorder, trace_span
+
+__all__ = [
+    "CancelToken",
+    "cancel_scope",
+    "check_cancelled",
+    "check_deadline",
+    "deadline_scope",
+    "remaining_time",
+    "TraceRecorder",
+    "trace_span",
+]
@@ -0,0 +1,95 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+from aigoofusion.exception.aigoo_cancelled_exception import AIGooCancelledException
+
+# Cancellation token of the current run, shared with model calls
+CANCEL_VAR: ContextVar[Optional["CancelToken"]] = ContextVar(
+    "AIGOO_CANCEL", default=None
+)
+
+
+class CancelToken:
+    """
+    Cancellation flag of a run, shared by everything the run calls.
+
+    Cancelling is thread-safe and runs the registered callbacks right away, so
+    e.g. a model stream being read in a worker thread is closed at once instead
+    of at its next chunk.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> bool:
+        """
+        Cancel and run the callbacks.
+
+        Returns:
+            bool: False when the token was already cancelled.
+        """
+        with self._lock:
+            if self._cancelled:
+                return False
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                # One failing cleanup must not keep the others from running
+                pass
+        return True
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Call `callback` on cancellation, at once when already cancelled.
+
+        Returns:
+            Callable[[], None]: Unregisters the callback.
+        """
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+def check_cancelled(operation: str) -> None:
+    """
+    Raise when the current run has been cancelled.
+
+    Args:
+        operation (str): What is about to run, used in the error message.
+
+    Raises:
+        AIGooCancelledException: When the run is cancelled.
+    """
+    token = CANCEL_VAR.get()
+    if token is not None and token.cancelled:
+        raise AIGooCancelledException(f"Run cancelled before {operation}")
+
+
+@contextmanager
+def cancel_scope(token: CancelToken) -> Iterator[CancelToken]:
+    """Make `token` the cancellation token of the enclosed code."""
+    reset = CANCEL_VAR.set(token)
+    try:
+        yield token
+    finally:
+        CANCEL_VAR.reset(reset)
@@ -0,0 +1,63 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from aigoofusion.exception.aigoo_limit_exception import AIGooLimitException
+
+# Monotonic deadline of the current run or node, shared with model calls
+DEADLINE_VAR: ContextVar[Optional[float]] = ContextVar("AIGOO_DEADLINE", default=None)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, None when there is no deadline."""
+    deadline = DEADLINE_VAR.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(operation: str) -> Optional[float]:
+    """
+    Get the remaining time, raising when the deadline has already passed.
+
+    Args:
+        operation (str): What is about to run, used in the error message.
+
+    Raises:
+        AIGooLimitException: When no time is left.
+
+    Returns:
+        Optional[float]: Seconds left, None when there is no deadline.
+    """
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise AIGooLimitException(
+            f"Deadline exceeded before {operation}", reason="timeout"
+        )
+    return remaining
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Set a deadline `timeout` seconds from now for the enclosed code.
+
+    A deadline that is already closer is kept, so nested scopes can only
+    shorten the budget.
+
+    Yields:
+        Optional[float]: The monotonic deadline in effect.
+    """
+    current = DEADLINE_VAR.get()
+    deadline = current
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+        if current is not None:
+            deadline = min(current, deadline)
+
+    token = DEADLINE_VAR.set(deadline)
+    try:
+        yield deadline
+    finally:
+        DEADLINE_VAR.reset(token)
@@ -0,0 +1,141 @@
+import heapq
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Recorder and track of the code that is running, shared with model and tool calls
+TRACE_VAR: ContextVar[Optional[Tuple["TraceRecorder", int]]] = ContextVar(
+    "AIGOO_TRACE", default=None
+)
+
+
+class TraceRecorder:
+    """
+    Collects spans of a workflow run as Chrome Trace Events.
+
+    The result loads in `chrome://tracing` or https://ui.perfetto.dev. Every node
+    gets a track (a trace "thread") for as long as it runs, so nodes running
+    concurrently are drawn side by side and model and tool calls nest under the
+    node that made them.
+    """
+
+    def __init__(self, name: str = "aigooflow"):
+        """TraceRecorder
+
+        Args:
+            name (str, optional): Process name shown by the trace viewer. Defaults to "aigooflow".
+        """
+        self.name = name
+        self.events: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._free_tracks: List[int] = []
+        self._track_count = 0
+        # Offloaded nodes record from worker threads
+        self._lock = threading.Lock()
+        self._metadata("process_name", 0, {"name": name})
+        self._metadata("thread_name", 0, {"name": "workflow"})
+
+    def _metadata(self, name: str, track: int, args: Dict[str, Any]) -> None:
+        self.events.append(
+            {"name": name, "ph": "M", "pid": self._pid, "tid": track, "args": args}
+        )
+
+    def now(self) -> float:
+        """Microseconds since the recorder was created, the trace time base."""
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def add_span(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        track: int = 0,
+        args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Record a complete span, `start` and `end` come from `now()`."""
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start,
+            "dur": end - start,
+            "pid": self._pid,
+            "tid": track,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    def _acquire_track(self) -> int:
+        with self._lock:
+            if self._free_tracks:
+                return heapq.heappop(self._free_tracks)
+            self._track_count += 1
+            track = self._track_count
+            self._metadata("thread_name", track, {"name": f"branch {track}"})
+            return track
+
+    def _release_track(self, track: int) -> None:
+        with self._lock:
+            heapq.heappush(self._free_tracks, track)
+
+    @contextmanager
+    def track(self) -> Iterator[int]:
+        """
+        Run the enclosed code on the lowest free track.
+
+        Yields:
+            int: The track, spans recorded with `trace_span` inside land on it.
+        """
+        track = self._acquire_track()
+        token = TRACE_VAR.set((self, track))
+        try:
+            yield track
+        finally:
+            TRACE_VAR.reset(token)
+            self._release_track(track)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the trace in the Chrome Trace Event JSON object format."""
+        with self._lock:
+            return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def save(self, path: str) -> None:
+        """Write the trace as JSON to `path`."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, default=str)
+
+
+@contextmanager
+def trace_span(name: str, category: str = "function", **args: Any) -> Iterator[None]:
+    """
+    Record the enclosed code as a span of the current trace.
+
+    Does nothing outside a traced run, so library code can call it unconditionally.
+
+    Args:
+        name (str): Span name.
+        category (str, optional): Span category, e.g. `node`, `model` or `tool`. Defaults to "function".
+        **args: Extra values shown with the span.
+    """
+    current = TRACE_VAR.get()
+    if current is None:
+        yield
+        return
+
+    recorder, track = current
+    start = recorder.now()
+    try:
+        yield
+    except BaseException as e:
+        args["error"] = repr(e)
+        raise
+    finally:
+        recorder.add_span(name, category, start, recorder.now(), track, args)
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.flow import END, START, AIGooFlow, MemoryManager
+
+
+def _flow(**kwargs) -> AIGooFlow:
+    workflow = AIGooFlow({"x": 0}, **kwargs)
+
+    async def double(x):
+        await asyncio.sleep(0.001 * (x % 3))
+        if x == 5:
+            raise RuntimeError("five")
+        return {"y": x * 2}
+
+    workflow.add_node("double", double)
+    workflow.add_edge(START, "double")
+    workflow.add_edge("double", END)
+    return workflow
+
+
+def test_results_come_back_in_input_order_and_failures_stay_on_their_item():
+    results = asyncio.run(
+        _flow().execute_many(({"x": i} for i in range(10)), concurrency=4)
+    )
+
+    assert [result.index for result in results] == list(range(10))
+    assert [result.ok for result in results] == [i != 5 for i in range(10)]
+    assert results[2].state["y"] == 4  # type: ignore
+    assert results[2].input == {"x": 2}
+
+
+def test_batch_errors_are_not_wrapped_twice():
+    error = asyncio.run(_flow().execute_many([{"x": 5}]))[0].error
+
+    assert type(error) is AIGooException
+    assert error.args == ("Error executing node double: five",)
+    assert isinstance(error.__context__, RuntimeError)
+
+
+def test_as_completed_yields_every_result():
+    async def collect():
+        return [
+            result.index
+            async for result in _flow().execute_many_as_completed(
+                [{"x": i} for i in range(6)], concurrency=6
+            )
+        ]
+
+    assert sorted(asyncio.run(collect())) == list(range(6))
+
+
+def test_closing_as_completed_early_cancels_the_runs_in_flight():
+    async def first_then_close():
+        results = _flow().execute_many_as_completed(
+            [{"x": i} for i in range(100)], concurrency=3
+        )
+        async for _ in results:
+            break
+        await results.aclose()
+        return len(asyncio.all_tasks())
+
+    assert asyncio.run(first_then_close()) == 1
+
+
+def test_thread_ids_are_passed_per_item():
+    workflow = _flow(memory=MemoryManager(cleanup=False))
+
+    missing = asyncio.run(workflow.execute_many([{"x": 1}]))
+    assert "thread_id" in str(missing[0].error)
+
+    results = asyncio.run(
+        workflow.execute_many([{"x": 1}, {"x": 2}], thread_ids=["t1", "t2"])
+    )
+    assert [result.state["y"] for result in results] == [2, 4]  # type: ignore
+
+
+def test_concurrency_must_be_positive():
+    with pytest.raises(ValueError):
+        asyncio.run(_flow().execute_many([{"x": 1}], concurrency=0))
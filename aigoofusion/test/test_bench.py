@@ -0,0 +1,61 @@
+import pytest
+
+from aigoofusion.bench import (
+    BENCHMARKS,
+    SCENARIOS,
+    build_report,
+    format_report,
+    load_report,
+    run_flow_benchmarks,
+    run_memory_benchmarks,
+    save_report,
+)
+from aigoofusion.bench.__main__ import main
+from aigoofusion.bench.stats import percentiles
+
+
+def test_every_flow_scenario_runs():
+    results = run_flow_benchmarks(runs=2, warmup=0)
+
+    assert set(results) == set(SCENARIOS)
+    for result in results.values():
+        assert result["step_latency_us"]["p50"] > 0
+
+
+def test_every_memory_benchmark_runs():
+    results = run_memory_benchmarks(runs=5)
+
+    assert set(results) == set(BENCHMARKS)
+
+
+def test_unknown_benchmarks_are_rejected():
+    with pytest.raises(ValueError, match="Unknown scenarios"):
+        run_flow_benchmarks(["nope"])
+    with pytest.raises(ValueError, match="Unknown benchmarks"):
+        run_memory_benchmarks(["nope"])
+
+
+def test_report_round_trip_and_comparison(tmp_path):
+    name = next(iter(SCENARIOS))
+    report = build_report({"flow": run_flow_benchmarks([name], runs=2, warmup=0)})
+    path = str(tmp_path / "report.json")
+    save_report(report, path)
+
+    table = format_report(report, load_report(path))
+
+    assert name in table
+    assert "+0.0%" in table
+
+
+def test_cli_writes_a_report(tmp_path, capsys):
+    path = tmp_path / "out.json"
+    name = next(iter(BENCHMARKS))
+
+    assert main(["memory", "--only", name, "--runs", "3", "--output", str(path)]) == 0
+    assert name in capsys.readouterr().out
+    assert list(load_report(str(path))["suites"]["memory"]) == [name]
+
+
+def test_percentiles():
+    assert percentiles([]) == {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    assert percentiles([0.000001, 0.000002, 0.000003])["max"] == 3.0
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from aigoofusion.chat.models.tracked_stream import TrackedStream
+from aigoofusion.exception.aigoo_cancelled_exception import AIGooCancelledException
+from aigoofusion.flow import END, START, AIGooFlow
+from aigoofusion.runtime.cancellation import CancelToken, cancel_scope
+
+
+class SlowStream:
+    """Provider-like stream that waits between chunks and is not thread-safe."""
+
+    def __init__(self, chunks, delay=0.0, usage=None):
+        self.chunks = chunks
+        self.delay = delay
+        self.usage = usage
+        self.reading = False
+        self.closed_while_reading = False
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in range(self.chunks):
+            self.reading = True
+            time.sleep(self.delay)
+            self.reading = False
+            yield {"text": chunk}
+        if self.usage is not None:
+            yield {"usage": self.usage}
+
+    def close(self):
+        self.closed_while_reading = self.reading
+        self.closed = True
+
+
+def _track(stream, recorded):
+    return TrackedStream(
+        stream,
+        read_usage=lambda chunk: chunk.get("usage"),
+        estimate_usage=lambda chunks: {"output": chunks},
+        record=recorded.append,
+    )
+
+
+def test_cancel_stops_a_running_node_with_the_partial_state():
+    workflow = AIGooFlow({})
+
+    async def slow():
+        await asyncio.sleep(10)
+        return {"done": True}
+
+    workflow.add_node("first", lambda: {"first": 1})
+    workflow.add_node("slow", slow)
+    workflow.add_edge(START, "first")
+    workflow.add_edge("first", "slow")
+    workflow.add_edge("slow", END)
+
+    async def run():
+        asyncio.get_running_loop().call_later(0.05, workflow.cancel, "r1")
+        await workflow.execute({}, run_id="r1")
+
+    started = time.perf_counter()
+    with pytest.raises(AIGooCancelledException) as error:
+        asyncio.run(run())
+
+    assert time.perf_counter() - started < 2
+    assert error.value.state["first"] == 1
+    assert not workflow.cancel("unknown")
+
+
+def test_stream_usage_is_taken_from_the_provider():
+    recorded = []
+    stream = _track(SlowStream(3, usage={"output": 42}), recorded)
+
+    assert len(list(stream)) == 4
+    assert recorded == [{"output": 42}]
+
+
+def test_usage_of_a_stream_without_usage_chunk_is_marked_estimated():
+    recorded = []
+    assert len(list(_track(SlowStream(3), recorded))) == 3
+    assert recorded == [{"output": 3, "estimated": True}]
+
+
+def test_cancel_closes_the_stream_after_the_read_in_progress():
+    recorded = []
+    provider = SlowStream(100, delay=0.02)
+    token = CancelToken()
+    with cancel_scope(token):
+        stream = _track(provider, recorded)
+
+    chunks = []
+    errors = []
+
+    def read():
+        try:
+            for chunk in stream:
+                chunks.append(chunk)
+        except AIGooCancelledException as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    time.sleep(0.05)
+    token.cancel()
+    reader.join(2)
+
+    assert not reader.is_alive()
+    assert len(errors) == 1
+    assert provider.closed and not provider.closed_while_reading
+    assert len(chunks) < 100
+    assert recorded and recorded[0]["estimated"] is True
+
+
+def test_close_outside_a_read_closes_at_once():
+    recorded = []
+    provider = SlowStream(10)
+    stream = _track(provider, recorded)
+    next(stream)
+    stream.close()
+
+    assert provider.closed
+    assert list(stream) == []
+    assert recorded == [{"output": 1, "estimated": True}]
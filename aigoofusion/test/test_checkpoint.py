@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.flow import END, START, AIGooFlow
+from aigoofusion.flow.checkpoint import (
+    Checkpoint,
+    FileCheckpointer,
+    MemoryCheckpointer,
+    SQLiteCheckpointer,
+)
+
+
+def _checkpointer(kind, path):
+    if kind == "memory":
+        return MemoryCheckpointer()
+    if kind == "file":
+        return FileCheckpointer(str(path))
+    return SQLiteCheckpointer(str(path / "checkpoints.db"))
+
+
+def _chain(checkpointer, calls, crash_at=None) -> AIGooFlow:
+    workflow = AIGooFlow({"n": 0}, checkpointer=checkpointer)
+
+    def step(n):
+        calls.append(n)
+        if n == crash_at:
+            raise RuntimeError("crash")
+        return {"n": n + 1}
+
+    for i in range(5):
+        workflow.add_node(f"s{i}", step)
+    workflow.add_edge(START, "s0")
+    for i in range(4):
+        workflow.add_edge(f"s{i}", f"s{i + 1}")
+    workflow.add_edge("s4", END)
+    return workflow
+
+
+@pytest.mark.parametrize("kind", ["memory", "file", "sqlite"])
+def test_resume_skips_the_nodes_that_finished(kind, tmp_path):
+    checkpointer = _checkpointer(kind, tmp_path)
+    calls = []
+
+    with pytest.raises(AIGooException, match="crash"):
+        asyncio.run(_chain(checkpointer, calls, crash_at=3).execute({}, run_id="r1"))
+    assert calls == [0, 1, 2, 3]
+
+    calls.clear()
+    result = asyncio.run(_chain(checkpointer, calls).resume("r1"))
+
+    assert result["n"] == 5
+    assert calls == [3, 4]
+    assert asyncio.run(checkpointer.get("r1")).completed
+
+
+def test_resume_of_a_completed_run_returns_its_state():
+    checkpointer = MemoryCheckpointer()
+    calls = []
+    asyncio.run(_chain(checkpointer, calls).execute({}, run_id="done"))
+
+    calls.clear()
+    assert asyncio.run(_chain(checkpointer, calls).resume("done"))["n"] == 5
+    assert calls == []
+
+
+def test_resume_without_a_checkpoint_fails():
+    with pytest.raises(AIGooException, match="No checkpoint"):
+        asyncio.run(_chain(MemoryCheckpointer(), []).resume("missing"))
+
+
+def test_batched_writes_keep_the_latest_checkpoint(tmp_path):
+    async def write():
+        checkpointer = FileCheckpointer(str(tmp_path), flush_interval=0)
+        loop = asyncio.get_running_loop()
+        for i in range(100):
+            checkpointer.put(Checkpoint(run_id="o", state={"i": i}, queue=[]))
+            if i % 7 == 0:
+                loop.create_task(checkpointer.flush())
+            await asyncio.sleep(0)
+        await checkpointer.flush()
+        return await checkpointer.get("o")
+
+    assert asyncio.run(write()).state == {"i": 99}
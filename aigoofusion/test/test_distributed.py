@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import pytest
+
+from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.flow import END, START, AIGooFlow
+from aigoofusion.flow.distributed import (
+    FlowTask,
+    FlowWorker,
+    MemoryTaskQueue,
+    RemoteFlow,
+    TaskDispatcher,
+    TaskKind,
+    TaskResult,
+    encode,
+)
+
+
+def _flows(queue):
+    scored = AIGooFlow({"text": ""})
+    scored.add_node("score", lambda text: {"score": len(text)})
+    scored.add_edge(START, "score")
+    scored.add_edge("score", END)
+
+    mixed = AIGooFlow({"text": ""}, name="mixed", task_queue=queue)
+    mixed.add_node("score", lambda text: {"score": len(text)}, executor="remote")
+    mixed.add_node("double", lambda score: {"double": score * 2})
+    mixed.add_edge(START, "score")
+    mixed.add_edge("score", "double")
+    mixed.add_edge("double", END)
+    return {"scored": scored, "mixed": mixed}
+
+
+def _with_worker(queue, flows, client):
+    """Run `client()` against a worker serving `flows` on the same event loop."""
+
+    async def main():
+        worker = FlowWorker(queue, flows, concurrency=4, poll_timeout=0.05)
+        running = asyncio.create_task(worker.run())
+        try:
+            return await client()
+        finally:
+            worker.stop()
+            await running
+
+    return asyncio.run(main())
+
+
+def test_remote_runs_and_remote_nodes():
+    queue = MemoryTaskQueue()
+    flows = _flows(queue)
+    remote = RemoteFlow(flows["scored"], "scored", queue)
+
+    async def client():
+        batch = await remote.execute_many([{"text": "x" * i} for i in range(10)])
+        mixed = await flows["mixed"].execute({"text": "abc"})
+        return batch, mixed
+
+    batch, mixed = _with_worker(queue, flows, client)
+
+    assert [result.state["score"] for result in batch] == list(range(10))  # type: ignore
+    assert mixed["double"] == 6
+
+
+def test_unknown_workflow_fails_on_the_client():
+    queue = MemoryTaskQueue()
+    flows = _flows(queue)
+
+    async def client():
+        await RemoteFlow(flows["scored"], "nope", queue).execute({})
+
+    with pytest.raises(AIGooException, match="not registered"):
+        _with_worker(queue, flows, client)
+
+
+def test_expired_lease_is_handed_out_again_and_completed_once():
+    queue = MemoryTaskQueue(lease_timeout=0.05)
+    queue.put(FlowTask("flow", TaskKind.RUN, encode({}), "client", task_id="t1"))
+
+    assert queue.lease(0.1).attempt == 1  # type: ignore
+    time.sleep(0.1)
+    assert queue.lease(0.1).attempt == 2  # type: ignore
+    assert queue.complete(TaskResult("t1", "client", payload=b"1"))
+    assert not queue.complete(TaskResult("t1", "client", payload=b"2"))
+    assert [result.payload for result in queue.results("client", 0.1)] == [b"1"]
+
+
+def test_results_nobody_takes_expire():
+    queue = MemoryTaskQueue(result_ttl=0.05)
+    queue.complete(TaskResult("t1", "gone"))
+    time.sleep(0.1)
+    queue.complete(TaskResult("t2", "alive"))
+
+    assert queue.results("gone", 0) == []
+    assert [result.task_id for result in queue.results("alive", 0)] == ["t2"]
+
+
+def test_dispatcher_rejects_waiters_and_backs_off_when_the_queue_fails():
+    class BrokenQueue(MemoryTaskQueue):
+        polls = 0
+
+        def results(self, reply_to, timeout):
+            BrokenQueue.polls += 1
+            raise ConnectionError("down")
+
+    async def submit():
+        dispatcher = TaskDispatcher(BrokenQueue())
+        with pytest.raises(ConnectionError):
+            await dispatcher.submit(FlowTask("flow", TaskKind.RUN, b"", ""))
+        await asyncio.sleep(0.2)
+
+    asyncio.run(submit())
+    assert BrokenQueue.polls == 1
+
+
+def test_run_node_calls_a_single_node():
+    workflow = _flows(None)["scored"]
+
+    assert asyncio.run(workflow.run_node("score", {"text": "abcd"})) == [{"score": 4}]
@@ -0,0 +1,75 @@
+import asyncio
+import warnings
+
+from aigoofusion.flow import END, START, AIGooFlow, UnreachableNodeWarning
+
+
+def _branching_flow() -> AIGooFlow:
+    workflow = AIGooFlow({})
+    workflow.add_node("process", lambda text: {"processed": text.upper()})
+    workflow.add_node("long", lambda processed: {"result": "long"})
+    workflow.add_node("short", lambda processed: {"result": "short"})
+    workflow.add_edge(START, "process")
+    workflow.add_conditional_edge(
+        "process",
+        ["long", "short"],
+        lambda state: "long" if len(state.get("processed")) > 5 else "short",
+    )
+    workflow.add_edge("long", END)
+    workflow.add_edge("short", END)
+    return workflow
+
+
+def test_plan_indexes_levels_and_successors():
+    plan = _branching_flow().compile()
+
+    assert plan.levels == (("START",), ("process",), ("long", "short"), ("END",))
+    assert plan.successors["START"] == ("process",)
+    assert [edge.targets for edge in plan.conditional_edges["process"]] == [["long", "short"]]
+    assert not plan.is_cyclic
+
+
+def test_plan_is_reused_until_the_graph_changes():
+    workflow = _branching_flow()
+    plan = workflow.compile()
+    assert workflow.compile() is plan
+
+    workflow.add_node("extra", lambda: {})
+    workflow.add_edge("process", "extra")
+    assert workflow.compile() is not plan
+
+
+def test_plan_drives_execution():
+    workflow = _branching_flow()
+
+    assert asyncio.run(workflow.execute({"text": "hi"}))["result"] == "short"
+    assert asyncio.run(workflow.execute({"text": "hello world"}))["result"] == "long"
+
+
+def test_cycles_share_a_level():
+    workflow = AIGooFlow({"n": 0})
+    workflow.add_node("inc", lambda n: {"n": n + 1})
+    workflow.add_edge(START, "inc")
+    workflow.add_conditional_edge(
+        "inc", ["inc", END], lambda state: "inc" if state.get("n") < 5 else END
+    )
+
+    plan = workflow.compile()
+
+    assert plan.cycles == (("inc",),)
+    assert asyncio.run(workflow.execute({}))["n"] == 5
+
+
+def test_unreachable_node_warns_on_compile():
+    workflow = _branching_flow()
+    workflow.add_node("orphan", lambda: {})
+    workflow.add_edge("orphan", END)
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        plan = workflow.compile()
+
+    assert plan.unreachable == frozenset({"orphan"})
+    assert [str(w.message) for w in caught if w.category is UnreachableNodeWarning] == [
+        "Node 'orphan' can not be reached from START and never runs."
+    ]
@@ -0,0 +1,145 @@
+import asyncio
+import warnings
+
+import pytest
+
+from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.flow import (
+    END,
+    START,
+    AIGooFlow,
+    DuplicateExecutionWarning,
+    UnsatisfiableJoinWarning,
+)
+from aigoofusion.flow.checkpoint import MemoryCheckpointer
+
+
+def _recorder(calls, name):
+    def node():
+        calls.append(name)
+        return {name: 1}
+
+    return node
+
+
+def _diamond(calls, join, **kwargs) -> AIGooFlow:
+    workflow = AIGooFlow({}, **kwargs)
+    for name in "abc":
+        workflow.add_node(name, _recorder(calls, name))
+    workflow.add_node("d", _recorder(calls, "d"), join=join)
+    workflow.add_edge(START, "a")
+    workflow.add_edge("a", "b")
+    workflow.add_edge("a", "c")
+    workflow.add_edge("b", "d")
+    workflow.add_edge("c", "d")
+    workflow.add_edge("d", END)
+    return workflow
+
+
+def _branching(join, conditional=True) -> AIGooFlow:
+    workflow = AIGooFlow({})
+    for name in "xab":
+        workflow.add_node(name, lambda: {})
+    workflow.add_node("j", lambda: {"j": 1}, join=join)
+    workflow.add_edge(START, "x")
+    if conditional:
+        workflow.add_conditional_edge("x", ["a", "b"], lambda state: "a")
+    else:
+        workflow.add_edge("x", "a")
+        workflow.add_edge("x", "b")
+    workflow.add_edge("a", "j")
+    workflow.add_edge("b", "j")
+    workflow.add_edge("j", END)
+    return workflow
+
+
+def test_diamond_without_join_runs_twice_and_warns():
+    calls = []
+    with pytest.warns(DuplicateExecutionWarning):
+        asyncio.run(_diamond(calls, None).execute({}))
+
+    assert calls.count("d") == 2
+
+
+@pytest.mark.parametrize("max_concurrency", [None, 1, 4])
+@pytest.mark.parametrize("join", ["all", 1])
+def test_join_node_runs_once(join, max_concurrency):
+    calls = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        asyncio.run(_diamond(calls, join, max_concurrency=max_concurrency).execute({}))
+
+    assert calls == ["a", "b", "c", "d"]
+
+
+def test_join_resets_on_every_loop_iteration():
+    calls = []
+    workflow = AIGooFlow({"n": 0})
+    workflow.add_node("a", lambda n: {"n": n + 1})
+    workflow.add_node("b", _recorder(calls, "b"))
+    workflow.add_node("c", _recorder(calls, "c"))
+    workflow.add_node("d", _recorder(calls, "d"), join="all")
+    workflow.add_edge(START, "a")
+    workflow.add_edge("a", "b")
+    workflow.add_edge("a", "c")
+    workflow.add_edge("b", "d")
+    workflow.add_edge("c", "d")
+    workflow.add_conditional_edge("d", ["a", END], lambda state: "a" if state["n"] < 3 else END)
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert (calls.count("d"), result["n"]) == (3, 3)
+
+
+def test_conditional_merge_is_not_a_duplicate():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DuplicateExecutionWarning)
+        _branching(None).compile()
+
+    with pytest.warns(DuplicateExecutionWarning):
+        _branching(None, conditional=False).compile()
+
+
+def test_join_on_conditional_branches_warns_and_fails_at_runtime():
+    with pytest.warns(UnsatisfiableJoinWarning):
+        workflow = _branching("all")
+        with pytest.raises(AIGooException, match="join nodes still waiting: 'j'"):
+            asyncio.run(workflow.execute({}))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", UnsatisfiableJoinWarning)
+        assert asyncio.run(_branching(1).execute({}))["j"] == 1
+
+
+def test_invalid_join_is_rejected():
+    with pytest.raises(ValueError, match="waits for 3 of its 2 predecessors"):
+        _diamond([], 3).compile()
+    with pytest.raises(ValueError, match="must be"):
+        _diamond([], 0)
+
+
+def test_join_arrivals_survive_a_resume():
+    calls = []
+    failing = [True]
+
+    def c():
+        if failing[0]:
+            raise RuntimeError("x")
+        calls.append("c")
+        return {"c": 1}
+
+    workflow = _diamond(calls, "all", max_concurrency=1, checkpointer=MemoryCheckpointer())
+    workflow.add_node("c", c)
+
+    async def run():
+        with pytest.raises(AIGooException):
+            await workflow.execute({}, run_id="r1")
+        checkpoint = await workflow.checkpointer.get("r1")  # type: ignore
+        assert checkpoint.joins == {"d": ["b"]}
+        failing[0] = False
+        return await workflow.resume("r1")
+
+    result = asyncio.run(run())
+
+    assert calls == ["a", "b", "c", "d"]
+    assert result["d"] == 1
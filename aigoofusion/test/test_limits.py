@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+import pytest
+
+from aigoofusion.exception.aigoo_limit_exception import AIGooLimitException
+from aigoofusion.flow import END, START, AIGooFlow
+from aigoofusion.runtime import remaining_time
+from aigoofusion.runtime.deadline import check_deadline, deadline_scope
+
+
+def _endless_loop(**kwargs) -> AIGooFlow:
+    workflow = AIGooFlow({"n": 0}, **kwargs)
+    workflow.add_node("inc", lambda n: {"n": n + 1})
+    workflow.add_edge(START, "inc")
+    workflow.add_conditional_edge("inc", ["inc", END], lambda state: "inc")
+    return workflow
+
+
+def _slow_flow(node_timeout=None) -> AIGooFlow:
+    workflow = AIGooFlow({})
+
+    async def slow(x):
+        await asyncio.sleep(1)
+        return {"y": 1}
+
+    workflow.add_node("fast", lambda x: {"seen": remaining_time() is not None})
+    workflow.add_node("slow", slow, timeout=node_timeout)
+    workflow.add_edge(START, "fast")
+    workflow.add_edge("fast", "slow")
+    workflow.add_edge("slow", END)
+    return workflow
+
+
+def test_max_steps_stops_an_endless_loop_with_the_partial_state():
+    with pytest.raises(AIGooLimitException) as error:
+        asyncio.run(_endless_loop(max_steps=5).execute({}))
+
+    assert error.value.reason == "max_steps"
+    assert error.value.state["n"] == 5
+
+
+def test_node_timeout():
+    started = time.perf_counter()
+    with pytest.raises(AIGooLimitException) as error:
+        asyncio.run(_slow_flow(node_timeout=0.1).execute({"x": 1}, timeout=5))
+
+    assert error.value.reason == "node_timeout"
+    assert error.value.state["seen"] is True
+    assert time.perf_counter() - started < 0.9
+
+
+def test_run_timeout():
+    started = time.perf_counter()
+    with pytest.raises(AIGooLimitException) as error:
+        asyncio.run(_slow_flow().execute({"x": 1}, timeout=0.1))
+
+    assert error.value.reason == "timeout"
+    assert time.perf_counter() - started < 0.9
+
+
+def test_run_timeout_while_streaming():
+    async def collect():
+        async for _ in _slow_flow().stream({"x": 1}, timeout=0.1):
+            pass
+
+    with pytest.raises(AIGooLimitException):
+        asyncio.run(collect())
+
+
+def test_nested_deadlines_only_shorten_the_budget():
+    assert remaining_time() is None
+    with deadline_scope(10):
+        with deadline_scope(60):
+            assert remaining_time() <= 10
+        with deadline_scope(0):
+            with pytest.raises(AIGooLimitException):
+                check_deadline("model call")
+    assert remaining_time() is None
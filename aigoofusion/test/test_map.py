@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.flow import END, START, AIGooFlow, FlowScheduler, MapErrorMode
+
+
+def _map_flow(initial, *args, scheduler=None, **kwargs) -> AIGooFlow:
+    workflow = AIGooFlow(initial, scheduler=scheduler)
+    workflow.add_map("m", *args, **kwargs)
+    workflow.add_edge(START, "m")
+    workflow.add_edge("m", END)
+    return workflow
+
+
+def _counted_work(calls):
+    async def work(doc):
+        calls["running"] += 1
+        calls["peak"] = max(calls["peak"], calls["running"])
+        await asyncio.sleep(0.01)
+        calls["running"] -= 1
+        if doc == 3:
+            raise ValueError("bad 3")
+        return doc * 10
+
+    return work
+
+
+def test_items_run_bounded_and_failures_are_skipped_in_order():
+    calls = {"running": 0, "peak": 0}
+    workflow = _map_flow(
+        {"docs": list(range(8))},
+        "docs",
+        _counted_work(calls),
+        "out",
+        concurrency=3,
+        on_error=MapErrorMode.SKIP,
+        errors_key="errs",
+    )
+
+    result = asyncio.run(workflow.execute({}))
+
+    assert result["out"] == [0, 10, 20, 40, 50, 60, 70]
+    assert result["errs"] == [{"index": 3, "item": 3, "error": "bad 3"}]
+    assert calls["peak"] == 3
+
+
+def test_failed_item_fails_the_node_by_default():
+    calls = {"running": 0, "peak": 0}
+    workflow = _map_flow({"docs": list(range(8))}, "docs", _counted_work(calls), "out")
+
+    with pytest.raises(AIGooException, match="Item 3 failed: bad 3"):
+        asyncio.run(workflow.execute({}))
+
+
+def test_items_are_pulled_lazily_from_a_generator_and_reduced():
+    pulled = []
+
+    def produce(n):
+        for i in range(n):
+            pulled.append(i)
+            yield i
+
+    workflow = _map_flow({"n": 6}, produce, lambda x: x + 1, "out", concurrency=2, reducer=sum)
+
+    assert asyncio.run(workflow.execute({}))["out"] == 21
+    assert pulled == list(range(6))
+
+
+def test_subflow_mapper_under_a_scheduler():
+    sub = AIGooFlow({})
+    sub.add_node("double", lambda item: {"res": item * 2})
+    sub.add_edge(START, "double")
+    sub.add_edge("double", END)
+    workflow = _map_flow(
+        {"docs": [1, 2, 3]},
+        "docs",
+        sub,
+        "out",
+        result_key="res",
+        item_timeout=1,
+        scheduler=FlowScheduler(max_concurrency=1),
+    )
+
+    assert asyncio.run(workflow.execute({}))["out"] == [2, 4, 6]
+
+
+def test_item_timeout_counts_as_a_failure():
+    async def slow(x):
+        await asyncio.sleep(0.2 if x else 0)
+        return x
+
+    workflow = _map_flow(
+        {"docs": [0, 1]},
+        "docs",
+        slow,
+        "out",
+        item_timeout=0.05,
+        on_error="skip",
+        errors_key="e",
+        max_failures=1,
+    )
+    result = asyncio.run(workflow.execute({}))
+
+    assert result["out"] == [0]
+    assert result["e"] == [{"index": 1, "item": 1, "error": "m[1] timed out after 0.05s"}]
+
+
+def test_too_many_skipped_failures_fail_the_node():
+    async def failing(x):
+        raise ValueError(f"bad {x}")
+
+    workflow = _map_flow(
+        {"docs": [0, 1, 2]}, "docs", failing, "out", on_error="skip", max_failures=1
+    )
+
+    with pytest.raises(AIGooException, match="more than the 1 allowed"):
+        asyncio.run(workflow.execute({}))
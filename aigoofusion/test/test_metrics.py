@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.flow import END, START, AIGooFlow, MetricsRegistry
+
+
+def _flow(metrics=None) -> AIGooFlow:
+    workflow = AIGooFlow({"x": 0}, metrics=metrics)
+
+    def check(x):
+        if x > 1:
+            raise ValueError("too big")
+        return {"checked": x}
+
+    workflow.add_node("inc", lambda x: {"x": x + 1, "y": 1})
+    workflow.add_node("check", check)
+    workflow.add_edge(START, "inc")
+    workflow.add_edge("inc", "check")
+    workflow.add_edge("check", END)
+    return workflow
+
+
+def test_registry_counts_calls_errors_and_edges():
+    registry = MetricsRegistry()
+    workflow = _flow(registry)
+
+    asyncio.run(workflow.execute({"x": 0}))
+    with pytest.raises(AIGooException):
+        asyncio.run(workflow.execute({"x": 1}))
+
+    metrics = registry.to_dict()
+    assert metrics["nodes"]["inc"]["calls"] == 2
+    assert metrics["nodes"]["inc"]["update_keys"]["sum"] == 4
+    assert metrics["nodes"]["check"]["errors"] == 1
+    assert metrics["nodes"]["check"]["duration"]["count"] == 1
+    assert metrics["edges"]["START"]["inc"] == 2
+    assert metrics["edges"]["check"]["END"] == 1
+
+
+def test_prometheus_export():
+    registry = MetricsRegistry()
+    asyncio.run(_flow(registry).execute({"x": 0}))
+
+    text = registry.to_prometheus()
+
+    assert "# TYPE aigooflow_node_calls_total counter" in text
+    assert 'aigooflow_node_calls_total{node="inc"} 1' in text
+    assert 'aigooflow_node_duration_seconds_count{node="check"} 1' in text
+
+
+def test_hooks_receive_node_edge_and_error_calls():
+    workflow = _flow()
+    calls = []
+
+    @workflow.on_node_start
+    def started(context, node):
+        calls.append(("start", node))
+
+    @workflow.on_node_end
+    def ended(context, node, duration, updates):
+        calls.append(("end", node))
+
+    @workflow.on_edge
+    def edge(context, source, target):
+        calls.append(("edge", source, target))
+
+    @workflow.on_error
+    def failed(context, node, error):
+        calls.append(("error", node, str(error)))
+
+    with pytest.raises(AIGooException):
+        asyncio.run(workflow.execute({"x": 1}))
+
+    assert ("edge", "inc", "check") in calls
+    assert ("end", "inc") in calls
+    assert ("error", "check", "too big") in calls
+    assert ("end", "check") not in calls
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+
+from aigoofusion.flow import END, START, AIGooFlow, NodeCache
+
+
+def _cached_flow(cache, calls) -> AIGooFlow:
+    workflow = AIGooFlow({})
+
+    async def classify(text, meta):
+        calls.append(text)
+        return {"label": text.upper(), "tags": [text]}
+
+    workflow.add_node("classify", classify, cache=cache)
+    workflow.add_edge(START, "classify")
+    workflow.add_edge("classify", END)
+    return workflow
+
+
+def _run_all(workflow, texts):
+    return [
+        asyncio.run(workflow.execute({"text": text, "meta": {"x": [1, 2]}}))["label"]
+        for text in texts
+    ]
+
+
+def test_repeated_inputs_hit_the_cache():
+    calls = []
+    workflow = _cached_flow(True, calls)
+
+    assert _run_all(workflow, ["a", "b", "a", "a"]) == ["A", "B", "A", "A"]
+    assert calls == ["a", "b"]
+    stats = workflow.nodes["classify"].cache.stats()  # type: ignore
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+
+def test_lru_evicts_and_ttl_expires():
+    calls = []
+    workflow = _cached_flow(NodeCache(maxsize=2, ttl=0.1), calls)
+
+    _run_all(workflow, ["a", "b", "c", "a"])
+    assert calls == ["a", "b", "c", "a"]
+    assert workflow.nodes["classify"].cache.stats()["evictions"] == 2  # type: ignore
+
+    time.sleep(0.15)
+    _run_all(workflow, ["a"])
+    assert calls[-1] == "a" and len(calls) == 5
+
+
+def test_disk_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "cache.db")
+    first = []
+    _run_all(_cached_flow(NodeCache(disk_path=path), first), ["a"])
+
+    second = []
+    workflow = _cached_flow(NodeCache(disk_path=path), second)
+    assert _run_all(workflow, ["a"]) == ["A"]
+    assert second == []
+    assert workflow.nodes["classify"].cache.stats()["disk_hits"] == 1  # type: ignore
+
+
+def test_hits_return_copies_and_none_is_a_hit():
+    async def check():
+        cache = NodeCache()
+        value = [{"tags": ["a"]}]
+        await cache.set("k", value)
+        value[0]["tags"].append("changed")
+
+        hit = await cache.get("k")
+        hit[0]["tags"].append("mutated")
+        assert await cache.get("k") == [{"tags": ["a"]}]
+
+        await cache.set("none", None)
+        assert await cache.get("none") is None
+        assert await cache.get("missing") is NodeCache.MISS
+
+    asyncio.run(check())
+
+
+def test_cached_node_can_not_take_state():
+    workflow = AIGooFlow({})
+    with pytest.raises(ValueError, match="can not take `state`"):
+        workflow.add_node("bad", lambda state: {}, cache=True)
@@ -0,0 +1,60 @@
+import asyncio
+from typing import TypedDict
+
+from aigoofusion.flow import END, START, AIGooFlow, WorkflowState
+
+
+class Summary(TypedDict):
+    summary: str
+
+
+def test_call_plan_is_resolved_when_the_node_is_added():
+    workflow = AIGooFlow({})
+
+    async def summarize(text: str, state: WorkflowState, *args, **kwargs) -> Summary:
+        return text[:3]  # type: ignore
+
+    workflow.add_node("summarize", summarize)
+    node = workflow.nodes["summarize"]
+
+    assert node.inject == ("text",)
+    assert node.wants_state
+    assert node.is_async and not node.is_async_gen
+    assert node.output_key == "summary"
+
+
+def test_missing_inputs_are_not_passed():
+    workflow = AIGooFlow({})
+    workflow.add_node("greet", lambda name="world": {"greeting": f"hello {name}"})
+    workflow.add_edge(START, "greet")
+    workflow.add_edge("greet", END)
+
+    assert asyncio.run(workflow.execute({}))["greeting"] == "hello world"
+    assert asyncio.run(workflow.execute({"name": "flow"}))["greeting"] == "hello flow"
+
+
+def test_single_output_annotation_wraps_a_plain_return_value():
+    workflow = AIGooFlow({})
+
+    def summarize(text: str) -> Summary:
+        return text.upper()  # type: ignore
+
+    workflow.add_node("summarize", summarize)
+    workflow.add_edge(START, "summarize")
+    workflow.add_edge("summarize", END)
+
+    assert asyncio.run(workflow.execute({"text": "abc"}))["summary"] == "ABC"
+
+
+def test_async_callable_objects_are_awaited():
+    class Node:
+        async def __call__(self, text: str):
+            return {"length": len(text)}
+
+    workflow = AIGooFlow({})
+    workflow.add_node("measure", Node())
+    workflow.add_edge(START, "measure")
+    workflow.add_edge("measure", END)
+
+    assert workflow.nodes["measure"].is_async
+    assert asyncio.run(workflow.execute({"text": "abcd"}))["length"] == 4
@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import pytest
+
+from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.flow import END, START, AIGooFlow
+
+
+def _fan_out_flow(max_concurrency, calls):
+    """prep fans out to three branches joined by combine, `calls` tracks how many overlap."""
+    workflow = AIGooFlow({}, max_concurrency=max_concurrency)
+
+    def branch(name):
+        async def run(text: str):
+            calls["running"] += 1
+            calls["peak"] = max(calls["peak"], calls["running"])
+            await asyncio.sleep(0.05)
+            calls["running"] -= 1
+            return {name: text}
+
+        return run
+
+    workflow.add_node("prep", lambda text: {"text": text})
+    workflow.add_edge(START, "prep")
+    workflow.add_node(
+        "combine",
+        lambda classify, retrieve, moderate: {"final": (classify, retrieve, moderate)},
+        join="all",
+    )
+    for name in ("classify", "retrieve", "moderate"):
+        workflow.add_node(name, branch(name))
+        workflow.add_edge("prep", name)
+        workflow.add_edge(name, "combine")
+    workflow.add_edge("combine", END)
+    return workflow
+
+
+def test_independent_branches_run_concurrently():
+    calls = {"running": 0, "peak": 0}
+    result = asyncio.run(_fan_out_flow(None, calls).execute({"text": "hi"}))
+
+    assert result["final"] == ("hi", "hi", "hi")
+    assert calls["peak"] == 3
+
+
+def test_max_concurrency_bounds_branches():
+    calls = {"running": 0, "peak": 0}
+    result = asyncio.run(_fan_out_flow(1, calls).execute({"text": "hi"}))
+
+    assert result["final"] == ("hi", "hi", "hi")
+    assert calls["peak"] == 1
+
+
+def test_failing_branch_cancels_its_siblings():
+    workflow = AIGooFlow({})
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("bad")
+
+    async def slow():
+        await asyncio.sleep(5)
+        return {"a": 1}
+
+    workflow.add_node("boom", boom)
+    workflow.add_node("slow", slow)
+    workflow.add_edge(START, "boom")
+    workflow.add_edge(START, "slow")
+    workflow.add_edge("boom", END)
+    workflow.add_edge("slow", END)
+
+    started = time.perf_counter()
+    with pytest.raises(AIGooException, match="bad"):
+        asyncio.run(workflow.execute({}))
+    assert time.perf_counter() - started < 2
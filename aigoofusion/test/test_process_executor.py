@@ -0,0 +1,104 @@
+import asyncio
+import os
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.flow import END, START, AIGooFlow
+from aigoofusion.flow.executor.shared_payload import (
+    SharedPayload,
+    discard,
+    release,
+    restore,
+    share,
+)
+
+
+# Process nodes must be module-level functions, the pool pickles them by name
+def square_sum(n):
+    return {"pid": os.getpid(), "total": sum(i * i for i in range(n))}
+
+
+def reverse(data):
+    return {"out": data[::-1], "size": len(data)}
+
+
+def fail(n):
+    raise RuntimeError("boom")
+
+
+def _single_node_flow(func, **kwargs) -> AIGooFlow:
+    workflow = AIGooFlow({}, process_pool=1, **kwargs)
+    workflow.add_node("work", func, executor="process")
+    workflow.add_edge(START, "work")
+    workflow.add_edge("work", END)
+    return workflow
+
+
+def test_process_node_runs_in_another_process():
+    workflow = _single_node_flow(square_sum)
+    try:
+        result = asyncio.run(workflow.execute({"n": 10}))
+    finally:
+        workflow.close()
+
+    assert result["total"] == 285
+    assert result["pid"] != os.getpid()
+
+
+def test_large_payloads_round_trip_through_shared_memory():
+    data = b"ab" * (1 << 20)
+    workflow = _single_node_flow(reverse)
+    try:
+        result = asyncio.run(workflow.execute({"data": data}))
+    finally:
+        workflow.close()
+
+    assert result["size"] == len(data)
+    assert result["out"] == data[::-1]
+
+
+def test_process_node_errors_are_reported():
+    workflow = _single_node_flow(fail)
+    try:
+        with pytest.raises(AIGooException, match="boom"):
+            asyncio.run(workflow.execute({"n": 1}))
+    finally:
+        workflow.close()
+
+
+def test_process_nodes_are_validated():
+    workflow = AIGooFlow({})
+
+    def takes_state(state):
+        return {}
+
+    with pytest.raises(ValueError):
+        workflow.add_node("lambda", lambda n: {}, executor="process")
+    with pytest.raises(ValueError):
+        workflow.add_node("state", takes_state, executor="process")
+
+
+def test_share_restore_and_discard():
+    blocks = []
+    payload = share(
+        {"big": b"x" * 64, "nested": [(bytearray(b"y" * 64),)], "small": b"z"}, 32, blocks
+    )
+    names = [block.name for block in blocks]
+
+    assert isinstance(payload["big"], SharedPayload)
+    assert payload["small"] == b"z"
+    attached = []
+    assert restore(payload, attached) == {
+        "big": b"x" * 64,
+        "nested": [(bytearray(b"y" * 64),)],
+        "small": b"z",
+    }
+    release(attached)
+    release(blocks)
+
+    discard(payload)
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+from aigoofusion.flow import END, START, AIGooFlow, MetricsRegistry, ProfileOverlay
+from aigoofusion.flow.visualizer.profile_overlay import heat_color
+
+
+def _profiled_flow():
+    metrics = MetricsRegistry()
+    workflow = AIGooFlow({"x": 0}, metrics=metrics)
+
+    async def fast(x):
+        return {}
+
+    async def slow(x):
+        await asyncio.sleep(0.02)
+        return {}
+
+    workflow.add_node("fast", fast)
+    workflow.add_node("slow", slow)
+    workflow.add_edge(START, "fast")
+    workflow.add_conditional_edge(
+        "fast", ["slow", END], lambda state: "slow" if state["x"] % 2 else END
+    )
+    workflow.add_edge("slow", END)
+    for x in range(4):
+        asyncio.run(workflow.execute({"x": x}))
+    return workflow, metrics
+
+
+def test_overlay_is_built_from_metrics_or_their_json():
+    _, metrics = _profiled_flow()
+    overlay = ProfileOverlay.from_metrics(metrics)
+    loaded = ProfileOverlay.from_metrics(json.loads(json.dumps(metrics.to_dict())))
+
+    assert overlay == loaded
+    assert overlay.nodes["fast"].calls == 4
+    assert overlay.edges[("fast", "slow")] == 2
+    assert overlay.heat("slow") == 1.0
+    assert overlay.heat("fast") < 1.0  # type: ignore
+    assert overlay.edge_weight("START", "fast") == 1.0
+    assert overlay.edge_weight("fast", "slow") == 0.5
+
+
+def test_profile_diagram_shows_latency_and_traffic():
+    workflow, _ = _profiled_flow()
+    code = workflow.get_profile_diagram_code()
+
+    assert "4 calls · 0.0% err" in code
+    assert "fast -.->|2| slow" in code
+    assert f"style slow fill:{heat_color(1.0)}" in code
+
+
+def test_profile_diagram_is_saved_as_svg_or_html(tmp_path):
+    workflow, metrics = _profiled_flow()
+
+    svg = workflow.save_profile_diagram(str(tmp_path / "profile.svg"))
+    html = workflow.save_profile_diagram(str(tmp_path / "profile.html"), metrics.to_dict())
+
+    assert (tmp_path / "profile.svg").read_text().lstrip().startswith("<svg")
+    assert "<svg" in (tmp_path / "profile.html").read_text()
+    assert svg.endswith("profile.svg") and html.endswith("profile.html")
+
+
+def test_heat_colour_scale():
+    assert heat_color(0) == "#4caf50"
+    assert heat_color(1) == "#f44336"
+    assert heat_color(2) == heat_color(1)
@@ -0,0 +1,199 @@
+import asyncio
+import time
+
+import pytest
+
+from aigoofusion.exception.aigoo_circuit_open_exception import AIGooCircuitOpenException
+from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.exception.aigoo_limit_exception import AIGooLimitException
+from aigoofusion.flow import (
+    END,
+    START,
+    AIGooFlow,
+    CircuitBreaker,
+    CircuitState,
+    MetricsRegistry,
+    RetryPolicy,
+)
+from aigoofusion.flow.resilience import is_transient_error
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def _single_node_flow(func, **kwargs):
+    metrics = MetricsRegistry()
+    workflow = AIGooFlow({}, metrics=metrics)
+    workflow.add_node("n", func, **kwargs)
+    workflow.add_edge(START, "n")
+    workflow.add_edge("n", END)
+    return workflow, metrics
+
+
+def _down():
+    raise ConnectionError("down")
+
+
+def test_transient_errors_are_retried_with_events_and_metrics():
+    calls = {"n": 0}
+
+    def flaky():
+        calls["n"] += 1
+        if calls["n"] < 3:
+            try:
+                raise RateLimitError("slow down")
+            except Exception as e:
+                raise AIGooException(e)
+        return {"ok": calls["n"]}
+
+    workflow, metrics = _single_node_flow(flaky, retry=RetryPolicy(initial_delay=0.01))
+
+    async def collect():
+        return [
+            event async for event in workflow.stream({}, events=["retry", "workflow_complete"])
+        ]
+
+    events = asyncio.run(collect())
+
+    assert [event["attempt"] for event in events if event.type == "retry"] == [1, 2]
+    assert events[-1]["state"] == {"ok": 3}
+    assert metrics.to_dict()["retries"] == {"n": 2}
+
+
+def test_programming_errors_are_not_retried():
+    calls = {"n": 0}
+
+    def bug():
+        calls["n"] += 1
+        raise ValueError("bug")
+
+    workflow, _ = _single_node_flow(bug, retry=True)
+
+    with pytest.raises(AIGooException, match="bug"):
+        asyncio.run(workflow.execute({}))
+    assert calls["n"] == 1
+
+
+def test_node_timeout_is_retried_but_not_the_run_deadline():
+    calls = {"n": 0}
+
+    async def slow():
+        calls["n"] += 1
+        if calls["n"] == 1:
+            await asyncio.sleep(1)
+        return {"ok": 1}
+
+    workflow, _ = _single_node_flow(slow, timeout=0.05, retry=RetryPolicy(initial_delay=0))
+    assert asyncio.run(workflow.execute({})) == {"ok": 1}
+    assert calls["n"] == 2
+
+    workflow, _ = _single_node_flow(
+        _down, retry=RetryPolicy(max_attempts=5, initial_delay=1, jitter=False)
+    )
+    started = time.perf_counter()
+    with pytest.raises(AIGooException):
+        asyncio.run(workflow.execute({}, timeout=0.5))
+    assert time.perf_counter() - started < 0.5
+
+
+def test_stream_is_not_retried_after_its_first_chunk():
+    calls = {"n": 0}
+
+    def tokens():
+        calls["n"] += 1
+        yield "a"
+        raise TimeoutError("t")
+
+    workflow, _ = _single_node_flow(tokens, stream=True, retry=RetryPolicy(initial_delay=0))
+
+    with pytest.raises(AIGooException):
+        asyncio.run(workflow.execute({}))
+    assert calls["n"] == 1
+
+
+def test_open_breaker_fails_fast_and_recovers():
+    breaker = CircuitBreaker("provider", failure_threshold=2, recovery_timeout=0.1)
+    workflow, metrics = _single_node_flow(
+        _down,
+        retry=RetryPolicy(max_attempts=5, initial_delay=0, jitter=False),
+        circuit_breaker=breaker,
+    )
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(AIGooCircuitOpenException) as error:
+                await workflow.execute({})
+            assert error.value.breaker == "provider"
+        assert breaker.state is CircuitState.OPEN
+        await asyncio.sleep(0.12)
+        assert breaker.state is CircuitState.HALF_OPEN
+        healthy, _ = _single_node_flow(lambda: {"ok": 1}, circuit_breaker=breaker)
+        return await healthy.execute({})
+
+    assert asyncio.run(run()) == {"ok": 1}
+    assert breaker.state is CircuitState.CLOSED
+    assert metrics.to_dict()["circuit_breakers"] == {
+        "provider": {"state": "open", "rejections": 2}
+    }
+    assert 'aigooflow_circuit_breaker_rejections_total{breaker="provider"} 2' in (
+        metrics.to_prometheus()
+    )
+
+
+def test_open_breaker_error_is_raised_unwrapped_from_stream():
+    breaker = CircuitBreaker("provider", failure_threshold=1)
+    workflow, _ = _single_node_flow(_down, circuit_breaker=breaker)
+
+    async def run():
+        with pytest.raises(AIGooException):
+            await workflow.execute({})
+        with pytest.raises(AIGooCircuitOpenException) as error:
+            async for _ in workflow.stream({}):
+                pass
+        return error.value
+
+    error = asyncio.run(run())
+
+    assert round(error.retry_after) == 30
+
+
+def test_timed_out_trial_call_does_not_reopen_the_breaker():
+    breaker = CircuitBreaker("p", failure_threshold=1, recovery_timeout=0.01)
+    breaker.allow()
+    breaker.record_failure(ConnectionError())
+    assert breaker.state is CircuitState.OPEN
+
+    time.sleep(0.02)
+    assert breaker.state is CircuitState.HALF_OPEN
+    breaker.allow()
+    breaker.record_failure(AIGooLimitException("t", reason="timeout"))
+    assert breaker.state is CircuitState.HALF_OPEN
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_transient_error_detection():
+    assert is_transient_error(TimeoutError())
+    wrapped = AIGooException("provider failed")
+    wrapped.__cause__ = RateLimitError()
+    assert is_transient_error(wrapped)
+    assert not is_transient_error(ValueError())
+    assert not is_transient_error(AIGooLimitException("deadline", reason="timeout"))
+    assert is_transient_error(AIGooLimitException("slow", reason="node_timeout"))
+
+
+def test_retry_delays_grow_and_are_capped():
+    policy = RetryPolicy(initial_delay=1, multiplier=2, max_delay=3, jitter=False)
+
+    assert [policy.delay(attempt) for attempt in (1, 2, 3)] == [1, 2, 3]
+    assert 0 <= RetryPolicy(initial_delay=1).delay(1) <= 1
+
+
+@pytest.mark.parametrize(
+    "settings", [{"max_attempts": 0}, {"initial_delay": -1}, {"multiplier": 0.5}]
+)
+def test_invalid_retry_settings_are_rejected(settings):
+    with pytest.raises(ValueError):
+        RetryPolicy(**settings)
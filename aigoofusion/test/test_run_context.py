@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.flow import END, START, AIGooFlow, MemoryManager
+
+
+def _loop_flow(**kwargs) -> AIGooFlow:
+    workflow = AIGooFlow({"seen": []}, **kwargs)
+
+    async def step(user, seen):
+        await asyncio.sleep(0.001)
+        return {"seen": seen + [user]}
+
+    workflow.add_node("step", step)
+    workflow.add_edge(START, "step")
+    workflow.add_conditional_edge(
+        "step", ["step", END], lambda state: "step" if len(state["seen"]) < 3 else END
+    )
+    return workflow
+
+
+def test_concurrent_runs_keep_their_own_state():
+    workflow = _loop_flow()
+
+    async def run_all():
+        return await asyncio.gather(
+            *(workflow.execute({"user": f"u{i}"}) for i in range(50))
+        )
+
+    results = asyncio.run(run_all())
+
+    assert [result["seen"] for result in results] == [[f"u{i}"] * 3 for i in range(50)]
+
+
+def test_concurrent_runs_with_memory_keep_their_threads_apart():
+    workflow = _loop_flow(memory=MemoryManager(cleanup=False))
+
+    async def run_all():
+        return await asyncio.gather(
+            *(workflow.execute({"user": f"u{i}"}, thread_id=f"t{i}") for i in range(20))
+        )
+
+    results = asyncio.run(run_all())
+
+    assert all(result["seen"] == [f"u{i}"] * 3 for i, result in enumerate(results))
+
+
+def test_memory_requires_a_thread_id():
+    workflow = _loop_flow(memory=MemoryManager())
+
+    with pytest.raises(AIGooException):
+        workflow.create_run_context()
+
+
+def test_run_context_carries_the_run_settings():
+    workflow = _loop_flow(max_steps=7)
+    context = workflow.create_run_context(run_id="run-1", timeout=5)
+
+    assert context.run_id == "run-1"
+    assert context.max_steps == 7
+    assert context.deadline is not None
+    assert context.state.get("seen") == []
+    assert workflow.state is context.state
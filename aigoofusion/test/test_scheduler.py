@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from aigoofusion.exception.aigoo_cancelled_exception import AIGooCancelledException
+from aigoofusion.flow import END, START, AIGooFlow, FlowScheduler, MetricsRegistry, Priority
+
+
+def _recording_flow(scheduler, order, metrics=None) -> AIGooFlow:
+    workflow = AIGooFlow({"tag": None}, scheduler=scheduler, metrics=metrics)
+
+    async def llm(tag):
+        order.append(tag)
+        await asyncio.sleep(0.01)
+        return {}
+
+    workflow.add_node("llm", llm)
+    workflow.add_edge(START, "llm")
+    workflow.add_edge("llm", END)
+    return workflow
+
+
+def test_interactive_calls_overtake_and_tenants_share_fairly():
+    order = []
+    metrics = MetricsRegistry()
+    workflow = _recording_flow(FlowScheduler(node_limits={"llm": 1}), order, metrics)
+
+    async def run():
+        runs = [
+            asyncio.create_task(
+                workflow.execute({"tag": f"A{i}"}, priority="batch", tenant="A")
+            )
+            for i in range(6)
+        ]
+        runs += [
+            asyncio.create_task(
+                workflow.execute({"tag": f"B{i}"}, priority=Priority.BATCH, tenant="B")
+            )
+            for i in range(2)
+        ]
+        await asyncio.sleep(0.005)
+        runs.append(
+            asyncio.create_task(
+                workflow.execute({"tag": "I"}, priority="interactive", tenant="C")
+            )
+        )
+        await asyncio.gather(*runs)
+
+    asyncio.run(run())
+
+    assert order[1] == "I"
+    # B is not held up behind A's whole batch, and each tenant keeps its order
+    assert order.index("B1") < order.index("A3")
+    assert [tag for tag in order if tag[0] == "A"] == [f"A{i}" for i in range(6)]
+    waits = metrics.to_dict()["queue_wait"]
+    assert (waits["batch"]["count"], waits["interactive"]["count"]) == (8, 1)
+
+
+def test_tenant_weights_share_slots_proportionally():
+    order = []
+    workflow = _recording_flow(
+        FlowScheduler(max_concurrency=1, tenant_weights={"gold": 3}), order
+    )
+
+    async def run():
+        runs = [workflow.execute({"tag": "x"}, tenant="x") for _ in range(8)]
+        runs += [workflow.execute({"tag": "G"}, tenant="gold") for _ in range(8)]
+        await asyncio.gather(*runs)
+
+    asyncio.run(run())
+
+    assert order[:8].count("G") >= 5
+
+
+def test_global_limit_holds_across_runs():
+    scheduler = FlowScheduler(max_concurrency=3)
+    workflow = AIGooFlow({}, scheduler=scheduler, max_concurrency=None)
+    calls = {"running": 0, "peak": 0}
+
+    async def work():
+        calls["running"] += 1
+        calls["peak"] = max(calls["peak"], calls["running"])
+        await asyncio.sleep(0.01)
+        calls["running"] -= 1
+        return {}
+
+    for name in "abcde":
+        workflow.add_node(name, work)
+        workflow.add_edge(START, name)
+        workflow.add_edge(name, END)
+
+    async def run():
+        await asyncio.gather(*(workflow.execute({}) for _ in range(4)))
+
+    asyncio.run(run())
+
+    assert calls["peak"] == 3
+    assert (scheduler.running, scheduler.queued) == (0, 0)
+
+
+def test_cancelled_run_leaves_the_queue():
+    scheduler = FlowScheduler(max_concurrency=1)
+    workflow = AIGooFlow({}, scheduler=scheduler)
+
+    async def slow():
+        await asyncio.sleep(0.1)
+        return {}
+
+    workflow.add_node("slow", slow)
+    workflow.add_edge(START, "slow")
+    workflow.add_edge("slow", END)
+
+    async def run():
+        first = asyncio.create_task(workflow.execute({}))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(workflow.execute({}, run_id="queued"))
+        await asyncio.sleep(0.01)
+        assert scheduler.queued == 1
+        assert workflow.cancel("queued")
+        with pytest.raises(AIGooCancelledException):
+            await second
+        await first
+
+    asyncio.run(run())
+
+    assert (scheduler.running, scheduler.queued) == (0, 0)
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from aigoofusion.flow import END, START, AIGooFlow, BranchPredictor, MetricsRegistry
+
+
+def _router_flow(metrics=None, router_writes_query=False, started=None) -> AIGooFlow:
+    predictor = BranchPredictor(min_samples=3)
+    predictor.record("router", "llm", 3)
+    workflow = AIGooFlow(
+        {"query": "q", "route": None, "answer": None},
+        metrics=metrics,
+        branch_predictor=predictor,
+    )
+
+    async def router(query):
+        await asyncio.sleep(0.05)
+        update = {"route": "faq" if "faq" in query else "llm"}
+        if router_writes_query:
+            update["query"] = query + "!"
+        return update
+
+    async def llm(query):
+        await asyncio.sleep(0.02)
+        yield "tok"
+        yield {"answer": f"llm:{query}"}
+
+    async def faq(query):
+        return {"answer": f"faq:{query}"}
+
+    workflow.add_node("router", router)
+    workflow.add_node("llm", llm, stream=True)
+    workflow.add_node("faq", faq)
+    workflow.add_edge(START, "router")
+    workflow.add_conditional_edge(
+        "router", ["llm", "faq"], lambda state: state["route"], speculative=True
+    )
+    workflow.add_edge("llm", END)
+    workflow.add_edge("faq", END)
+    if started is not None:
+        workflow.on_node_start(lambda context, node: started.append(node))
+    return workflow
+
+
+def test_predicted_branch_is_used_when_the_edge_picks_it():
+    metrics = MetricsRegistry()
+    result = asyncio.run(_router_flow(metrics).execute({"query": "x"}))
+
+    assert result["answer"] == "llm:x"
+    assert metrics.to_dict()["speculations"] == {"llm": {"hit": 1}}
+
+
+def test_wrong_branch_is_discarded_without_side_effects():
+    metrics = MetricsRegistry()
+    started = []
+    result = asyncio.run(_router_flow(metrics, started=started).execute({"query": "faq y"}))
+
+    assert result["answer"] == "faq:faq y"
+    assert "llm" not in started
+    assert metrics.to_dict()["speculations"] == {"llm": {"wrong_branch": 1}}
+    assert "llm" not in metrics.to_dict()["nodes"]
+
+
+def test_speculation_on_inputs_the_source_changed_is_run_again():
+    metrics = MetricsRegistry()
+    result = asyncio.run(
+        _router_flow(metrics, router_writes_query=True).execute({"query": "d"})
+    )
+
+    assert result["answer"] == "llm:d!"
+    assert metrics.to_dict()["speculations"] == {"llm": {"stale": 1}}
+
+
+def test_events_of_a_wrong_branch_never_reach_the_stream():
+    async def collect():
+        return [
+            (event.type, event["node"])
+            async for event in _router_flow().stream(
+                {"query": "faq z"}, events=["node_start", "stream_chunk"]
+            )
+        ]
+
+    events = asyncio.run(collect())
+
+    assert ("node_start", "faq") in events
+    assert all(node != "llm" for _, node in events)
+
+
+def test_predictor_needs_enough_samples_and_a_clear_favourite():
+    predictor = BranchPredictor(min_samples=4, min_probability=0.6)
+    predictor.record("router", "llm", 2)
+    predictor.record("router", "faq")
+    assert predictor.predict("router", ["llm", "faq"]) == []
+
+    predictor.record("router", "llm")
+    assert predictor.predict("router", ["llm", "faq"]) == ["llm"]
+    assert predictor.probability("router", "llm") == 0.75
+
+    loaded = BranchPredictor(min_samples=1)
+    loaded.load(predictor.to_dict())
+    assert loaded.to_dict() == predictor.to_dict()
+
+    with pytest.raises(ValueError):
+        BranchPredictor(min_probability=0)
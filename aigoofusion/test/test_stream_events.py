@@ -0,0 +1,60 @@
+import asyncio
+import json
+
+import pytest
+
+from aigoofusion.flow import END, START, AIGooFlow, FlowEvent
+
+
+def _flow() -> AIGooFlow:
+    workflow = AIGooFlow({"big": list(range(1000)), "n": 0})
+
+    def add(n):
+        return {"n": n + 1, "big": list(range(1000))}
+
+    async def generate(n):
+        yield "tok"
+        yield {"n": n + 10}
+
+    workflow.add_node("add", add)
+    workflow.add_node("generate", generate, stream=True)
+    workflow.add_edge(START, "add")
+    workflow.add_edge("add", "generate")
+    workflow.add_edge("generate", END)
+    return workflow
+
+
+def _collect(workflow, **kwargs):
+    async def collect():
+        return [event async for event in workflow.stream({"n": 1}, **kwargs)]
+
+    return asyncio.run(collect())
+
+
+def test_delta_mode_reports_only_changed_keys():
+    events = _collect(_flow(), mode="deltas")
+    results = [event for event in events if event.type == "node_result"]
+
+    assert [event["delta"] for event in results] == [{"n": 2}, {"n": 12}]
+    assert all("state" not in event for event in events)
+
+
+def test_event_filter_only_builds_the_requested_events():
+    events = _collect(_flow(), events=["stream_chunk", "workflow_complete"])
+
+    assert [event.type for event in events] == ["stream_chunk", "workflow_complete"]
+    assert events[-1]["state"]["n"] == 12
+
+
+def test_events_behave_like_the_dicts_they_replace():
+    event = _collect(_flow(), events=["stream_chunk"])[0]
+
+    assert isinstance(event, FlowEvent)
+    assert event == {"type": "stream_chunk", "node": "generate", "content": "tok"}
+    assert event.get("state", "-") == "-"
+    assert json.loads(json.dumps(event.to_dict()))["content"] == "tok"
+
+
+def test_unknown_event_types_are_rejected():
+    with pytest.raises(ValueError, match="Unknown event types"):
+        _collect(_flow(), events=["nope"])
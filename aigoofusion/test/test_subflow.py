@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from aigoofusion.exception.aigoo_exception import AIGooException
+from aigoofusion.flow import END, START, AIGooFlow
+
+
+def _rag() -> AIGooFlow:
+    subflow = AIGooFlow({"k": 3})
+
+    def retrieve(query, k):
+        return {"docs": [f"{query}-{i}" for i in range(k)]}
+
+    async def rerank(docs):
+        yield f"tok:{docs[0]}"
+        yield {"ranked": list(reversed(docs))}
+
+    subflow.add_node("retrieve", retrieve)
+    subflow.add_node("rerank", rerank, stream=True)
+    subflow.add_edge(START, "retrieve")
+    subflow.add_edge("retrieve", "rerank")
+    subflow.add_edge("rerank", END)
+    return subflow
+
+
+def _parent(subflow) -> AIGooFlow:
+    workflow = AIGooFlow({"question": "q"})
+    workflow.add_subflow("rag", subflow, {"question": "query"}, {"ranked": "results"})
+    workflow.add_node("answer", lambda results: {"answer": results[0]})
+    workflow.add_edge(START, "rag")
+    workflow.add_edge("rag", "answer")
+    workflow.add_edge("answer", END)
+    return workflow
+
+
+def test_only_mapped_keys_cross_the_subflow_boundary():
+    result = asyncio.run(_parent(_rag()).execute({}))
+
+    assert result["results"] == ["q-2", "q-1", "q-0"]
+    assert result["answer"] == "q-2"
+    assert "docs" not in result and "ranked" not in result
+
+
+def test_subflow_events_are_prefixed_with_the_node_name():
+    async def collect():
+        return [event async for event in _parent(_rag()).stream({"question": "z"})]
+
+    events = asyncio.run(collect())
+    chunks = [event for event in events if event.type == "stream_chunk"]
+
+    assert [(event["node"], event["content"]) for event in chunks] == [
+        ("rag/rerank", "tok:z-0")
+    ]
+    assert any(event.get("node") == "rag/retrieve" for event in events)
+
+
+def test_subflow_errors_fail_the_parent_run():
+    subflow = AIGooFlow({})
+
+    def boom(query):
+        raise RuntimeError("inner")
+
+    subflow.add_node("boom", boom)
+    subflow.add_edge(START, "boom")
+    subflow.add_edge("boom", END)
+    workflow = _parent(subflow)
+
+    with pytest.raises(AIGooException, match="inner"):
+        asyncio.run(workflow.execute({}))
+
+
+def test_a_workflow_can_not_contain_itself():
+    workflow = AIGooFlow({})
+    with pytest.raises(ValueError, match="can not contain itself"):
+        workflow.add_subflow("self", workflow, [], [])
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from aigoofusion.flow import END, START, AIGooFlow, NodeExecutor
+
+
+def _blocking_fan_out(**kwargs) -> AIGooFlow:
+    workflow = AIGooFlow({}, **kwargs)
+
+    def slow(x):
+        time.sleep(0.1)
+        return {"thread": threading.current_thread().name}
+
+    for name in "abcd":
+        workflow.add_node(name, slow)
+        workflow.add_edge(START, name)
+        workflow.add_edge(name, END)
+    return workflow
+
+
+def test_sync_nodes_stay_on_the_event_loop_by_default():
+    workflow = _blocking_fan_out()
+
+    assert workflow.nodes["a"].executor is NodeExecutor.INLINE
+    result = asyncio.run(workflow.execute({"x": 1}))
+    assert result["thread"] == threading.current_thread().name
+
+
+def test_offloaded_sync_nodes_run_concurrently_in_the_pool():
+    workflow = _blocking_fan_out(offload_sync=True, max_concurrency=4, thread_pool=4)
+    try:
+        assert workflow.nodes["a"].executor is NodeExecutor.THREAD
+        started = time.perf_counter()
+        result = asyncio.run(workflow.execute({"x": 1}))
+        elapsed = time.perf_counter() - started
+    finally:
+        workflow.close()
+
+    assert result["thread"] != threading.current_thread().name
+    assert elapsed < 0.35
+
+
+def test_executor_per_node_and_async_nodes():
+    workflow = AIGooFlow({}, offload_sync=True)
+
+    async def async_node():
+        return {}
+
+    workflow.add_node("inline", lambda: {}, executor="inline")
+    workflow.add_node("async", async_node)
+
+    assert workflow.nodes["inline"].executor is NodeExecutor.INLINE
+    assert workflow.nodes["async"].executor is NodeExecutor.INLINE
+    with pytest.raises(ValueError, match="is async"):
+        workflow.add_node("bad", async_node, executor="thread")
+
+
+def test_offloaded_sync_conditions():
+    workflow = AIGooFlow({}, offload_sync=True)
+    threads = []
+
+    def route(state):
+        threads.append(threading.current_thread().name)
+        return END
+
+    workflow.add_node("a", lambda: {"a": 1})
+    workflow.add_edge(START, "a")
+    workflow.add_conditional_edge("a", [END], route)
+    try:
+        asyncio.run(workflow.execute({}))
+    finally:
+        workflow.close()
+
+    assert threads and threads[0] != threading.current_thread().name
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+from aigoofusion.flow import END, START, AIGooFlow
+from aigoofusion.runtime import TraceRecorder, trace_span
+
+
+def _flow() -> AIGooFlow:
+    workflow = AIGooFlow({}, max_concurrency=None)
+
+    async def model(x):
+        with trace_span("openai.generate", "model", model="fake"):
+            await asyncio.sleep(0.01)
+        return {"m": 1}
+
+    async def lookup(x):
+        await asyncio.sleep(0.02)
+        return {"l": 1}
+
+    workflow.add_node("model", model)
+    workflow.add_node("lookup", lookup)
+    workflow.add_node("combine", lambda m, l: {"c": m + l}, join="all")
+    for name in ("model", "lookup"):
+        workflow.add_edge(START, name)
+        workflow.add_edge(name, "combine")
+    workflow.add_edge("combine", END)
+    return workflow
+
+
+def _spans(recorder):
+    return {
+        event["name"]: event
+        for event in recorder.to_dict()["traceEvents"]
+        if event["ph"] == "X"
+    }
+
+
+def test_run_is_recorded_as_chrome_trace_events():
+    recorder = TraceRecorder()
+    asyncio.run(_flow().execute({"x": 1}, trace=recorder))
+    spans = _spans(recorder)
+
+    assert {"workflow", "model", "lookup", "combine", "openai.generate"} <= set(spans)
+    # Concurrent nodes are drawn on their own tracks
+    assert spans["model"]["tid"] != spans["lookup"]["tid"]
+    # Model calls nest under the node that made them
+    assert spans["openai.generate"]["tid"] == spans["model"]["tid"]
+    assert spans["openai.generate"]["args"]["model"] == "fake"
+    assert spans["workflow"]["dur"] >= spans["lookup"]["dur"]
+
+
+def test_trace_is_saved_as_json(tmp_path):
+    recorder = TraceRecorder(name="test")
+    asyncio.run(_flow().execute({"x": 1}, trace=recorder))
+    path = tmp_path / "trace.json"
+    recorder.save(str(path))
+
+    events = json.loads(path.read_text())["traceEvents"]
+    assert events[0]["args"] == {"name": "test"}
+
+
+def test_trace_span_outside_a_traced_run_does_nothing():
+    with trace_span("untraced"):
+        pass
+    assert asyncio.run(_flow().execute({"x": 1}))["c"] == 2
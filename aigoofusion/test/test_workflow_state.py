@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from aigoofusion.flow import END, START, AIGooFlow, StateView, WorkflowState
+
+
+def test_update_shares_unchanged_values():
+    messages = [{"role": "user", "content": "hi"}]
+    state = WorkflowState({"messages": messages, "count": 0})
+    before = state.view()
+
+    state._update({"count": 1})
+    after = state.view()
+
+    assert after["messages"] is before["messages"]
+    assert before["count"] == 0 and after["count"] == 1
+    assert not before.is_same_snapshot(after)
+
+
+def test_view_is_read_only_and_get_copies():
+    state = WorkflowState({"items": [1, 2]})
+    view = state.view()
+
+    assert isinstance(view, StateView)
+    with pytest.raises(TypeError):
+        view["items"] = []  # type: ignore
+
+    items = state.get("items")
+    items.append(3)
+    assert state.get("items") == [1, 2]
+
+
+def test_update_does_not_keep_references_to_inputs():
+    state = WorkflowState({})
+    items = [1]
+    state._update({"items": items})
+    items.append(2)
+
+    assert state.get("items") == [1]
+
+
+def test_conditions_receive_a_view_and_nodes_cannot_mutate_the_state():
+    workflow = AIGooFlow({"messages": []})
+    seen = []
+
+    def add(messages):
+        messages.append("m")
+        return {"messages": messages}
+
+    def route(state):
+        seen.append(type(state))
+        return END
+
+    workflow.add_node("add", add)
+    workflow.add_edge(START, "add")
+    workflow.add_conditional_edge("add", [END], route)
+
+    assert asyncio.run(workflow.execute({}))["messages"] == ["m"]
+    assert asyncio.run(workflow.execute({}))["messages"] == ["m"]
+    assert seen == [StateView, StateView]
+
+
+def test_readonly_nodes_get_inputs_by_reference():
+    workflow = AIGooFlow({"messages": [1, 2, 3]})
+    received = []
+
+    def read(messages):
+        received.append(messages)
+        return {}
+
+    workflow.add_node("first", read, readonly=True)
+    workflow.add_node("second", read, readonly=True)
+    workflow.add_edge(START, "first")
+    workflow.add_edge("first", "second")
+    workflow.add_edge("second", END)
+
+    asyncio.run(workflow.execute({}))
+    assert received[0] is received[1]
+
+
+def test_history_records_only_changed_keys():
+    state = WorkflowState({"a": 1, "b": 2})
+    state._update({"a": 1, "b": 3})
+    state._update({"c": 4})
+
+    assert state.get_history() == [{"b": 3}, {"c": 4}]
+    assert state.get_state_at(0) == {"a": 1, "b": 2}
+    assert state.get_state_at(1) == {"a": 1, "b": 3}
+    assert state.get_state_at(2) == {"a": 1, "b": 3, "c": 4}
+
+
+def test_history_limit_folds_old_entries():
+    state = WorkflowState({"n": 0}, history_limit=2)
+    for n in range(1, 6):
+        state._update({"n": n})
+
+    assert state.steps == 5
+    assert state.first_step == 3
+    assert state.get_history() == [{"n": 4}, {"n": 5}]
+    assert state.get_state_at(3) == {"n": 3}
+    with pytest.raises(ValueError):
+        state.get_state_at(2)
+
+
+def test_history_can_be_turned_off():
+    state = WorkflowState({"n": 0}, history_limit=0)
+    state._update({"n": 1})
+
+    assert state.get_history() == []
+    assert state.get_state_at(1) == {"n": 1}
+    with pytest.raises(ValueError):
+        WorkflowState({}, history_limit=-1)
+
+
+def test_workflow_history_limit_bounds_run_history():
+    workflow = AIGooFlow({"n": 0}, history_limit=3)
+    workflow.add_node("inc", lambda n: {"n": n + 1})
+    workflow.add_edge(START, "inc")
+    workflow.add_conditional_edge(
+        "inc", ["inc", END], lambda state: "inc" if state["n"] < 10 else END
+    )
+
+    assert asyncio.run(workflow.execute({}))["n"] == 10
+    assert len(workflow.state.get_history()) == 3